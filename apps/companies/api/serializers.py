@@ -1,11 +1,13 @@
 from rest_framework import serializers
 
 from apps.companies.models import Company
+from apps.core.api.serializers import RenditionsField
 
 
 # serializers.py
 class CompanyModelSerializer(serializers.ModelSerializer):
     logo = serializers.FileField(required=False)
+    logo_renditions = RenditionsField(source="logo")
 
     class Meta:
         model = Company
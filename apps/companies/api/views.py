@@ -20,6 +20,7 @@ class CompanyListCreateAPIView(generics.ListCreateAPIView):
     filter_backends = [filters.SearchFilter]
     search_fields = ["name", "code"]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
 
     @transaction.atomic
     def perform_create(self, serializer):
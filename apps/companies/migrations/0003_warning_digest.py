@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("companies", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="telegram_chat_id",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="Telegram chat ID"
+            ),
+        ),
+        migrations.AddField(
+            model_name="company",
+            name="warning_digest",
+            field=models.CharField(
+                choices=[
+                    ("off", "Har bir ogohlantirish alohida"),
+                    ("company", "Korxona bo'yicha jamlanma"),
+                    ("responsible", "Mas'ul shaxs bo'yicha jamlanma"),
+                ],
+                default="off",
+                max_length=15,
+                verbose_name="Ogohlantirishlar yuborilishi",
+            ),
+        ),
+    ]
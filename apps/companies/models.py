@@ -1,7 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.signals import post_save
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.models import enqueue_image_renditions
 from apps.utils.get_upload_path import get_upload_path
 
 
@@ -11,6 +13,15 @@ class Company(models.Model):
     Each company has their own equipment, users, and maintenance schedules.
     """
 
+    WARNING_DIGEST_OFF = "off"
+    WARNING_DIGEST_COMPANY = "company"
+    WARNING_DIGEST_RESPONSIBLE = "responsible"
+    WARNING_DIGEST_CHOICES = [
+        (WARNING_DIGEST_OFF, _("Har bir ogohlantirish alohida")),
+        (WARNING_DIGEST_COMPANY, _("Korxona bo'yicha jamlanma")),
+        (WARNING_DIGEST_RESPONSIBLE, _("Mas'ul shaxs bo'yicha jamlanma")),
+    ]
+
     name = models.CharField(_("Korxona nomi"), max_length=255)
     code = models.CharField(
         _("Korxona maxsus kodi"), max_length=50, unique=True
@@ -24,6 +35,16 @@ class Company(models.Model):
         _("Korxona logosi"), upload_to=get_upload_path, null=True, blank=True
     )
     is_active = models.BooleanField(_("Faol"), default=True)
+    # Empty: the global CHAT_ID
+    telegram_chat_id = models.CharField(
+        _("Telegram chat ID"), max_length=64, blank=True
+    )
+    warning_digest = models.CharField(
+        _("Ogohlantirishlar yuborilishi"),
+        max_length=15,
+        choices=WARNING_DIGEST_CHOICES,
+        default=WARNING_DIGEST_OFF,
+    )
     author = models.ForeignKey(
         "users.User",
         on_delete=models.SET_NULL,
@@ -39,3 +60,6 @@ class Company(models.Model):
 
     def __str__(self):
         return self.name
+
+
+post_save.connect(enqueue_image_renditions("logo"), sender=Company, weak=False)
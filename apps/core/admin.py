@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from apps.core.models import ImageRendition, JobRun
+
+admin.site.register(JobRun)
+admin.site.register(ImageRendition)
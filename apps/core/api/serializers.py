@@ -0,0 +1,64 @@
+from rest_framework import serializers
+
+from apps.core.models import JobRun
+from apps.utils.image_renditions import get_renditions
+from apps.utils.values_serializer import ValuesSerializer
+
+
+class JobRunModelSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobRun
+        fields = "__all__"
+
+
+class RenditionsField(serializers.Field):
+    """
+    Rendition URLs of the image field ``source``:
+    ``{rendition: {"width", "height", "webp", "jpeg"}}``, ``None`` until
+    they are rendered. Under ``many=True`` the renditions of every row
+    are loaded with one query. ``ValuesSerializer`` renders it through
+    ``related={name: rendition_values}``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return super().get_attribute(instance).name or None
+
+    def to_representation(self, name):
+        found = self.root.__dict__.setdefault("_renditions", {})
+        if name not in found:
+            names = {name, *self.row_names()}
+            renditions = get_renditions(names)
+            found.update({name: renditions.get(name) for name in names})
+        return found[name]
+
+    def row_names(self):
+        """Image names of this field in every row of a ``many=True`` root"""
+        root = self.root
+        if (
+            not isinstance(root, serializers.ListSerializer)
+            or root.instance is None
+        ):
+            return []
+        path = []
+        field = self
+        while field is not root.child:
+            if field is None:
+                return []
+            path.append(field)
+            field = field.parent
+
+        names = []
+        for value in root.instance:
+            for field in reversed(path):
+                if value is None:
+                    break
+                value = field.get_attribute(value)
+            names.append(value)
+        return names
+
+
+job_run_values_serializer = ValuesSerializer(JobRunModelSerializer)
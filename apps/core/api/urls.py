@@ -0,0 +1,21 @@
+from django.urls import path
+
+from apps.core.api.views import (
+    ImageRenditionAPIView,
+    JobRunListAPIView,
+    JobRunStatsAPIView,
+    MetricsAPIView,
+)
+
+urlpatterns = [
+    path("job-runs/", JobRunListAPIView.as_view(), name="job-run-list"),
+    path(
+        "job-runs/stats/", JobRunStatsAPIView.as_view(), name="job-run-stats"
+    ),
+    path("metrics/", MetricsAPIView.as_view(), name="metrics"),
+    path(
+        "image-renditions/<path:name>",
+        ImageRenditionAPIView.as_view(),
+        name="image-rendition",
+    ),
+]
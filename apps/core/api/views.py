@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.utils.crypto import constant_time_compare
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import filters, permissions, status
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import ListAPIView
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.core.api.serializers import (
+    JobRunModelSerializer,
+    job_run_values_serializer,
+)
+from apps.core.models import RENDITION_DIR, ImageRendition, JobRun
+from apps.users.api.permissions import IsSuperUser
+from apps.utils import scheduler
+from apps.utils.job_runs import job_stats, queue_stats, render_metrics
+from apps.utils.paginator import StandardResultsSetPagination
+from apps.utils.values_serializer import ValuesListMixin
+
+
+def job_intervals():
+    return {
+        name: interval
+        for name, (_function, interval) in scheduler.JOBS.items()
+    }
+
+
+def is_metrics_token(request):
+    """``Authorization: Bearer <METRICS_TOKEN>`` (kept out of access logs)"""
+    header = request.headers.get("Authorization", "")
+    scheme, _space, token = header.partition(" ")
+    return (
+        bool(settings.METRICS_TOKEN)
+        and scheme.lower() == "bearer"
+        and constant_time_compare(token.strip(), settings.METRICS_TOKEN)
+    )
+
+
+class MetricsJWTAuthentication(JWTAuthentication):
+    """JWT, but the metrics token is left to ``HasMetricsToken``"""
+
+    def authenticate(self, request):
+        if is_metrics_token(request):
+            return None
+        return super().authenticate(request)
+
+
+class HasMetricsToken(permissions.BasePermission):
+    """Prometheus scrapes with ``METRICS_TOKEN`` as the bearer token"""
+
+    def has_permission(self, request, view):
+        return is_metrics_token(request)
+
+
+# Fon vazifalari
+# ------------------------------------------------------------------------------------------
+@extend_schema(tags=["Fon vazifalari"])
+class JobRunListAPIView(ValuesListMixin, ListAPIView):
+    """Recorded runs of the scheduler jobs and workers, newest first"""
+
+    queryset = JobRun.objects.order_by("-started_at")
+    serializer_class = JobRunModelSerializer
+    permission_classes = [IsSuperUser]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["job", "status"]
+    pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-started_at", "-pk")
+    values_serializer = job_run_values_serializer
+
+
+@extend_schema(tags=["Fon vazifalari"])
+class JobRunStatsAPIView(APIView):
+    """Per-job aggregates of the last 24 hours and the queue backlogs"""
+
+    permission_classes = [IsSuperUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": {
+                    "jobs": job_stats(job_intervals()),
+                    "queues": queue_stats(),
+                },
+            }
+        )
+
+
+@extend_schema(tags=["Fon vazifalari"], responses={200: str})
+class MetricsAPIView(APIView):
+    """Job and queue metrics in the Prometheus text format"""
+
+    authentication_classes = [MetricsJWTAuthentication]
+    permission_classes = [IsSuperUser | HasMetricsToken]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            render_metrics(job_intervals()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+# Rasm variantlari
+# ------------------------------------------------------------------------------------------
+@extend_schema(
+    tags=["Rasm variantlari"],
+    responses={
+        (200, content_type): OpenApiTypes.BINARY
+        for content_type in ImageRendition.FORMATS.values()
+    },
+)
+class ImageRenditionAPIView(APIView):
+    """
+    Serve a rendered image rendition. Public like the media files, for
+    <img> tags; rendition names are never reused, so clients and proxies
+    may cache the response for ``IMAGE_RENDITION_CACHE_MAX_AGE``.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request, name):
+        # Only files of ready renditions: the name is never joined onto
+        # a storage path unchecked
+        rendition = (
+            ImageRendition.objects.filter(
+                file=f"{RENDITION_DIR}{name}",
+                status=ImageRendition.STATUS_READY,
+            )
+            .values("file", "image_format")
+            .first()
+        )
+        if rendition is None:
+            raise NotFound
+        try:
+            file = default_storage.open(rendition["file"], "rb")
+        except FileNotFoundError:
+            raise NotFound
+        response = FileResponse(
+            file,
+            content_type=ImageRendition.FORMATS[rendition["image_format"]],
+        )
+        response["Cache-Control"] = (
+            f"public, max-age={settings.IMAGE_RENDITION_CACHE_MAX_AGE}, "
+            "immutable"
+        )
+        return response
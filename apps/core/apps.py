@@ -1,10 +1,8 @@
 from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
 
 
 class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
-
-    def ready(self):
-        from apps.utils import scheduler
-
-        scheduler.start()
+    verbose_name = _("Tizim")
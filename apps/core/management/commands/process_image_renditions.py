@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.models import ImageRendition
+from apps.utils.image_renditions import IMAGE_FIELDS, process_image_renditions
+from apps.utils.job_runs import track_run
+
+
+class Command(BaseCommand):
+    help = "Render queued image renditions (thumbnail, medium, full)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=60)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+        parser.add_argument(
+            "--enqueue-missing",
+            action="store_true",
+            help="Queue the renditions of every image uploaded so far",
+        )
+
+    def handle(self, *args, **options):
+        if options["enqueue_missing"]:
+            for model, field_name in IMAGE_FIELDS:
+                names = (
+                    model.objects.exclude(**{field_name: ""})
+                    .exclude(**{f"{field_name}__isnull": True})
+                    .values_list(field_name, flat=True)
+                )
+                ImageRendition.objects.enqueue(names.iterator())
+            self.stdout.write("Missing image renditions queued")
+
+        while True:
+            with track_run("process_image_renditions", keep_idle=False) as run:
+                stats = process_image_renditions(options["batch_size"])
+                run.add(stats)
+            if stats["rows_scanned"]:
+                self.stdout.write(
+                    f"{stats['rows_scanned']} image renditions processed"
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,58 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.utils import scheduler
+
+
+def stop(signum, frame):
+    raise SystemExit(0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the periodic jobs (see scheduler.JOBS). Start one per "
+        "replica: an advisory lock elects the single process that runs "
+        "jobs, the others stand by"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--heartbeat",
+            type=float,
+            default=settings.SCHEDULER_HEARTBEAT,
+            help="Seconds between leadership checks",
+        )
+
+    def handle(self, *args, **options):
+        # docker stop sends SIGTERM: shut the scheduler down cleanly
+        signal.signal(signal.SIGTERM, stop)
+        if not scheduler.supports_leader_election():
+            self.stderr.write(
+                "No advisory locks on this database, run a single "
+                "scheduler process"
+            )
+        try:
+            while True:
+                if scheduler.try_acquire_leadership():
+                    self.stdout.write("Scheduler leadership acquired")
+                    self.lead(options["heartbeat"])
+                    self.stdout.write("Scheduler leadership lost")
+                else:
+                    time.sleep(options["heartbeat"])
+        except KeyboardInterrupt:
+            pass
+
+    def lead(self, heartbeat):
+        interrupted = scheduler.recover_interrupted_runs()
+        if interrupted:
+            self.stdout.write(f"{interrupted} interrupted job runs failed")
+        jobs = scheduler.build_scheduler()
+        jobs.start()
+        try:
+            while scheduler.holds_leadership():
+                time.sleep(heartbeat)
+        finally:
+            jobs.shutdown()
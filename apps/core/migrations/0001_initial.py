@@ -0,0 +1,67 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="JobRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "job",
+                    models.CharField(max_length=100, verbose_name="Vazifa"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Bajarilmoqda"),
+                            ("succeeded", "Bajarildi"),
+                            ("failed", "Xatolik"),
+                        ],
+                        default="running",
+                        max_length=10,
+                        verbose_name="Holati",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(verbose_name="Boshlangan vaqt"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Tugagan vaqt"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, verbose_name="Xatolik"),
+                ),
+            ],
+            options={
+                "verbose_name": "Vazifa bajarilishi",
+                "verbose_name_plural": "Vazifalar bajarilishi",
+                "indexes": [
+                    models.Index(
+                        fields=["job", "-started_at"],
+                        name="job_run_latest_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobrun",
+            name="messages_failed",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Yuborilmagan xabarlar"
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobrun",
+            name="messages_sent",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Yuborilgan xabarlar"
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobrun",
+            name="rows_scanned",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Ko'rilgan qatorlar"
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobrun",
+            name="rows_written",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Yozilgan qatorlar"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("running", "Bajarilmoqda"),
+                    ("succeeded", "Bajarildi"),
+                    ("failed", "Xatolik"),
+                    ("skipped", "O'tkazib yuborildi"),
+                ],
+                default="running",
+                max_length=10,
+                verbose_name="Holati",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobrun",
+            index=models.Index(
+                fields=["started_at", "id"], name="job_run_started_keyset_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_job_run_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageRendition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(max_length=255, verbose_name="Asl rasm"),
+                ),
+                (
+                    "rendition",
+                    models.CharField(
+                        choices=[
+                            ("thumbnail", "thumbnail"),
+                            ("medium", "medium"),
+                            ("full", "full"),
+                        ],
+                        max_length=10,
+                        verbose_name="O'lchami",
+                    ),
+                ),
+                (
+                    "image_format",
+                    models.CharField(
+                        choices=[("webp", "webp"), ("jpeg", "jpeg")],
+                        max_length=4,
+                        verbose_name="Formati",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        max_length=255,
+                        upload_to="renditions/",
+                        verbose_name="Fayl",
+                    ),
+                ),
+                (
+                    "width",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Eni"
+                    ),
+                ),
+                (
+                    "height",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Bo'yi"
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Hajmi"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Navbatda"),
+                            ("ready", "Tayyor"),
+                            ("failed", "Xatolik"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Holati",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, verbose_name="Xatolik"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "rendered_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Tayyorlangan vaqt"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rasm varianti",
+                "verbose_name_plural": "Rasm variantlari",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["id"],
+                        name="image_rendition_pending_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "rendition", "image_format"),
+                        name="unique_image_rendition",
+                    )
+                ],
+            },
+        ),
+    ]
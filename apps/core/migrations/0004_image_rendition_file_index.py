@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="imagerendition",
+            index=models.Index(
+                condition=models.Q(("status", "ready")),
+                fields=["file"],
+                name="image_rendition_file_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,207 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# Rejalashtirilgan vazifalar tarixi
+# -----------------------------------------------------------------------------------------
+class JobRun(models.Model):
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_SKIPPED = "skipped"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, _("Bajarilmoqda")),
+        (STATUS_SUCCEEDED, _("Bajarildi")),
+        (STATUS_FAILED, _("Xatolik")),
+        (STATUS_SKIPPED, _("O'tkazib yuborildi")),
+    ]
+    # Counters a job reports in its stats dict
+    COUNTERS = [
+        "rows_scanned",
+        "rows_written",
+        "messages_sent",
+        "messages_failed",
+    ]
+
+    job = models.CharField(_("Vazifa"), max_length=100)
+    status = models.CharField(
+        _("Holati"),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_RUNNING,
+    )
+    started_at = models.DateTimeField(_("Boshlangan vaqt"))
+    finished_at = models.DateTimeField(
+        _("Tugagan vaqt"), null=True, blank=True
+    )
+    error = models.TextField(_("Xatolik"), blank=True)
+    rows_scanned = models.PositiveIntegerField(
+        _("Ko'rilgan qatorlar"), default=0
+    )
+    rows_written = models.PositiveIntegerField(
+        _("Yozilgan qatorlar"), default=0
+    )
+    messages_sent = models.PositiveIntegerField(
+        _("Yuborilgan xabarlar"), default=0
+    )
+    messages_failed = models.PositiveIntegerField(
+        _("Yuborilmagan xabarlar"), default=0
+    )
+
+    class Meta:
+        verbose_name = _("Vazifa bajarilishi")
+        verbose_name_plural = _("Vazifalar bajarilishi")
+        indexes = [
+            models.Index(
+                fields=["job", "-started_at"], name="job_run_latest_idx"
+            ),
+            models.Index(
+                fields=["started_at", "id"], name="job_run_started_keyset_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.job} - {self.get_status_display()}"
+
+    @property
+    def duration(self):
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+    def add(self, stats):
+        """Add the ``COUNTERS`` found in a job's stats dict"""
+        for counter in self.COUNTERS:
+            setattr(
+                self,
+                counter,
+                getattr(self, counter) + (stats or {}).get(counter, 0),
+            )
+
+    def has_work(self):
+        return any(getattr(self, counter) for counter in self.COUNTERS)
+
+
+# Rasm variantlari
+# -----------------------------------------------------------------------------------------
+RENDITION_DIR = "renditions/"
+
+
+class ImageRenditionQuerySet(models.QuerySet):
+    def enqueue(self, names):
+        """
+        Queue every rendition and format of the stored images ``names``;
+        images already queued or rendered are left as they are.
+        """
+        return self.bulk_create(
+            [
+                ImageRendition(
+                    source=name, rendition=rendition, image_format=image_format
+                )
+                for name in dict.fromkeys(names)
+                if name
+                for rendition in ImageRendition.RENDITIONS
+                for image_format in ImageRendition.FORMATS
+            ],
+            ignore_conflicts=True,
+        )
+
+    def for_sources(self, names):
+        return self.filter(
+            source__in=names, status=ImageRendition.STATUS_READY
+        )
+
+
+class ImageRendition(models.Model):
+    """
+    A resized copy of an uploaded image (``source`` is its storage name),
+    rendered by ``manage.py process_image_renditions``. Rendition files
+    are never rewritten, so they are served with long-lived cache headers.
+    """
+
+    # Name -> bounding box; images are never upscaled
+    RENDITIONS = {
+        "thumbnail": (200, 200),
+        "medium": (800, 800),
+        "full": (1600, 1600),
+    }
+    FORMATS = {"webp": "image/webp", "jpeg": "image/jpeg"}
+    STATUS_PENDING = "pending"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Navbatda")),
+        (STATUS_READY, _("Tayyor")),
+        (STATUS_FAILED, _("Xatolik")),
+    ]
+
+    source = models.CharField(_("Asl rasm"), max_length=255)
+    rendition = models.CharField(
+        _("O'lchami"),
+        max_length=10,
+        choices=[(name, name) for name in RENDITIONS],
+    )
+    image_format = models.CharField(
+        _("Formati"),
+        max_length=4,
+        choices=[(name, name) for name in FORMATS],
+    )
+    file = models.FileField(
+        _("Fayl"), upload_to=RENDITION_DIR, max_length=255, blank=True
+    )
+    width = models.PositiveIntegerField(_("Eni"), null=True, blank=True)
+    height = models.PositiveIntegerField(_("Bo'yi"), null=True, blank=True)
+    size = models.PositiveIntegerField(_("Hajmi"), null=True, blank=True)
+    status = models.CharField(
+        _("Holati"),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    error = models.TextField(_("Xatolik"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    rendered_at = models.DateTimeField(
+        _("Tayyorlangan vaqt"), null=True, blank=True
+    )
+
+    objects = ImageRenditionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Rasm varianti")
+        verbose_name_plural = _("Rasm variantlari")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "rendition", "image_format"],
+                name="unique_image_rendition",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="pending"),
+                name="image_rendition_pending_idx",
+            ),
+            # Files served by ImageRenditionAPIView
+            models.Index(
+                fields=["file"],
+                condition=models.Q(status="ready"),
+                name="image_rendition_file_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source} - {self.rendition}.{self.image_format}"
+
+
+def enqueue_image_renditions(field_name):
+    """``post_save`` receiver queueing the renditions of ``field_name``"""
+
+    def receiver(sender, instance, update_fields=None, **kwargs):
+        # Logins only touch last_login
+        if update_fields and field_name not in update_fields:
+            return
+        name = getattr(instance, field_name).name
+        if name:
+            ImageRendition.objects.enqueue([name])
+
+    return receiver
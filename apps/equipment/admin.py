@@ -5,6 +5,7 @@ from apps.equipment.models import (
     LatheMachine,
     LiftingCrane,
     PressureVessel,
+    QRCodeJob,
     WeldingEquipment,
 )
 
@@ -15,5 +16,6 @@ admin.site.register(
         HeatingBoiler,
         PressureVessel,
         LatheMachine,
+        QRCodeJob,
     ]
 )
@@ -1,6 +1,11 @@
+import copy
+
+from django.urls import reverse
 from rest_framework import serializers
 
+from apps.core.api.serializers import RenditionsField
 from apps.equipment.models import (
+    EQUIPMENT_TYPE_MODELS,
     Equipment,
     HeatingBoiler,
     LatheMachine,
@@ -10,6 +15,9 @@ from apps.equipment.models import (
 )
 from apps.users.api.serializers import UserSerializer
 from apps.users.models import User
+from apps.utils.equipment_map import NEAREST_LIMIT, NEAREST_MAX_LIMIT
+from apps.utils.image_renditions import rendition_values
+from apps.utils.values_serializer import ValuesSerializer, get_request
 
 
 class LatheMachineModelSerializers(serializers.ModelSerializer):
@@ -28,7 +36,9 @@ class LatheMachineModelSerializers(serializers.ModelSerializer):
         write_only=True,
     )
     qr_code = serializers.ImageField(read_only=True)
+    qr_status = serializers.CharField(read_only=True)
     qr_code_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField(source="image")
     latitude = serializers.DecimalField(
         max_digits=10, decimal_places=8, required=False, allow_null=True
     )
@@ -44,12 +54,11 @@ class LatheMachineModelSerializers(serializers.ModelSerializer):
 
     def get_qr_code_url(self, obj):
         """Get full URL for QR code image"""
-        if obj.qr_code:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.qr_code.url)
-            return obj.qr_code.url
-        return None
+        url = reverse("equipment-qr", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(url)
+        return url
 
     def get_location_display(self, obj):
         """Get formatted location display"""
@@ -100,7 +109,9 @@ class WeldingEquipmentModelSerializer(serializers.ModelSerializer):
         write_only=True,
     )
     qr_code = serializers.ImageField(read_only=True)
+    qr_status = serializers.CharField(read_only=True)
     qr_code_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField(source="image")
 
     class Meta:
         model = WeldingEquipment
@@ -108,12 +119,11 @@ class WeldingEquipmentModelSerializer(serializers.ModelSerializer):
 
     def get_qr_code_url(self, obj):
         """Get full URL for QR code image"""
-        if obj.qr_code:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.qr_code.url)
-            return obj.qr_code.url
-        return None
+        url = reverse("equipment-qr", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(url)
+        return url
 
 
 class HeatingBoilerModelSerializer(serializers.ModelSerializer):
@@ -132,7 +142,9 @@ class HeatingBoilerModelSerializer(serializers.ModelSerializer):
         write_only=True,
     )
     qr_code = serializers.ImageField(read_only=True)
+    qr_status = serializers.CharField(read_only=True)
     qr_code_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField(source="image")
 
     class Meta:
         model = HeatingBoiler
@@ -140,12 +152,11 @@ class HeatingBoilerModelSerializer(serializers.ModelSerializer):
 
     def get_qr_code_url(self, obj):
         """Get full URL for QR code image"""
-        if obj.qr_code:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.qr_code.url)
-            return obj.qr_code.url
-        return None
+        url = reverse("equipment-qr", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(url)
+        return url
 
 
 class LiftingCraneModelSerializer(serializers.ModelSerializer):
@@ -164,7 +175,9 @@ class LiftingCraneModelSerializer(serializers.ModelSerializer):
         write_only=True,
     )
     qr_code = serializers.ImageField(read_only=True)
+    qr_status = serializers.CharField(read_only=True)
     qr_code_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField(source="image")
 
     class Meta:
         model = LiftingCrane
@@ -172,12 +185,11 @@ class LiftingCraneModelSerializer(serializers.ModelSerializer):
 
     def get_qr_code_url(self, obj):
         """Get full URL for QR code image"""
-        if obj.qr_code:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.qr_code.url)
-            return obj.qr_code.url
-        return None
+        url = reverse("equipment-qr", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(url)
+        return url
 
 
 class PressureVesselModelSerializer(serializers.ModelSerializer):
@@ -196,7 +208,9 @@ class PressureVesselModelSerializer(serializers.ModelSerializer):
         write_only=True,
     )
     qr_code = serializers.ImageField(read_only=True)
+    qr_status = serializers.CharField(read_only=True)
     qr_code_url = serializers.SerializerMethodField()
+    image_renditions = RenditionsField(source="image")
 
     class Meta:
         model = PressureVessel
@@ -204,31 +218,215 @@ class PressureVesselModelSerializer(serializers.ModelSerializer):
 
     def get_qr_code_url(self, obj):
         """Get full URL for QR code image"""
-        if obj.qr_code:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.qr_code.url)
-            return obj.qr_code.url
-        return None
+        url = reverse("equipment-qr", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(url)
+        return url
 
 
 class EquipmentPolymorphicSerializer(serializers.ModelSerializer):
     """Dynamically serialize the correct equipment subclass."""
 
+    type_map = {
+        "lathe_machine": LatheMachineModelSerializers,
+        "welding_equipment": WeldingEquipmentModelSerializer,
+        "heating_boiler": HeatingBoilerModelSerializer,
+        "lifting_crane": LiftingCraneModelSerializer,
+        "pressure_vessel": PressureVesselModelSerializer,
+    }
+
+    def get_child_serializer(self, model_type):
+        """Build each child serializer once and reuse it for every row"""
+        if not hasattr(self, "_child_serializers"):
+            self._child_serializers = {}
+        if model_type not in self._child_serializers:
+            serializer_class = self.type_map.get(model_type)
+            self._child_serializers[model_type] = (
+                serializer_class() if serializer_class else None
+            )
+        return self._child_serializers[model_type]
+
     def to_representation(self, instance: Equipment):
-        type_map = {
-            "lathe_machine": LatheMachineModelSerializers,
-            "welding_equipment": WeldingEquipmentModelSerializer,
-            "heating_boiler": HeatingBoilerModelSerializer,
-            "lifting_crane": LiftingCraneModelSerializer,
-            "pressure_vessel": PressureVesselModelSerializer,
-        }
-        model_type = instance.type
-        serializer_class = type_map.get(model_type)
-        if serializer_class:
-            return serializer_class(instance=instance.get_real_instance()).data
+        serializer = self.get_child_serializer(instance.type)
+        if serializer:
+            return serializer.to_representation(instance.get_real_instance())
         return super().to_representation(instance)
 
     class Meta:
         model = Equipment
         fields = "__all__"
+
+
+# .values() read path for list endpoints
+# ------------------------------------------------------------------------------------------
+def qr_code_url_field(context):
+    """``get_qr_code_url`` without reversing the URL for every row"""
+    sentinel = "2147483647"
+    prefix, suffix = reverse(
+        "equipment-qr", kwargs={"pk": int(sentinel)}
+    ).split(sentinel)
+    request = get_request(context)
+    if request:
+        prefix = request.build_absolute_uri(prefix)
+    return lambda row: f"{prefix}{row['equipment_ptr_id']}{suffix}"
+
+
+def location_display_field(context):
+    def location_display(row):
+        if row["latitude"] and row["longitude"]:
+            return f"{row['latitude']}, {row['longitude']}"
+        return "Joylashuv belgilanmagan"
+
+    return location_display
+
+
+EQUIPMENT_METHOD_FIELDS = {
+    "qr_code_url": (["equipment_ptr_id"], qr_code_url_field),
+    "location_display": (["latitude", "longitude"], location_display_field),
+}
+EQUIPMENT_RELATED = {"image_renditions": rendition_values}
+
+
+class EquipmentPolymorphicValuesSerializer:
+    """
+    ``EquipmentPolymorphicSerializer`` output from ``.values()`` rows: one
+    query per equipment type present, child payloads without request
+    context (relative URLs) exactly like the nested child serializers.
+    """
+
+    columns = ["id", "type"]
+    selection = None
+
+    def __init__(self):
+        self.children = {
+            equipment_type: ValuesSerializer(
+                serializer_class,
+                method_fields=EQUIPMENT_METHOD_FIELDS,
+                related=EQUIPMENT_RELATED,
+            )
+            for equipment_type, serializer_class in (
+                EquipmentPolymorphicSerializer.type_map.items()
+            )
+        }
+
+    def select(self, selection):
+        clone = copy.copy(self)
+        clone.children = {
+            equipment_type: child.select(selection)
+            for equipment_type, child in self.children.items()
+        }
+        clone.selection = selection
+        return clone
+
+    def fallback(self, pk, equipment_type):
+        data = {"id": pk, "type": equipment_type}
+        return self.selection.filter(data) if self.selection else data
+
+    def render_typed(self, typed_pks):
+        pks_by_type = {}
+        for pk, equipment_type in typed_pks:
+            pks_by_type.setdefault(equipment_type, []).append(pk)
+
+        rendered = {}
+        for equipment_type, pks in pks_by_type.items():
+            child = self.children.get(equipment_type)
+            if child is None:
+                continue
+            model = EQUIPMENT_TYPE_MODELS[equipment_type]
+            rows = model.objects.filter(pk__in=pks).values(
+                "equipment_ptr_id", *child.columns
+            )
+            rows = list(rows)
+            for row, data in zip(rows, child.render(rows)):
+                rendered[row["equipment_ptr_id"]] = data
+        return {
+            pk: rendered.get(pk) or self.fallback(pk, equipment_type)
+            for pk, equipment_type in typed_pks
+        }
+
+    def render_pks(self, pks):
+        return self.render_typed(
+            Equipment.objects.filter(pk__in=pks).values_list("pk", "type")
+        )
+
+    def render(self, rows, context=None):
+        rows = list(rows)
+        rendered = self.render_typed(
+            [(row["id"], row["type"]) for row in rows]
+        )
+        return [rendered[row["id"]] for row in rows]
+
+
+equipment_values_serializers = {
+    LatheMachine: ValuesSerializer(
+        LatheMachineModelSerializers,
+        method_fields=EQUIPMENT_METHOD_FIELDS,
+        related=EQUIPMENT_RELATED,
+    ),
+    WeldingEquipment: ValuesSerializer(
+        WeldingEquipmentModelSerializer,
+        method_fields=EQUIPMENT_METHOD_FIELDS,
+        related=EQUIPMENT_RELATED,
+    ),
+    HeatingBoiler: ValuesSerializer(
+        HeatingBoilerModelSerializer,
+        method_fields=EQUIPMENT_METHOD_FIELDS,
+        related=EQUIPMENT_RELATED,
+    ),
+    LiftingCrane: ValuesSerializer(
+        LiftingCraneModelSerializer,
+        method_fields=EQUIPMENT_METHOD_FIELDS,
+        related=EQUIPMENT_RELATED,
+    ),
+    PressureVessel: ValuesSerializer(
+        PressureVesselModelSerializer,
+        method_fields=EQUIPMENT_METHOD_FIELDS,
+        related=EQUIPMENT_RELATED,
+    ),
+}
+equipment_polymorphic_values_serializer = (
+    EquipmentPolymorphicValuesSerializer()
+)
+
+
+class EquipmentImportSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=Equipment.EQUIPMENT_MODEL_CHOICES)
+    file = serializers.FileField()
+
+
+class EquipmentMapQuerySerializer(serializers.Serializer):
+    bbox = serializers.CharField(
+        help_text="min_longitude,min_latitude,max_longitude,max_latitude"
+    )
+    zoom = serializers.IntegerField(min_value=0, max_value=22)
+
+    def validate_bbox(self, value):
+        try:
+            min_lon, min_lat, max_lon, max_lat = map(float, value.split(","))
+        except ValueError:
+            raise serializers.ValidationError(
+                "bbox to'rtta son bo'lishi kerak: min_lon,min_lat,max_lon,max_lat"
+            )
+        if not (-90 <= min_lat <= 90 and -90 <= max_lat <= 90):
+            raise serializers.ValidationError(
+                "Kenglik -90 dan 90 gacha bo'lishi kerak."
+            )
+        if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+            raise serializers.ValidationError(
+                "Uzunlik -180 dan 180 gacha bo'lishi kerak."
+            )
+        if min_lat > max_lat or min_lon > max_lon:
+            raise serializers.ValidationError(
+                "bbox minimal qiymatlari maksimal qiymatlaridan katta "
+                "bo'lmasligi kerak."
+            )
+        return min_lat, min_lon, max_lat, max_lon
+
+
+class EquipmentNearbyQuerySerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=NEAREST_MAX_LIMIT, default=NEAREST_LIMIT
+    )
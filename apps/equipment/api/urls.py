@@ -1,6 +1,12 @@
 from django.urls import path
 
 from apps.equipment.api.views import (
+    DetailCacheStatsAPIView,
+    EquipmentAutocompleteAPIView,
+    EquipmentImportAPIView,
+    EquipmentMapAPIView,
+    EquipmentNearbyAPIView,
+    EquipmentQRCodeAPIView,
     HeatingBoilerListCreateAPIView,
     HeatingBoilerRetrieveUpdateDestroyAPIView,
     LatheMachineListCreateAPIView,
@@ -64,4 +70,34 @@ urlpatterns = [
         PressureVesselRetrieveUpdateDestroyAPIView.as_view(),
         name="pressure_vessel-detail",
     ),
+    path(
+        "equipment-qr/<int:pk>/",
+        EquipmentQRCodeAPIView.as_view(),
+        name="equipment-qr",
+    ),
+    path(
+        "equipment-import/",
+        EquipmentImportAPIView.as_view(),
+        name="equipment-import",
+    ),
+    path(
+        "equipment/autocomplete/",
+        EquipmentAutocompleteAPIView.as_view(),
+        name="equipment-autocomplete",
+    ),
+    path(
+        "equipment/map/",
+        EquipmentMapAPIView.as_view(),
+        name="equipment-map",
+    ),
+    path(
+        "equipment/nearby/",
+        EquipmentNearbyAPIView.as_view(),
+        name="equipment-nearby",
+    ),
+    path(
+        "detail-cache/stats/",
+        DetailCacheStatsAPIView.as_view(),
+        name="detail-cache-stats",
+    ),
 ]
@@ -1,42 +1,77 @@
 import uuid
 
+from django.conf import settings
 from django.core.files import File
 from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils.translation import gettext_lazy as _
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import filters, generics, permissions, status
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.equipment.api.serializers import (
+    EquipmentImportSerializer,
+    EquipmentMapQuerySerializer,
+    EquipmentNearbyQuerySerializer,
     HeatingBoilerModelSerializer,
     LatheMachineModelSerializers,
     LiftingCraneModelSerializer,
     PressureVesselModelSerializer,
     WeldingEquipmentModelSerializer,
+    equipment_values_serializers,
 )
 from apps.equipment.models import (
+    SEARCH_FIELDS,
+    Equipment,
     HeatingBoiler,
     LatheMachine,
     LiftingCrane,
     PressureVessel,
     WeldingEquipment,
 )
-from apps.users.api.permissions import IsEquipmentMaster
+from apps.maintenance.models import MaintenanceSchedule
+from apps.users.api.permissions import IsEquipmentMaster, IsSuperUser
+from apps.users.models import User
+from apps.utils import detail_cache
+from apps.utils.detail_cache import CachedDetailMixin
+from apps.utils.equipment_import import import_equipment
+from apps.utils.equipment_map import nearest, viewport
 from apps.utils.paginator import StandardResultsSetPagination
-from apps.utils.qr_code import generate_equipment_qr_code
+from apps.utils.qr_code import (
+    QR_CODE_CONTENT_TYPES,
+    QR_CODE_MAX_SIZE,
+    QR_CODE_MIN_SIZE,
+    generate_equipment_qr_code,
+    qr_code_hash,
+    render_qr_code,
+)
+from apps.utils.search import (
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
+    TrigramSearchFilter,
+    autocomplete_equipment,
+)
+from apps.utils.values_serializer import ValuesListMixin
 
 
 # Tokarlik dastgohlari
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Tokarlik dastgohlari"])
-class LatheMachineListCreateAPIView(generics.ListCreateAPIView):
+class LatheMachineListCreateAPIView(
+    ValuesListMixin, generics.ListCreateAPIView
+):
     queryset = LatheMachine.objects.order_by("-created_at")
     serializer_class = LatheMachineModelSerializers
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["company_name", "detail_name"]
+    filter_backends = [TrigramSearchFilter, filters.OrderingFilter]
+    search_fields = SEARCH_FIELDS
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = equipment_values_serializers[LatheMachine]
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -70,7 +105,7 @@ class LatheMachineListCreateAPIView(generics.ListCreateAPIView):
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Tokarlik dastgohlari"])
 class LatheMachineRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    CachedDetailMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = LatheMachine.objects.all()
     serializer_class = LatheMachineModelSerializers
@@ -85,24 +120,32 @@ class LatheMachineRetrieveUpdateDestroyAPIView(
                 _("Bu id raqamga mos tokarlik dastgohi mavjud emas")
             )
 
+    def get_cache_dependencies(self, instance):
+        return [(User, instance.responsible_person_id)]
+
     def get(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
         return Response(
-            {"status": status.HTTP_204_NO_CONTENT, "data": serializer.data}
+            {
+                "status": status.HTTP_204_NO_CONTENT,
+                "data": self.get_cached_data(),
+            }
         )
 
 
 # Payvandlash uskunalari
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Payvandlash qurilmalari"])
-class WeldingEquipmentListCreateAPIView(generics.ListCreateAPIView):
+class WeldingEquipmentListCreateAPIView(
+    ValuesListMixin, generics.ListCreateAPIView
+):
     queryset = WeldingEquipment.objects.order_by("-created_at")
     serializer_class = WeldingEquipmentModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["company_name", "detail_name"]
+    filter_backends = [TrigramSearchFilter, filters.OrderingFilter]
+    search_fields = SEARCH_FIELDS
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = equipment_values_serializers[WeldingEquipment]
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -136,7 +179,7 @@ class WeldingEquipmentListCreateAPIView(generics.ListCreateAPIView):
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Payvandlash qurilmalari"])
 class WeldingEquipmentRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    CachedDetailMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = WeldingEquipment.objects.all()
     serializer_class = WeldingEquipmentModelSerializer
@@ -151,24 +194,29 @@ class WeldingEquipmentRetrieveUpdateDestroyAPIView(
                 _("Bu id raqamga mos payvandlash qurilmasi mavjud emas")
             )
 
+    def get_cache_dependencies(self, instance):
+        return [(User, instance.responsible_person_id)]
+
     def get(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
         return Response(
-            {"status": status.HTTP_200_OK, "data": serializer.data}
+            {"status": status.HTTP_200_OK, "data": self.get_cached_data()}
         )
 
 
 # Isitish qozonlari
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Isitish qozonlari"])
-class HeatingBoilerListCreateAPIView(generics.ListCreateAPIView):
+class HeatingBoilerListCreateAPIView(
+    ValuesListMixin, generics.ListCreateAPIView
+):
     queryset = HeatingBoiler.objects.order_by("-created_at")
     serializer_class = HeatingBoilerModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["company_name", "detail_name"]
+    filter_backends = [TrigramSearchFilter, filters.OrderingFilter]
+    search_fields = SEARCH_FIELDS
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = equipment_values_serializers[HeatingBoiler]
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -202,7 +250,7 @@ class HeatingBoilerListCreateAPIView(generics.ListCreateAPIView):
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Isitish qozonlari"])
 class HeatingBoilerRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    CachedDetailMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = HeatingBoiler.objects.all()
     serializer_class = HeatingBoilerModelSerializer
@@ -215,24 +263,29 @@ class HeatingBoilerRetrieveUpdateDestroyAPIView(
         except HeatingBoiler.DoesNotExist:
             raise NotFound(_("Bu id raqamga mos isitish qozoni mavjud emas"))
 
+    def get_cache_dependencies(self, instance):
+        return [(User, instance.responsible_person_id)]
+
     def get(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
         return Response(
-            {"status": status.HTTP_200_OK, "data": serializer.data}
+            {"status": status.HTTP_200_OK, "data": self.get_cached_data()}
         )
 
 
 # Yuk ko'tarish kranlari
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Yuk ko'tarish kranlari"])
-class LiftingCraneListCreateAPIView(generics.ListCreateAPIView):
+class LiftingCraneListCreateAPIView(
+    ValuesListMixin, generics.ListCreateAPIView
+):
     queryset = LiftingCrane.objects.order_by("-created_at")
     serializer_class = LiftingCraneModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["company_name", "detail_name"]
+    filter_backends = [TrigramSearchFilter, filters.OrderingFilter]
+    search_fields = SEARCH_FIELDS
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = equipment_values_serializers[LiftingCrane]
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -264,7 +317,7 @@ class LiftingCraneListCreateAPIView(generics.ListCreateAPIView):
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Yuk ko'tarish kranlari"])
 class LiftingCraneRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    CachedDetailMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = LiftingCrane.objects.all()
     serializer_class = LiftingCraneModelSerializer
@@ -279,24 +332,29 @@ class LiftingCraneRetrieveUpdateDestroyAPIView(
                 _("Bu id raqamga mos yuk ko'tarish krani mavjud emas")
             )
 
+    def get_cache_dependencies(self, instance):
+        return [(User, instance.responsible_person_id)]
+
     def get(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
         return Response(
-            {"status": status.HTTP_200_OK, "data": serializer.data}
+            {"status": status.HTTP_200_OK, "data": self.get_cached_data()}
         )
 
 
 # Bosim ostida sig'imlar
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Bosim ostida sig'imlar"])
-class PressureVesselListCreateAPIView(generics.ListCreateAPIView):
+class PressureVesselListCreateAPIView(
+    ValuesListMixin, generics.ListCreateAPIView
+):
     queryset = PressureVessel.objects.order_by("-created_at")
     serializer_class = PressureVesselModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["company_name", "detail_name"]
+    filter_backends = [TrigramSearchFilter, filters.OrderingFilter]
+    search_fields = SEARCH_FIELDS
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = equipment_values_serializers[PressureVessel]
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -328,7 +386,7 @@ class PressureVesselListCreateAPIView(generics.ListCreateAPIView):
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Bosim ostida sig'imlar"])
 class PressureVesselRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    CachedDetailMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = PressureVessel.objects.all()
     serializer_class = PressureVesselModelSerializer
@@ -343,9 +401,206 @@ class PressureVesselRetrieveUpdateDestroyAPIView(
                 _("Bu id raqamga mos bosim ostida sig'im mavjud emas")
             )
 
+    def get_cache_dependencies(self, instance):
+        return [(User, instance.responsible_person_id)]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {"status": status.HTTP_200_OK, "data": self.get_cached_data()}
+        )
+
+
+# QR kodlar
+# ------------------------------------------------------------------------------------------
+@extend_schema(
+    tags=["QR kodlar"],
+    parameters=[
+        OpenApiParameter("image_format", str, enum=["png", "svg"]),
+        OpenApiParameter("size", int, description="Rasm kengligi (px)"),
+    ],
+    responses={(200, "image/png"): OpenApiTypes.BINARY},
+)
+class EquipmentQRCodeAPIView(APIView):
+    """
+    Render the QR code of an equipment on demand. Public, because it is
+    embedded with <img> tags that cannot send a JWT; the image only
+    encodes the (authenticated) detail URL.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request, pk):
+        image_format = request.query_params.get("image_format", "png")
+        if image_format not in QR_CODE_CONTENT_TYPES:
+            raise ValidationError(
+                {"image_format": _("Faqat png yoki svg formatlari mavjud")}
+            )
+        size = request.query_params.get("size")
+        if size is not None:
+            try:
+                size = int(size)
+            except ValueError:
+                size = 0
+            if not QR_CODE_MIN_SIZE <= size <= QR_CODE_MAX_SIZE:
+                raise ValidationError(
+                    {
+                        "size": _(
+                            "O'lcham %(min)s va %(max)s oralig'ida bo'lishi kerak"
+                        )
+                        % {"min": QR_CODE_MIN_SIZE, "max": QR_CODE_MAX_SIZE}
+                    }
+                )
+
+        equipment_type = (
+            Equipment.objects.filter(pk=pk)
+            .values_list("type", flat=True)
+            .first()
+        )
+        if equipment_type is None:
+            raise NotFound(_("Bu id raqamga mos uskuna mavjud emas"))
+
+        payload = Equipment(pk=pk, type=equipment_type).get_detail_url()
+        etag = f'"{qr_code_hash(payload, image_format, size)}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            content = render_qr_code(payload, image_format, size)[1]
+            response = HttpResponse(
+                content, content_type=QR_CODE_CONTENT_TYPES[image_format]
+            )
+        response["ETag"] = etag
+        response[
+            "Cache-Control"
+        ] = f"public, max-age={settings.QR_CODE_CACHE_MAX_AGE}"
+        return response
+
+
+# Uskunalarni import qilish
+# ------------------------------------------------------------------------------------------
+@extend_schema(
+    tags=["Uskunalarni import qilish"], request=EquipmentImportSerializer
+)
+class EquipmentImportAPIView(APIView):
+    """
+    Bulk-create equipment of one type from a CSV/XLSX file. Columns are the
+    model fields; the required ``responsible_person`` takes a username
+    or JSHSHIR.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = EquipmentImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        file = serializer.validated_data["file"]
+        result = import_equipment(
+            file,
+            file.name,
+            serializer.validated_data["type"],
+            author=request.user,
+        )
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Uskunalar import qilindi",
+                "data": result,
+            }
+        )
+
+
+# Uskunalarni qidirish
+# ------------------------------------------------------------------------------------------
+@extend_schema(
+    tags=["Uskunalarni qidirish"],
+    parameters=[
+        OpenApiParameter("q", str, required=True),
+        OpenApiParameter("limit", int),
+    ],
+)
+class EquipmentAutocompleteAPIView(APIView):
+    """Typeahead over all equipment types: only id, type and name"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
     def get(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
+        term = request.query_params.get("q", "").strip()
+        if not term:
+            return Response({"status": status.HTTP_200_OK, "data": []})
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
         return Response(
-            {"status": status.HTTP_200_OK, "data": serializer.data}
+            {
+                "status": status.HTTP_200_OK,
+                "data": autocomplete_equipment(term, limit),
+            }
         )
+
+
+# Uskunalar xaritasi
+# ------------------------------------------------------------------------------------------
+@extend_schema(
+    tags=["Uskunalar xaritasi"], parameters=[EquipmentMapQuerySerializer]
+)
+class EquipmentMapAPIView(APIView):
+    """Points (high zoom) or clusters (low zoom) inside a bounding box"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        serializer = EquipmentMapQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": viewport(
+                    *serializer.validated_data["bbox"],
+                    serializer.validated_data["zoom"],
+                ),
+            }
+        )
+
+
+@extend_schema(
+    tags=["Uskunalar xaritasi"], parameters=[EquipmentNearbyQuerySerializer]
+)
+class EquipmentNearbyAPIView(APIView):
+    """Equipment nearest to a GPS position, closest first"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        serializer = EquipmentNearbyQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": nearest(**serializer.validated_data),
+            }
+        )
+
+
+# Detal kesh statistikasi
+# ------------------------------------------------------------------------------------------
+@extend_schema(tags=["Kesh"])
+class DetailCacheStatsAPIView(APIView):
+    """Hit/miss counters of the cached detail endpoints"""
+
+    permission_classes = [IsSuperUser]
+    cached_models = [Equipment, MaintenanceSchedule]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": detail_cache.get_stats(self.cached_models),
+            }
+        )
+
+    def delete(self, request, *args, **kwargs):
+        detail_cache.reset_stats(self.cached_models)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,203 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.equipment.api.serializers import (
+    EquipmentPolymorphicSerializer,
+    LatheMachineModelSerializers,
+    equipment_polymorphic_values_serializer,
+    equipment_values_serializers,
+)
+from apps.equipment.models import Equipment, LatheMachine
+from apps.maintenance.api.serializers import (
+    EquipmentFaultModelSerializer,
+    MaintenanceScheduleModelSerializer,
+    MaintenanceWarningModelSerializer,
+    fault_values_serializer,
+    schedule_values_serializer,
+    warning_values_serializer,
+)
+from apps.maintenance.api.views import MaintenanceScheduleListCreateAPIView
+from apps.maintenance.models import (
+    EquipmentFault,
+    MaintenanceSchedule,
+    MaintenanceWarning,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list serialization throughput of the ModelSerializer and "
+        "the .values() read paths and check that the JSON is identical"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[10, 100, 1000]
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--fixtures",
+            action="store_true",
+            help="Create missing rows for the largest size and roll them "
+            "back afterwards",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options["fixtures"]:
+                    self.create_fixtures(max(options["sizes"]))
+                self.run(options["sizes"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def get_targets(self):
+        return [
+            (
+                "lathe_machine",
+                LatheMachine.objects.order_by("-created_at"),
+                LatheMachineModelSerializers,
+                equipment_values_serializers[LatheMachine],
+            ),
+            (
+                "equipment",
+                Equipment.objects.polymorphic().order_by("-id"),
+                EquipmentPolymorphicSerializer,
+                equipment_polymorphic_values_serializer,
+            ),
+            (
+                "maintenance_schedule",
+                MaintenanceScheduleListCreateAPIView.queryset.all(),
+                MaintenanceScheduleModelSerializer,
+                schedule_values_serializer,
+            ),
+            (
+                "maintenance_warning",
+                MaintenanceWarning.objects.order_by("-sent_date"),
+                MaintenanceWarningModelSerializer,
+                warning_values_serializer,
+            ),
+            (
+                "equipment_fault",
+                EquipmentFault.objects.order_by("-created_at"),
+                EquipmentFaultModelSerializer,
+                fault_values_serializer,
+            ),
+        ]
+
+    def run(self, sizes, repeat):
+        renderer = JSONRenderer()
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            context = {"request": RequestFactory().get("/")}
+            for name, queryset, serializer_class, values in self.get_targets():
+                for size in sizes:
+
+                    def serializer_path():
+                        page = list(queryset[:size])
+                        data = serializer_class(
+                            page, many=True, context=context
+                        ).data
+                        return renderer.render(data)
+
+                    def values_path():
+                        page = list(
+                            queryset.prefetch_related(None).values(
+                                *values.columns
+                            )[:size]
+                        )
+                        return renderer.render(values.render(page, context))
+
+                    expected = serializer_path()
+                    if values_path() != expected:
+                        raise CommandError(
+                            f"{name}: .values() output differs at {size}"
+                        )
+                    rows = queryset[:size].count()
+                    old = self.measure(serializer_path, repeat)
+                    new = self.measure(values_path, repeat)
+                    self.stdout.write(
+                        f"{name:<22} size={size:<5} rows={rows:<5} "
+                        f"serializer={self.rate(rows, old):>9} rows/s "
+                        f"values={self.rate(rows, new):>9} rows/s "
+                        f"x{old / new:.1f}"
+                    )
+
+    def measure(self, function, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def rate(self, rows, elapsed):
+        return f"{rows / elapsed:.0f}" if elapsed else "-"
+
+    def create_fixtures(self, count):
+        now = timezone.now()
+        missing = count - LatheMachine.objects.count()
+        for number in range(missing):
+            LatheMachine(
+                detail_name=f"Benchmark {number}",
+                factory_number=f"BM-{number}",
+                latitude="41.30000000",
+                longitude="69.24000000",
+            ).save()
+
+        equipment_ids = list(
+            LatheMachine.objects.values_list("pk", flat=True)[:count]
+        )
+        missing = count - MaintenanceSchedule.objects.count()
+        MaintenanceSchedule.objects.bulk_create(
+            MaintenanceSchedule(
+                equipment_id=equipment_ids[number % len(equipment_ids)],
+                maintenance_type="lubrication_check",
+                scheduled_date=now.date(),
+            )
+            for number in range(missing)
+        )
+
+        # One warning level per schedule is unique, so warnings get
+        # schedules of their own
+        missing = count - MaintenanceWarning.objects.count()
+        schedules = MaintenanceSchedule.objects.bulk_create(
+            MaintenanceSchedule(
+                equipment_id=equipment_ids[number % len(equipment_ids)],
+                maintenance_type="safety_valve_check",
+                scheduled_date=now.date(),
+            )
+            for number in range(max(missing, 0))
+        )
+        MaintenanceWarning.objects.bulk_create(
+            MaintenanceWarning(
+                maintenance_schedule=schedule,
+                warning_level="low",
+                warning_time="one_month",
+                sent_date=now,
+            )
+            for schedule in schedules
+        )
+
+        missing = count - EquipmentFault.objects.count()
+        EquipmentFault.objects.bulk_create(
+            EquipmentFault(
+                equipment_id=equipment_ids[number % len(equipment_ids)],
+                title=f"Benchmark {number}",
+            )
+            for number in range(missing)
+        )
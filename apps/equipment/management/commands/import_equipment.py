@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from apps.equipment.models import EQUIPMENT_TYPE_MODELS
+from apps.users.models import User
+from apps.utils.equipment_import import (
+    IMPORT_BATCH_SIZE,
+    EquipmentImporter,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Bulk-import equipment of one type from a CSV/XLSX file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--type", required=True, choices=list(EQUIPMENT_TYPE_MODELS)
+        )
+        parser.add_argument("--author", help="Username of the author")
+        parser.add_argument(
+            "--batch-size", type=int, default=IMPORT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        author = None
+        if options["author"]:
+            author = User.objects.filter(username=options["author"]).first()
+            if author is None:
+                raise CommandError(f"User {options['author']} not found")
+
+        importer = EquipmentImporter(
+            options["type"], author=author, batch_size=options["batch_size"]
+        )
+        try:
+            with open(options["path"], "rb") as file:
+                result = importer.run(read_rows(file, options["path"]))
+        except ValidationError as e:
+            raise CommandError(e.detail)
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            f"{result['created']} created, {len(result['errors'])} rows failed"
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.equipment.models import EQUIPMENT_TYPE_MODELS, QRCodeJob
+from apps.utils.job_runs import track_run
+from apps.utils.qr_code import process_qr_code_jobs
+
+
+class Command(BaseCommand):
+    help = "Render queued equipment QR codes in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+        parser.add_argument(
+            "--enqueue-missing",
+            action="store_true",
+            help="Queue every equipment that has no QR code yet",
+        )
+
+    def handle(self, *args, **options):
+        if options["enqueue_missing"]:
+            for model in EQUIPMENT_TYPE_MODELS.values():
+                missing = model.objects.filter(
+                    Q(qr_code="") | Q(qr_code__isnull=True)
+                ).only("pk")
+                QRCodeJob.objects.enqueue(missing.iterator())
+            self.stdout.write("Missing QR codes queued")
+
+        while True:
+            with track_run("process_qr_codes", keep_idle=False) as run:
+                processed = process_qr_code_jobs(options["batch_size"])
+                run.rows_scanned = processed
+            if processed:
+                self.stdout.write(f"{processed} QR code jobs processed")
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0005_heatingboiler_location_address_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="heatingboiler",
+            index=models.Index(
+                fields=["created_at", "equipment_ptr"], name="boiler_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lathemachine",
+            index=models.Index(
+                fields=["created_at", "equipment_ptr"], name="lathe_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="liftingcrane",
+            index=models.Index(
+                fields=["created_at", "equipment_ptr"], name="crane_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pressurevessel",
+            index=models.Index(
+                fields=["created_at", "equipment_ptr"], name="vessel_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weldingequipment",
+            index=models.Index(
+                fields=["created_at", "equipment_ptr"],
+                name="welding_created_keyset_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,176 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q
+
+EQUIPMENT_MODELS = [
+    "heatingboiler",
+    "lathemachine",
+    "liftingcrane",
+    "pressurevessel",
+    "weldingequipment",
+]
+
+
+def set_qr_status(apps, schema_editor):
+    QRCodeJob = apps.get_model("equipment", "QRCodeJob")
+    for model_name in EQUIPMENT_MODELS:
+        model = apps.get_model("equipment", model_name)
+        missing = Q(qr_code="") | Q(qr_code__isnull=True)
+        model.objects.exclude(missing).update(qr_status="ready")
+        QRCodeJob.objects.bulk_create(
+            [
+                QRCodeJob(equipment_id=pk)
+                for pk in model.objects.filter(missing).values_list(
+                    "pk", flat=True
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0006_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="heatingboiler",
+            name="qr_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("ready", "Tayyor"),
+                    ("failed", "Xatolik"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="QR kod holati",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lathemachine",
+            name="qr_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("ready", "Tayyor"),
+                    ("failed", "Xatolik"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="QR kod holati",
+            ),
+        ),
+        migrations.AddField(
+            model_name="liftingcrane",
+            name="qr_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("ready", "Tayyor"),
+                    ("failed", "Xatolik"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="QR kod holati",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pressurevessel",
+            name="qr_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("ready", "Tayyor"),
+                    ("failed", "Xatolik"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="QR kod holati",
+            ),
+        ),
+        migrations.AddField(
+            model_name="weldingequipment",
+            name="qr_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("ready", "Tayyor"),
+                    ("failed", "Xatolik"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="QR kod holati",
+            ),
+        ),
+        migrations.CreateModel(
+            name="QRCodeJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Navbatda"),
+                            ("done", "Bajarildi"),
+                            ("failed", "Xatolik"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Holati",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Urinishlar"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Oxirgi xatolik"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "equipment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="qr_code_jobs",
+                        to="equipment.equipment",
+                        verbose_name="Uskuna",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "QR kod vazifasi",
+                "verbose_name_plural": "QR kod vazifalari",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["id"],
+                        name="qr_code_job_pending_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "pending")),
+                        fields=("equipment",),
+                        name="unique_pending_qr_code_job",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(set_qr_status, migrations.RunPython.noop),
+    ]
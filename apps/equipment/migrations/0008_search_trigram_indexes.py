@@ -0,0 +1,107 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:02
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0007_qr_code_jobs"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="heatingboiler",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=[
+                    "detail_name",
+                    "company_name",
+                    "factory_number",
+                    "registration_number",
+                ],
+                name="boiler_search_trgm_idx",
+                opclasses=[
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lathemachine",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=[
+                    "detail_name",
+                    "company_name",
+                    "factory_number",
+                    "registration_number",
+                ],
+                name="lathe_search_trgm_idx",
+                opclasses=[
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="liftingcrane",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=[
+                    "detail_name",
+                    "company_name",
+                    "factory_number",
+                    "registration_number",
+                ],
+                name="crane_search_trgm_idx",
+                opclasses=[
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pressurevessel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=[
+                    "detail_name",
+                    "company_name",
+                    "factory_number",
+                    "registration_number",
+                ],
+                name="vessel_search_trgm_idx",
+                opclasses=[
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weldingequipment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=[
+                    "detail_name",
+                    "company_name",
+                    "factory_number",
+                    "registration_number",
+                ],
+                name="welding_search_trgm_idx",
+                opclasses=[
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                ],
+            ),
+        ),
+    ]
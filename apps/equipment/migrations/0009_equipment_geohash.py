@@ -0,0 +1,91 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+from apps.utils.geohash import encode
+
+EQUIPMENT_MODELS = [
+    "heatingboiler",
+    "lathemachine",
+    "liftingcrane",
+    "pressurevessel",
+    "weldingequipment",
+]
+
+
+def fill_geohash(apps, schema_editor):
+    for model_name in EQUIPMENT_MODELS:
+        model = apps.get_model("equipment", model_name)
+        located = model.objects.filter(
+            latitude__isnull=False, longitude__isnull=False
+        ).only("pk", "latitude", "longitude")
+        instances = []
+        for instance in located.iterator():
+            instance.geohash = encode(instance.latitude, instance.longitude)
+            instances.append(instance)
+        model.objects.bulk_update(instances, ["geohash"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0008_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="heatingboiler",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lathemachine",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="liftingcrane",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pressurevessel",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.AddField(
+            model_name="weldingequipment",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
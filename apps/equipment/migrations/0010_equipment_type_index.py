@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0009_equipment_geohash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="equipment",
+            index=models.Index(
+                fields=["type", "id"], name="equipment_type_idx"
+            ),
+        ),
+    ]
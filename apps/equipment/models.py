@@ -2,17 +2,41 @@ import uuid
 from io import BytesIO
 
 import qrcode
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.files import File
 from django.db import models
+from django.db.models.query import ModelIterable
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.models import enqueue_image_renditions
 from apps.users.models import User
+from apps.utils import detail_cache
+from apps.utils.geohash import GEOHASH_PRECISION
+from apps.utils.geohash import encode as encode_geohash
 from apps.utils.get_upload_path import get_upload_path
 
 # AbstractBaseEquipment model
 # ------------------------------------------------------------------------------------------
 
 
+SEARCH_FIELDS = [
+    "detail_name",
+    "company_name",
+    "factory_number",
+    "registration_number",
+]
+QR_STATUS_PENDING = "pending"
+QR_STATUS_READY = "ready"
+QR_STATUS_FAILED = "failed"
+QR_STATUS_CHOICES = [
+    (QR_STATUS_PENDING, _("Navbatda")),
+    (QR_STATUS_READY, _("Tayyor")),
+    (QR_STATUS_FAILED, _("Xatolik")),
+]
+
+
 class AbstractBaseEquipment(models.Model):
     image = models.ImageField(
         _("Rasm"), upload_to=get_upload_path, null=True, blank=True
@@ -54,6 +78,12 @@ class AbstractBaseEquipment(models.Model):
         blank=True,
         help_text=_("QR kod avtomatik yaratiladi"),
     )
+    qr_status = models.CharField(
+        _("QR kod holati"),
+        max_length=10,
+        choices=QR_STATUS_CHOICES,
+        default=QR_STATUS_PENDING,
+    )
     latitude = models.DecimalField(
         _("Kenglik"),
         max_digits=10,
@@ -76,10 +106,37 @@ class AbstractBaseEquipment(models.Model):
         blank=True,
         help_text=_("Joylashuv manzili"),
     )
+    geohash = models.CharField(
+        _("Geohash"),
+        max_length=GEOHASH_PRECISION,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
 
     class Meta:
         abstract = True
 
+    def update_geohash(self):
+        """Keep the indexed geohash in sync with latitude/longitude"""
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ""
+
+    def prepare_qr_status(self):
+        """QR codes are rendered on demand unless files must be stored"""
+        if not settings.QR_CODE_STORE_FILES:
+            self.qr_status = QR_STATUS_READY
+
+    def schedule_qr_code(self):
+        """
+        Queue QR rendering for the background worker. The job row is
+        written in the caller's transaction, so the worker only sees it
+        after commit.
+        """
+        QRCodeJob.objects.enqueue([self])
+
     def generate_qr_code(self, url):
         """Generate QR code for the equipment"""
         qr = qrcode.QRCode(
@@ -113,6 +170,39 @@ class AbstractBaseEquipment(models.Model):
 # -----------------------------------------------------------------------------------------
 
 
+class EquipmentQuerySet(models.QuerySet):
+    """
+    QuerySet that can swap base ``Equipment`` rows for their concrete
+    subclass instances in one ``IN`` query per equipment type.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolve_real_instances = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._resolve_real_instances = self._resolve_real_instances
+        return clone
+
+    def polymorphic(self):
+        """Return concrete subclass instances when the queryset is evaluated"""
+        clone = self._chain()
+        clone._resolve_real_instances = True
+        return clone
+
+    def _fetch_all(self):
+        if (
+            self._result_cache is None
+            and self._resolve_real_instances
+            and self._iterable_class is ModelIterable
+        ):
+            self._result_cache = resolve_real_instances(
+                list(self._iterable_class(self))
+            )
+        super()._fetch_all()
+
+
 class Equipment(models.Model):
     LATHE_MACHINE = _("Tokarlik dastgohi")
     WELDING_EQUIPMENT = _("Payvandlash uskunalari")
@@ -130,6 +220,14 @@ class Equipment(models.Model):
 
     type = models.CharField(max_length=100, choices=EQUIPMENT_MODEL_CHOICES)
 
+    objects = EquipmentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Ids of one type, e.g. faults filtered by equipment type
+            models.Index(fields=["type", "id"], name="equipment_type_idx")
+        ]
+
     def __str__(self):
         if self.type == "lathe_machine":
             try:
@@ -159,7 +257,13 @@ class Equipment(models.Model):
         else:
             return self.get_type_display()
 
+    def get_detail_url(self):
+        """URL encoded into the equipment QR code"""
+        return f"{settings.QR_CODE_BASE_URL}/{self.type}-detail/{self.pk}/"
+
     def get_real_instance(self):
+        if self.__class__ is not Equipment:
+            return self
         if self.type == "lathe_machine":
             return self.lathemachine
         elif self.type == "welding_equipment":
@@ -200,20 +304,29 @@ class LatheMachine(AbstractBaseEquipment, Equipment):
     class Meta:
         verbose_name = "Tokarlik dastgohi"
         verbose_name_plural = "Tokarlik dastgohlari"
+        indexes = [
+            models.Index(
+                fields=["created_at", "equipment_ptr"],
+                name="lathe_created_keyset_idx",
+            ),
+            GinIndex(
+                fields=SEARCH_FIELDS,
+                opclasses=["gin_trgm_ops"] * len(SEARCH_FIELDS),
+                name="lathe_search_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.detail_name} - {self.factory_number}"
 
     def save(self, *args, **kwargs):
         self.type = self.AUTO_TYPE
-        is_new = self.pk is None
+        self.update_geohash()
+        self.prepare_qr_status()
         super().save(*args, **kwargs)
 
-        if is_new or not self.qr_code:
-            detail_url = f"https://api.ppr.vchdqarshi.uz/api/lathe_machine-detail/{self.pk}/"
-            self.generate_qr_code(detail_url)
-            # Save again to update QR code field
-            super().save(update_fields=["qr_code"])
+        if not self.qr_code and settings.QR_CODE_STORE_FILES:
+            self.schedule_qr_code()
 
     def get_location_display(self):
         """Get formatted location string"""
@@ -248,20 +361,29 @@ class WeldingEquipment(AbstractBaseEquipment, Equipment):
     class Meta:
         verbose_name = "Payvandlash qurilmasi"
         verbose_name_plural = "Payvandlash qurilmalari"
+        indexes = [
+            models.Index(
+                fields=["created_at", "equipment_ptr"],
+                name="welding_created_keyset_idx",
+            ),
+            GinIndex(
+                fields=SEARCH_FIELDS,
+                opclasses=["gin_trgm_ops"] * len(SEARCH_FIELDS),
+                name="welding_search_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.detail_name} - {self.factory_number}"
 
     def save(self, *args, **kwargs):
         self.type = self.AUTO_TYPE
-        is_new = self.pk is None
+        self.update_geohash()
+        self.prepare_qr_status()
         super().save(*args, **kwargs)
 
-        if is_new or not self.qr_code:
-            detail_url = f"https://api.ppr.vchdqarshi.uz/api/welding_equipment-detail/{self.pk}/"
-            self.generate_qr_code(detail_url)
-            # Save again to update QR code field
-            super().save(update_fields=["qr_code"])
+        if not self.qr_code and settings.QR_CODE_STORE_FILES:
+            self.schedule_qr_code()
 
 
 # Isitish qozoni
@@ -287,17 +409,26 @@ class HeatingBoiler(AbstractBaseEquipment, Equipment):
     class Meta:
         verbose_name = "Isitish qozoni"
         verbose_name_plural = "Isitish qozonlari"
+        indexes = [
+            models.Index(
+                fields=["created_at", "equipment_ptr"],
+                name="boiler_created_keyset_idx",
+            ),
+            GinIndex(
+                fields=SEARCH_FIELDS,
+                opclasses=["gin_trgm_ops"] * len(SEARCH_FIELDS),
+                name="boiler_search_trgm_idx",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         self.type = self.AUTO_TYPE
-        is_new = self.pk is None
+        self.update_geohash()
+        self.prepare_qr_status()
         super().save(*args, **kwargs)
 
-        if is_new or not self.qr_code:
-            detail_url = f"https://api.ppr.vchdqarshi.uz/api/heating_boiler-detail/{self.pk}/"
-            self.generate_qr_code(detail_url)
-            # Save again to update QR code field
-            super().save(update_fields=["qr_code"])
+        if not self.qr_code and settings.QR_CODE_STORE_FILES:
+            self.schedule_qr_code()
 
 
 # Yuk ko'taruvchi kranlar
@@ -326,20 +457,29 @@ class LiftingCrane(AbstractBaseEquipment, Equipment):
     class Meta:
         verbose_name = "Yuk ko'tarish krani"
         verbose_name_plural = "Yuk ko'tarish kranlari"
+        indexes = [
+            models.Index(
+                fields=["created_at", "equipment_ptr"],
+                name="crane_created_keyset_idx",
+            ),
+            GinIndex(
+                fields=SEARCH_FIELDS,
+                opclasses=["gin_trgm_ops"] * len(SEARCH_FIELDS),
+                name="crane_search_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.detail_name} - {self.factory_number}"
 
     def save(self, *args, **kwargs):
         self.type = self.AUTO_TYPE
+        self.update_geohash()
+        self.prepare_qr_status()
         super().save(*args, **kwargs)
-        is_new = self.pk is None
 
-        if is_new or not self.qr_code:
-            detail_url = f"https://api.ppr.vchdqarshi.uz/api/lifting_crane-detail/{self.pk}/"
-            self.generate_qr_code(detail_url)
-            # Save again to update QR code field
-            super().save(update_fields=["qr_code"])
+        if not self.qr_code and settings.QR_CODE_STORE_FILES:
+            self.schedule_qr_code()
 
 
 # Bosim ostida sig'imlar
@@ -365,17 +505,179 @@ class PressureVessel(AbstractBaseEquipment, Equipment):
     class Meta:
         verbose_name = "Bosim ostida sig'im"
         verbose_name_plural = "Bosim ostida sig'imlar"
+        indexes = [
+            models.Index(
+                fields=["created_at", "equipment_ptr"],
+                name="vessel_created_keyset_idx",
+            ),
+            GinIndex(
+                fields=SEARCH_FIELDS,
+                opclasses=["gin_trgm_ops"] * len(SEARCH_FIELDS),
+                name="vessel_search_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.detail_name} - {self.factory_number}"
 
     def save(self, *args, **kwargs):
         self.type = self.AUTO_TYPE
+        self.update_geohash()
+        self.prepare_qr_status()
         super().save(*args, **kwargs)
-        is_new = self.pk is None
 
-        if is_new or not self.qr_code:
-            detail_url = f"https://api.ppr.vchdqarshi.uz/api/pressure_vessel-detail/{self.pk}/"
-            self.generate_qr_code(detail_url)
-            # Save again to update QR code field
-            super().save(update_fields=["qr_code"])
+        if not self.qr_code and settings.QR_CODE_STORE_FILES:
+            self.schedule_qr_code()
+
+
+EQUIPMENT_TYPE_MODELS = {
+    LatheMachine.AUTO_TYPE: LatheMachine,
+    WeldingEquipment.AUTO_TYPE: WeldingEquipment,
+    HeatingBoiler.AUTO_TYPE: HeatingBoiler,
+    LiftingCrane.AUTO_TYPE: LiftingCrane,
+    PressureVessel.AUTO_TYPE: PressureVessel,
+}
+
+
+def resolve_real_instances(equipments):
+    """
+    Replace base ``Equipment`` objects with their subclass instances.
+    Rows are grouped by ``type`` and every child table is read with a single
+    ``IN`` query (``responsible_person`` joined), keeping the original order.
+    """
+    pks_by_type = {}
+    for equipment in equipments:
+        if equipment.__class__ is Equipment:
+            pks_by_type.setdefault(equipment.type, []).append(equipment.pk)
+
+    real_instances = {}
+    for equipment_type, pks in pks_by_type.items():
+        model = EQUIPMENT_TYPE_MODELS.get(equipment_type)
+        if model is None:
+            continue
+        real_instances.update(
+            model.objects.select_related("responsible_person").in_bulk(pks)
+        )
+
+    return [
+        real_instances.get(equipment.pk, equipment)
+        if equipment.__class__ is Equipment
+        else equipment
+        for equipment in equipments
+    ]
+
+
+def resolve_child_values(equipment_types, field):
+    """
+    ``{pk: value}`` of a child-table ``field`` for ``{pk: type}`` with one
+    ``values_list`` query per type; rows without a child row are left out.
+    """
+    pks_by_type = {}
+    for pk, equipment_type in equipment_types.items():
+        pks_by_type.setdefault(equipment_type, []).append(pk)
+
+    values = {}
+    for equipment_type, pks in pks_by_type.items():
+        model = EQUIPMENT_TYPE_MODELS.get(equipment_type)
+        if model is not None:
+            values.update(
+                model.objects.filter(pk__in=pks).values_list("pk", field)
+            )
+    return values
+
+
+def resolve_equipment_names(equipment_types):
+    """``str(equipment)`` for ``{pk: type}`` without loading instances"""
+    type_names = dict(Equipment.EQUIPMENT_MODEL_CHOICES)
+    names = resolve_child_values(equipment_types, "detail_name")
+    return {
+        pk: (
+            str(names[pk])
+            if pk in names
+            # Equipment.__str__ falls back to the type name
+            else str(type_names.get(equipment_type, equipment_type))
+        )
+        for pk, equipment_type in equipment_types.items()
+    }
+
+
+def invalidate_equipment_detail_cache(sender, instance, **kwargs):
+    detail_cache.invalidate(Equipment, [instance.pk])
+
+
+for equipment_model in [Equipment, *EQUIPMENT_TYPE_MODELS.values()]:
+    post_save.connect(
+        invalidate_equipment_detail_cache, sender=equipment_model
+    )
+    post_delete.connect(
+        invalidate_equipment_detail_cache, sender=equipment_model
+    )
+
+enqueue_equipment_image_renditions = enqueue_image_renditions("image")
+for equipment_model in EQUIPMENT_TYPE_MODELS.values():
+    post_save.connect(
+        enqueue_equipment_image_renditions, sender=equipment_model
+    )
+
+
+# QR kod navbati
+# -----------------------------------------------------------------------------------------
+class QRCodeJobQuerySet(models.QuerySet):
+    def enqueue(self, equipments):
+        """Bulk-create one pending job per equipment (duplicates skipped)"""
+        return self.bulk_create(
+            [QRCodeJob(equipment_id=equipment.pk) for equipment in equipments],
+            ignore_conflicts=True,
+        )
+
+
+class QRCodeJob(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Navbatda")),
+        (STATUS_DONE, _("Bajarildi")),
+        (STATUS_FAILED, _("Xatolik")),
+    ]
+    MAX_ATTEMPTS = 3
+
+    equipment = models.ForeignKey(
+        Equipment,
+        on_delete=models.CASCADE,
+        related_name="qr_code_jobs",
+        verbose_name=_("Uskuna"),
+    )
+    status = models.CharField(
+        _("Holati"),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(_("Urinishlar"), default=0)
+    last_error = models.TextField(_("Oxirgi xatolik"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = QRCodeJobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("QR kod vazifasi")
+        verbose_name_plural = _("QR kod vazifalari")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["equipment"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_qr_code_job",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="pending"),
+                name="qr_code_job_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_id} - {self.get_status_display()}"
@@ -0,0 +1,58 @@
+import tempfile
+from datetime import date
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.companies.models import Company
+from apps.equipment.models import LatheMachine
+from apps.users.models import User, UserRole
+
+CACHE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+        }
+    }
+)
+class DetailCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Cache test")
+        cls.master = User.objects.create(
+            username="cache-master",
+            jshshir="12345678901235",
+            role=UserRole.EQUIPMENT_MASTER,
+            company=company,
+        )
+        cls.lathe = LatheMachine.objects.create(
+            detail_name="Stanok",
+            manufacture_date=date(2019, 5, 17),
+            responsible_person=cls.master,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.master)
+
+    def test_other_type_pk_not_served_from_cache(self):
+        response = self.client.get(
+            reverse("lathe_machine-detail", args=[self.lathe.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["id"], self.lathe.pk)
+
+        for name in [
+            "welding_equipment-detail",
+            "heating_boiler-detail",
+            "lifting_crane-detail",
+            "pressure_vessel-detail",
+        ]:
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name, args=[self.lathe.pk]))
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,63 @@
+import io
+from datetime import date, datetime
+
+import openpyxl
+from django.test import TestCase
+
+from apps.companies.models import Company
+from apps.equipment.models import LatheMachine
+from apps.users.models import User, UserRole
+from apps.utils.equipment_import import import_equipment
+
+
+def build_xlsx(header, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    return file
+
+
+class EquipmentImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Import test")
+        cls.master = User.objects.create(
+            username="import-master",
+            jshshir="12345678901234",
+            role=UserRole.EQUIPMENT_MASTER,
+            company=company,
+        )
+
+    def test_xlsx_date_cell(self):
+        file = build_xlsx(
+            ["detail_name", "manufacture_date", "responsible_person"],
+            [["Stanok", datetime(2019, 5, 17), "import-master"]],
+        )
+        sheet = openpyxl.load_workbook(file).active
+        self.assertTrue(sheet["B2"].is_date)
+        file.seek(0)
+
+        result = import_equipment(file, "lathe.xlsx", "lathe_machine")
+
+        self.assertEqual(result, {"created": 1, "errors": []})
+        lathe = LatheMachine.objects.get(detail_name="Stanok")
+        self.assertEqual(lathe.manufacture_date, date(2019, 5, 17))
+        self.assertEqual(lathe.responsible_person, self.master)
+
+    def test_responsible_person_required(self):
+        file = build_xlsx(
+            ["detail_name", "manufacture_date", "responsible_person"],
+            [["Stanok", datetime(2019, 5, 17), None]],
+        )
+
+        result = import_equipment(file, "lathe.xlsx", "lathe_machine")
+
+        self.assertEqual(result["created"], 0)
+        self.assertEqual(result["errors"][0]["row"], 2)
+        self.assertIn("responsible_person", result["errors"][0]["errors"])
+        self.assertFalse(LatheMachine.objects.exists())
@@ -2,11 +2,20 @@ from django.contrib import admin
 
 from .models import (
     EquipmentFault,
+    MaintenanceRule,
     MaintenanceSchedule,
     MaintenanceWarning,
     Notification,
+    TelegramMessage,
 )
 
 admin.site.register(
-    [MaintenanceSchedule, MaintenanceWarning, EquipmentFault, Notification]
+    [
+        MaintenanceSchedule,
+        MaintenanceRule,
+        MaintenanceWarning,
+        EquipmentFault,
+        Notification,
+        TelegramMessage,
+    ]
 )
@@ -1,14 +1,27 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 
-from apps.equipment.api.serializers import EquipmentPolymorphicSerializer
+from apps.core.api.serializers import RenditionsField
+from apps.equipment.api.serializers import (
+    EquipmentPolymorphicSerializer,
+    equipment_polymorphic_values_serializer,
+)
 from apps.equipment.models import Equipment
 from apps.maintenance.models import (
     EquipmentFault,
+    FaultPhotoUpload,
+    MaintenanceRule,
     MaintenanceSchedule,
     MaintenanceWarning,
 )
 from apps.users.api.serializers import UserSerializer
 from apps.users.models import User
+from apps.utils.image_renditions import rendition_values
+from apps.utils.maintenance_calendar import BUCKETS, CALENDAR_MAX_DAYS
+from apps.utils.reliability import RELIABILITY_MAX_DAYS
+from apps.utils.values_serializer import ValuesSerializer
 
 
 class MaintenanceScheduleModelSerializer(serializers.ModelSerializer):
@@ -40,16 +53,230 @@ class MaintenanceScheduleModelSerializer(serializers.ModelSerializer):
         model = MaintenanceSchedule
         # exclude = ["equipment__type"]
         fields = "__all__"
-        read_only_fields = ["created_at", "updated_at"]
+        read_only_fields = [
+            "rule",
+            "occurrence_date",
+            "next_warning_at",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class MaintenanceRuleModelSerializer(serializers.ModelSerializer):
+    equipment_id = serializers.PrimaryKeyRelatedField(
+        queryset=Equipment.objects.all(), source="equipment", write_only=True
+    )
+    assigned_to_id = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(),
+        source="assigned_to",
+        write_only=True,
+        allow_null=True,
+        required=False,
+    )
+
+    class Meta:
+        model = MaintenanceRule
+        fields = "__all__"
+        read_only_fields = [
+            "equipment",
+            "company",
+            "assigned_to",
+            "created_by",
+            "created_at",
+            "updated_at",
+        ]
+
+    def validate(self, attrs):
+        start_date = attrs.get(
+            "start_date", getattr(self.instance, "start_date", None)
+        )
+        end_date = attrs.get(
+            "end_date", getattr(self.instance, "end_date", None)
+        )
+        if end_date and start_date and end_date < start_date:
+            raise serializers.ValidationError(
+                {
+                    "end_date": "Tugash sanasi birinchi ko'rik sanasidan "
+                    "oldin bo'lmasligi kerak."
+                }
+            )
+        return attrs
+
+
+class MaintenanceRuleOccurrenceSerializer(serializers.Serializer):
+    occurrence_date = serializers.DateField()
 
 
 class MaintenanceWarningModelSerializer(serializers.ModelSerializer):
     class Meta:
         model = MaintenanceWarning
         fields = "__all__"
+        # Changed through the lifecycle transitions only
+        read_only_fields = [
+            "status",
+            "acknowledged_at",
+            "acknowledged_by",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class MaintenanceWarningAcknowledgeSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=1000
+    )
 
 
 class EquipmentFaultModelSerializer(serializers.ModelSerializer):
+    photo_renditions = RenditionsField(source="photo")
+
     class Meta:
         model = EquipmentFault
         fields = "__all__"
+        read_only_fields = ["company", "photo_status", "photo_error"]
+
+
+class EquipmentFaultFilterSerializer(serializers.Serializer):
+    equipment = serializers.IntegerField(required=False)
+    equipment_type = serializers.ChoiceField(
+        choices=Equipment.EQUIPMENT_MODEL_CHOICES, required=False
+    )
+    severity = serializers.CharField(
+        required=False, help_text="Vergul bilan ajratilgan: major,critical"
+    )
+    is_resolved = serializers.BooleanField(allow_null=True, default=None)
+    reported_by = serializers.IntegerField(required=False)
+    reported_from = serializers.DateField(required=False)
+    reported_to = serializers.DateField(required=False)
+    resolved_from = serializers.DateField(required=False)
+    resolved_to = serializers.DateField(required=False)
+
+    def validate_severity(self, value):
+        severities = [
+            severity
+            for severity in (part.strip() for part in value.split(","))
+            if severity
+        ]
+        choices = dict(EquipmentFault.FAULT_SEVERITY)
+        unknown = [
+            severity for severity in severities if severity not in choices
+        ]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Noma'lum holat: {', '.join(unknown)}"
+            )
+        return severities or None
+
+    def validate(self, attrs):
+        for start, end in [
+            ("reported_from", "reported_to"),
+            ("resolved_from", "resolved_to"),
+        ]:
+            if start in attrs and end in attrs and attrs[start] > attrs[end]:
+                raise serializers.ValidationError(
+                    f"{start} sanasi {end} sanasidan keyin bo'lmasligi kerak."
+                )
+        return attrs
+
+
+class FaultPhotoUploadSerializer(serializers.ModelSerializer):
+    checksum = serializers.RegexField(
+        r"^[0-9a-fA-F]{64}$", help_text="Faylning SHA-256 (hex) qiymati"
+    )
+
+    class Meta:
+        model = FaultPhotoUpload
+        fields = [
+            "id",
+            "filename",
+            "size",
+            "checksum",
+            "offset",
+            "status",
+            "fault",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "offset",
+            "status",
+            "fault",
+            "created_at",
+            "updated_at",
+        ]
+
+    def validate_filename(self, value):
+        extension = os.path.splitext(value)[1].lstrip(".").lower()
+        if extension not in EquipmentFault.PHOTO_EXTENSIONS:
+            raise serializers.ValidationError(
+                "Faqat {} fayllari qabul qilinadi.".format(
+                    ", ".join(EquipmentFault.PHOTO_EXTENSIONS)
+                )
+            )
+        return value
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.FAULT_PHOTO_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Fayl hajmi {settings.FAULT_PHOTO_UPLOAD_MAX_SIZE} "
+                "baytdan oshmasligi kerak."
+            )
+        return value
+
+    def validate_checksum(self, value):
+        return value.lower()
+
+
+class MaintenanceCalendarQuerySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    bucket = serializers.ChoiceField(choices=BUCKETS, default="day")
+    company = serializers.IntegerField(
+        required=False, help_text="Faqat superuser uchun"
+    )
+
+    def validate(self, attrs):
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                "start sanasi end sanasidan keyin bo'lmasligi kerak."
+            )
+        if (attrs["end"] - attrs["start"]).days >= CALENDAR_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Oraliq {CALENDAR_MAX_DAYS} kundan oshmasligi kerak."
+            )
+        return attrs
+
+
+class ReliabilityQuerySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    equipment_type = serializers.ChoiceField(
+        choices=Equipment.EQUIPMENT_MODEL_CHOICES, required=False
+    )
+    company = serializers.IntegerField(
+        required=False, help_text="Faqat superuser uchun"
+    )
+
+    def validate(self, attrs):
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                "start sanasi end sanasidan keyin bo'lmasligi kerak."
+            )
+        if (attrs["end"] - attrs["start"]).days >= RELIABILITY_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Oraliq {RELIABILITY_MAX_DAYS} kundan oshmasligi kerak."
+            )
+        return attrs
+
+
+# .values() read path for list endpoints
+schedule_values_serializer = ValuesSerializer(
+    MaintenanceScheduleModelSerializer,
+    related={"equipment": equipment_polymorphic_values_serializer},
+)
+rule_values_serializer = ValuesSerializer(MaintenanceRuleModelSerializer)
+warning_values_serializer = ValuesSerializer(MaintenanceWarningModelSerializer)
+fault_values_serializer = ValuesSerializer(
+    EquipmentFaultModelSerializer,
+    related={"photo_renditions": rendition_values},
+)
@@ -1,11 +1,21 @@
 from django.urls import path
 
 from apps.maintenance.api.views import (
+    EquipmentFaultListCreateAPIView,
     EquipmentListAPIView,
+    FaultPhotoUploadAPIView,
+    FaultPhotoUploadCreateAPIView,
+    FaultPhotoUploadFinalizeAPIView,
+    MaintenanceCalendarAPIView,
+    MaintenanceRuleListCreateAPIView,
+    MaintenanceRuleOccurrenceAPIView,
+    MaintenanceRuleRetrieveUpdateDestroyAPIView,
     MaintenanceScheduleListCreateAPIView,
     MaintenanceScheduleRetrieveUpdateDestroyAPIView,
+    MaintenanceWarningAcknowledgeAPIView,
     MaintenanceWarningListAPIView,
     MaintenanceWarningRetrieveUpdateDestroyAPIView,
+    ReliabilityAPIView,
 )
 
 urlpatterns = [
@@ -19,6 +29,27 @@ urlpatterns = [
         MaintenanceScheduleRetrieveUpdateDestroyAPIView.as_view(),
         name="maintenance-detail",
     ),
+    path(
+        "maintenance-calendar/",
+        MaintenanceCalendarAPIView.as_view(),
+        name="maintenance-calendar",
+    ),
+    # recurrence rules
+    path(
+        "maintenance-rule-list-create/",
+        MaintenanceRuleListCreateAPIView.as_view(),
+        name="maintenance-rule-list-create",
+    ),
+    path(
+        "maintenance-rule-detail/<int:pk>/",
+        MaintenanceRuleRetrieveUpdateDestroyAPIView.as_view(),
+        name="maintenance-rule-detail",
+    ),
+    path(
+        "maintenance-rule-occurrence/<int:pk>/",
+        MaintenanceRuleOccurrenceAPIView.as_view(),
+        name="maintenance-rule-occurrence",
+    ),
     # warnings
     path(
         "maintenance-warning-list/",
@@ -30,5 +61,35 @@ urlpatterns = [
         MaintenanceWarningRetrieveUpdateDestroyAPIView.as_view(),
         name="maintenance-warning-detail",
     ),
+    path(
+        "maintenance-warning-acknowledge/",
+        MaintenanceWarningAcknowledgeAPIView.as_view(),
+        name="maintenance-warning-acknowledge",
+    ),
     path("equipment/", EquipmentListAPIView.as_view(), name="equipment-list"),
+    path(
+        "equipment-fault-list/",
+        EquipmentFaultListCreateAPIView.as_view(),
+        name="equipment-fault-list",
+    ),
+    path(
+        "equipment-reliability/",
+        ReliabilityAPIView.as_view(),
+        name="equipment-reliability",
+    ),
+    path(
+        "fault-photo-uploads/",
+        FaultPhotoUploadCreateAPIView.as_view(),
+        name="fault-photo-upload-create",
+    ),
+    path(
+        "fault-photo-uploads/<uuid:pk>/",
+        FaultPhotoUploadAPIView.as_view(),
+        name="fault-photo-upload",
+    ),
+    path(
+        "fault-photo-uploads/<uuid:pk>/finalize/",
+        FaultPhotoUploadFinalizeAPIView.as_view(),
+        name="fault-photo-upload-finalize",
+    ),
 ]
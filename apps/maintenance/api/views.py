@@ -1,39 +1,89 @@
 from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+    extend_schema_view,
+)
 from rest_framework import filters, generics, permissions, status
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import ListAPIView, ListCreateAPIView
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.maintenance.models import (
     EquipmentFault,
+    FaultPhotoUpload,
+    MaintenanceRule,
     MaintenanceSchedule,
     MaintenanceWarning,
 )
 from apps.users.api.permissions import IsEquipmentMaster, IsEquipmentOperator
+from apps.users.models import User
+from apps.utils.chunked_upload import (
+    AssembledUploadedFile,
+    advance_offset,
+    create_upload_file,
+    file_checksum,
+    parse_content_range,
+    write_chunk,
+)
+from apps.utils.detail_cache import CachedDetailMixin
+from apps.utils.maintenance_calendar import calendar
 from apps.utils.paginator import (  # Assuming you have this
     StandardResultsSetPagination,
 )
+from apps.utils.reliability import reliability
+from apps.utils.sparse_fields import SparseFieldsMixin
+from apps.utils.values_serializer import ValuesListMixin
 
-from ...equipment.api.serializers import EquipmentPolymorphicSerializer
+from ...equipment.api.serializers import (
+    EquipmentPolymorphicSerializer,
+    equipment_polymorphic_values_serializer,
+)
 from ...equipment.models import Equipment
 from .serializers import (
+    EquipmentFaultFilterSerializer,
     EquipmentFaultModelSerializer,
+    FaultPhotoUploadSerializer,
+    MaintenanceCalendarQuerySerializer,
+    MaintenanceRuleModelSerializer,
+    MaintenanceRuleOccurrenceSerializer,
     MaintenanceScheduleModelSerializer,
+    MaintenanceWarningAcknowledgeSerializer,
     MaintenanceWarningModelSerializer,
+    ReliabilityQuerySerializer,
+    fault_values_serializer,
+    rule_values_serializer,
+    schedule_values_serializer,
+    warning_values_serializer,
 )
 
 
 # ------------------------------------------------------------------------------------------
 @extend_schema(tags=["Ta'mirlash jadvali"])
-class MaintenanceScheduleListCreateAPIView(generics.ListCreateAPIView):
-    queryset = MaintenanceSchedule.objects.order_by("-created_at")
+class MaintenanceScheduleListCreateAPIView(
+    ValuesListMixin, generics.ListCreateAPIView
+):
+    queryset = (
+        MaintenanceSchedule.objects.select_related(
+            "assigned_to", "completed_by"
+        )
+        .prefetch_related(
+            Prefetch("equipment", queryset=Equipment.objects.polymorphic())
+        )
+        .order_by("-created_at")
+    )
     serializer_class = MaintenanceScheduleModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["maintenance_type", "scheduled_date", "assigned_to__name"]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = schedule_values_serializer
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -53,7 +103,7 @@ class MaintenanceScheduleListCreateAPIView(generics.ListCreateAPIView):
 
 @extend_schema(tags=["Ta'mirlash jadvali"])
 class MaintenanceScheduleRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    CachedDetailMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = MaintenanceSchedule.objects.all()
     serializer_class = MaintenanceScheduleModelSerializer
@@ -68,11 +118,154 @@ class MaintenanceScheduleRetrieveUpdateDestroyAPIView(
                 _("Bu id raqamga mos ta'mirlash jadvali mavjud emas")
             )
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # Completion events are written with the change (outbox)
+        serializer.save()
+
+    def get_cache_dependencies(self, instance):
+        equipment = instance.equipment.get_real_instance()
+        return [
+            (Equipment, instance.equipment_id),
+            (User, instance.assigned_to_id),
+            (User, instance.completed_by_id),
+            (User, getattr(equipment, "responsible_person_id", None)),
+        ]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {"status": status.HTTP_200_OK, "data": self.get_cached_data()}
+        )
+
+
+@extend_schema(
+    tags=["Ta'mirlash jadvali"],
+    parameters=[MaintenanceCalendarQuerySerializer],
+)
+class MaintenanceCalendarAPIView(APIView):
+    """Company maintenance due between two dates, in day/week/month buckets"""
+
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+
+    def get(self, request, *args, **kwargs):
+        serializer = MaintenanceCalendarQuerySerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        company_id = request.user.company_id
+        if request.user.is_superuser and "company" in params:
+            company_id = params["company"]
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": calendar(
+                    company_id,
+                    params["start"],
+                    params["end"],
+                    params["bucket"],
+                ),
+            }
+        )
+
+
+#  MaintenanceRules
+#  -----------------------------------------------------------------------------
+
+
+@extend_schema(tags=["Ta'mirlash jadvali"])
+class MaintenanceRuleListCreateAPIView(ValuesListMixin, ListCreateAPIView):
+    queryset = MaintenanceRule.objects.order_by("-created_at")
+    serializer_class = MaintenanceRuleModelSerializer
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["maintenance_type", "frequency"]
+    pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = rule_values_serializer
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        # The first occurrence is stored with the rule
+        serializer.save(created_by=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            {"status": status.HTTP_201_CREATED, "data": serializer.data},
+            status=status.HTTP_201_CREATED,
+            headers=headers,
+        )
+
+
+@extend_schema(tags=["Ta'mirlash jadvali"])
+class MaintenanceRuleRetrieveUpdateDestroyAPIView(
+    SparseFieldsMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    queryset = MaintenanceRule.objects.all()
+    serializer_class = MaintenanceRuleModelSerializer
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+
+    def get_object(self):
+        try:
+            return MaintenanceRule.objects.get(pk=self.kwargs["pk"])
+        except MaintenanceRule.DoesNotExist:
+            raise NotFound(
+                _("Bu id raqamga mos texnik xizmat qoidasi mavjud emas")
+            )
+
     def get(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return Response(
-            {"status": status.HTTP_200_OK, "data": serializer.data}
+            {
+                "status": status.HTTP_200_OK,
+                "data": self.sparse(serializer.data),
+            }
+        )
+
+
+@extend_schema(
+    tags=["Ta'mirlash jadvali"],
+    request=MaintenanceRuleOccurrenceSerializer,
+    responses=MaintenanceScheduleModelSerializer,
+)
+class MaintenanceRuleOccurrenceAPIView(APIView):
+    """
+    Store an occurrence of a rule as a schedule (to edit or complete it)
+    or return the one already stored.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        try:
+            rule = MaintenanceRule.objects.get(pk=self.kwargs["pk"])
+        except MaintenanceRule.DoesNotExist:
+            raise NotFound(
+                _("Bu id raqamga mos texnik xizmat qoidasi mavjud emas")
+            )
+        serializer = MaintenanceRuleOccurrenceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        occurrence_date = serializer.validated_data["occurrence_date"]
+        if not any(rule.occurrences(occurrence_date, occurrence_date)):
+            raise ValidationError(
+                {"occurrence_date": _("Bu sana qoidaga mos kelmaydi")}
+            )
+        schedule, created = rule.materialize(occurrence_date)
+        code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        return Response(
+            {
+                "status": code,
+                "data": MaintenanceScheduleModelSerializer(
+                    schedule, context={"request": request}
+                ).data,
+            },
+            status=code,
         )
 
 
@@ -81,18 +274,57 @@ class MaintenanceScheduleRetrieveUpdateDestroyAPIView(
 
 
 @extend_schema(tags=["Ta'mirlash ogohlantirishlari"])
-class MaintenanceWarningListAPIView(ListAPIView):
+class MaintenanceWarningListAPIView(ValuesListMixin, ListAPIView):
+    """Live warnings; ``?status=superseded,resolved`` lists others"""
+
     queryset = MaintenanceWarning.objects.order_by("-sent_date")
     serializer_class = MaintenanceWarningModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["sent_date", "warning_level", "warning_time"]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-sent_date", "-pk")
+    values_serializer = warning_values_serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        statuses = self.request.query_params.get("status")
+        if not statuses:
+            # Served by the partial warning_live_keyset_idx
+            return queryset.live()
+        return queryset.filter(status__in=statuses.split(","))
+
+
+@extend_schema(
+    tags=["Ta'mirlash ogohlantirishlari"],
+    request=MaintenanceWarningAcknowledgeSerializer,
+)
+class MaintenanceWarningAcknowledgeAPIView(APIView):
+    """Acknowledge pending or sent warnings in one update"""
+
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+
+    def post(self, request, *args, **kwargs):
+        serializer = MaintenanceWarningAcknowledgeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        acknowledged = MaintenanceWarning.objects.filter(
+            pk__in=serializer.validated_data["ids"]
+        ).transition(
+            MaintenanceWarning.STATUS_ACKNOWLEDGED,
+            acknowledged_at=timezone.now(),
+            acknowledged_by=request.user,
+        )
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": {"acknowledged": acknowledged},
+            }
+        )
 
 
 @extend_schema(tags=["Ta'mirlash ogohlantirishlari"])
 class MaintenanceWarningRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
+    SparseFieldsMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     queryset = MaintenanceWarning.objects.all()
     serializer_class = MaintenanceWarningModelSerializer
@@ -111,7 +343,10 @@ class MaintenanceWarningRetrieveUpdateDestroyAPIView(
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return Response(
-            {"status": status.HTTP_200_OK, "data": serializer.data}
+            {
+                "status": status.HTTP_200_OK,
+                "data": self.sparse(serializer.data),
+            }
         )
 
 
@@ -120,13 +355,30 @@ class MaintenanceWarningRetrieveUpdateDestroyAPIView(
 
 
 @extend_schema(tags=["Uskunalar nosozligi"])
-class EquipmentFaultListCreateAPIView(ListCreateAPIView):
+@extend_schema_view(
+    get=extend_schema(parameters=[EquipmentFaultFilterSerializer])
+)
+class EquipmentFaultListCreateAPIView(ValuesListMixin, ListCreateAPIView):
     queryset = EquipmentFault.objects.order_by("-created_at")
     serializer_class = EquipmentFaultModelSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentOperator]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title", "equipment", "severity"]
+    # Equipment, severity etc. are typed filters (EquipmentFaultFilterSerializer)
+    search_fields = ["title", "description"]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-created_at", "-pk")
+    values_serializer = fault_values_serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != "GET":
+            return queryset
+        serializer = EquipmentFaultFilterSerializer(
+            data=self.request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        # Open faults are served by the partial fault_open_* indexes
+        return queryset.filter_by(**serializer.validated_data)
 
     @transaction.atomic
     def perform_create(self, serializer):
@@ -143,9 +395,198 @@ class EquipmentFaultListCreateAPIView(ListCreateAPIView):
         )
 
 
+@extend_schema(
+    tags=["Uskunalar nosozligi"],
+    parameters=[ReliabilityQuerySerializer],
+)
+class ReliabilityAPIView(APIView):
+    """Company MTBF/MTTR and fault counts between two dates, per type"""
+
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
+
+    def get(self, request, *args, **kwargs):
+        serializer = ReliabilityQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        company_id = request.user.company_id
+        if request.user.is_superuser and "company" in params:
+            company_id = params["company"]
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "data": reliability(
+                    company_id,
+                    params["start"],
+                    params["end"],
+                    params.get("equipment_type"),
+                ),
+            }
+        )
+
+
+# Nosozlik rasmini bo'laklab yuklash
+# ------------------------------------------------------------------------------------------
+class FaultPhotoUploadMixin:
+    permission_classes = [permissions.IsAuthenticated, IsEquipmentOperator]
+
+    def get_upload(self, **kwargs):
+        upload = FaultPhotoUpload.objects.filter(
+            pk=self.kwargs["pk"], created_by=self.request.user, **kwargs
+        ).first()
+        if upload is None:
+            raise NotFound(_("Bu id raqamga mos yuklash mavjud emas"))
+        return upload
+
+    def upload_response(self, upload, response_status=status.HTTP_200_OK):
+        return Response(
+            {
+                "status": response_status,
+                "data": FaultPhotoUploadSerializer(upload).data,
+            },
+            status=response_status,
+        )
+
+
+@extend_schema(
+    tags=["Uskunalar nosozligi"], request=FaultPhotoUploadSerializer
+)
+class FaultPhotoUploadCreateAPIView(FaultPhotoUploadMixin, APIView):
+    """
+    Start a resumable fault photo upload: send the photo with ``PUT``
+    chunks to the upload, then finalize it with the fault fields.
+    """
+
+    def post(self, request, *args, **kwargs):
+        serializer = FaultPhotoUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.save(created_by=request.user)
+        create_upload_file(upload)
+        return self.upload_response(upload, status.HTTP_201_CREATED)
+
+
+@extend_schema(
+    tags=["Uskunalar nosozligi"],
+    parameters=[
+        OpenApiParameter(
+            "Content-Range",
+            str,
+            OpenApiParameter.HEADER,
+            description="bytes start-end/size",
+        )
+    ],
+    request={"application/octet-stream": OpenApiTypes.BINARY},
+)
+class FaultPhotoUploadAPIView(FaultPhotoUploadMixin, APIView):
+    """
+    ``GET`` returns the bytes received so far (``offset``) to resume
+    from; ``PUT`` appends the chunk starting at ``offset``. The body is
+    streamed to disk, so memory use does not depend on the chunk size.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return self.upload_response(self.get_upload())
+
+    def put(self, request, *args, **kwargs):
+        upload = self.get_upload(status=FaultPhotoUpload.STATUS_OPEN)
+        chunk_range = parse_content_range(
+            request.headers.get("Content-Range"), upload.size
+        )
+        if chunk_range is None:
+            raise ValidationError(
+                {"Content-Range": _("Noto'g'ri Content-Range sarlavhasi")}
+            )
+        start, end = chunk_range
+        if int(request.headers.get("Content-Length") or 0) != end - start:
+            raise ValidationError(
+                {
+                    "Content-Length": _(
+                        "Content-Length bo'lak hajmiga teng bo'lishi kerak"
+                    )
+                }
+            )
+        if start != upload.offset:
+            # A retried or out-of-order chunk: resume from offset
+            return self.upload_response(upload, status.HTTP_409_CONFLICT)
+
+        written = write_chunk(upload, request.stream, start, end - start)
+        if not advance_offset(upload, start, written):
+            upload.refresh_from_db()
+            return self.upload_response(upload, status.HTTP_409_CONFLICT)
+        upload.offset = start + written
+        return self.upload_response(upload)
+
+
+@extend_schema(
+    tags=["Uskunalar nosozligi"], request=EquipmentFaultModelSerializer
+)
+class FaultPhotoUploadFinalizeAPIView(FaultPhotoUploadMixin, APIView):
+    """
+    Check the upload's size and checksum and create the fault with the
+    uploaded photo. Retrying a finalized upload returns its fault.
+    """
+
+    def post(self, request, *args, **kwargs):
+        with transaction.atomic():
+            upload = FaultPhotoUpload.objects.select_for_update().get(
+                pk=self.get_upload().pk
+            )
+            if upload.status == FaultPhotoUpload.STATUS_COMPLETED:
+                if upload.fault is None:
+                    raise NotFound(_("Nosozlik o'chirilgan"))
+                return Response(
+                    {
+                        "status": status.HTTP_201_CREATED,
+                        "data": EquipmentFaultModelSerializer(
+                            upload.fault, context={"request": request}
+                        ).data,
+                    },
+                    status=status.HTTP_201_CREATED,
+                )
+            if upload.offset != upload.size:
+                raise ValidationError({"offset": _("Fayl to'liq yuklanmagan")})
+            if file_checksum(upload.path) != upload.checksum:
+                # Corrupted on the way: start over
+                upload.offset = 0
+                upload.save(update_fields=["offset", "updated_at"])
+                create_upload_file(upload)
+                return Response(
+                    {
+                        "status": status.HTTP_400_BAD_REQUEST,
+                        "data": {
+                            "checksum": _(
+                                "Nazorat yig'indisi mos kelmadi, faylni "
+                                "qaytadan yuklang"
+                            )
+                        },
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            data = dict(request.data.items())
+            with AssembledUploadedFile(
+                upload.path, upload.filename, upload.size
+            ) as photo:
+                data["photo"] = photo
+                serializer = EquipmentFaultModelSerializer(
+                    data=data, context={"request": request}
+                )
+                serializer.is_valid(raise_exception=True)
+                # The storage moves the assembled file into MEDIA_ROOT
+                fault = serializer.save(reported_by=request.user)
+            upload.status = FaultPhotoUpload.STATUS_COMPLETED
+            upload.fault = fault
+            upload.save(update_fields=["status", "fault", "updated_at"])
+        return Response(
+            {"status": status.HTTP_201_CREATED, "data": serializer.data},
+            status=status.HTTP_201_CREATED,
+        )
+
+
 @extend_schema(tags=["Ta'mirlash jadvali"])
-class EquipmentListAPIView(ListAPIView):
-    queryset = Equipment.objects.all()
+class EquipmentListAPIView(ValuesListMixin, ListAPIView):
+    queryset = Equipment.objects.polymorphic().order_by("-id")
     serializer_class = EquipmentPolymorphicSerializer
     permission_classes = [permissions.IsAuthenticated, IsEquipmentMaster]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-pk",)
+    values_serializer = equipment_polymorphic_values_serializer
@@ -1,3 +1,4 @@
+import pillow_heif
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
@@ -6,3 +7,7 @@ class MaintenanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.maintenance"
     verbose_name = _("Texnik xizmatlar")
+
+    def ready(self):
+        # Lets Pillow, and so the photo ImageField, open HEIC uploads
+        pillow_heif.register_heif_opener()
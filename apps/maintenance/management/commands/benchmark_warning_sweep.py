@@ -0,0 +1,116 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.equipment.models import LatheMachine
+from apps.maintenance.models import (
+    MaintenanceSchedule,
+    MaintenanceWarning,
+    OutboxEvent,
+)
+from apps.utils.maintenance_warnings import sweep_maintenance_warnings
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_sweep():
+    """The per-row loop the set-based sweep replaced, recording events"""
+    for schedule in MaintenanceSchedule.objects.all():
+        warning = MaintenanceWarning.objects.filter(
+            maintenance_schedule=schedule, is_sent=False
+        ).first()
+        if not warning:
+            warning = MaintenanceWarning.objects.create(
+                maintenance_schedule=schedule
+            )
+        warning.set_warning_time()
+        if warning.warning_time:
+            warning.save()
+            if not warning.sent_to_telegram:
+                OutboxEvent.objects.create(
+                    event_type="maintenance_due",
+                    payload={"warning_id": warning.pk},
+                )
+                warning.sent_to_telegram = True
+                warning.sent_date = timezone.now()
+                warning.save()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the maintenance warning sweep on generated schedules (rolled "
+        "back afterwards); --legacy also times the old per-row loop"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedules", type=int, nargs="+", default=[10000, 100000]
+        )
+        parser.add_argument(
+            "--equipment",
+            type=int,
+            default=1000,
+            help="Equipment rows the schedules are spread over",
+        )
+        parser.add_argument("--legacy", action="store_true")
+
+    def handle(self, *args, **options):
+        for count in options["schedules"]:
+            runs = [("set-based", sweep_maintenance_warnings)]
+            if options["legacy"]:
+                runs.append(("legacy", legacy_sweep))
+            for name, sweep in runs:
+                try:
+                    with transaction.atomic():
+                        self.create_fixtures(count, options["equipment"])
+                        self.measure(name, count, sweep)
+                        raise Rollback
+                except Rollback:
+                    pass
+
+    def measure(self, name, count, sweep):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            sweep()
+            first = time.perf_counter() - started
+        # Second pass: every warning exists and has been raised
+        started = time.perf_counter()
+        sweep()
+        second = time.perf_counter() - started
+        self.stdout.write(
+            f"{name:<10} schedules={count:<7} first={first:8.2f}s "
+            f"queries={len(queries):<7} repeat={second:8.2f}s "
+            f"events={OutboxEvent.objects.count()}"
+        )
+
+    def create_fixtures(self, count, equipment_count):
+        for number in range(equipment_count):
+            LatheMachine(
+                detail_name=f"Benchmark {number}",
+                factory_number=f"BM-{number}",
+                latitude="41.30000000",
+                longitude="69.24000000",
+            ).save()
+        equipment_ids = list(LatheMachine.objects.values_list("pk", flat=True))
+        today = timezone.now().date()
+        # Due dates spread over ~4 months, a tenth of schedules completed
+        MaintenanceSchedule.objects.bulk_create(
+            (
+                MaintenanceSchedule(
+                    equipment_id=equipment_ids[number % len(equipment_ids)],
+                    maintenance_type="inspection",
+                    scheduled_date=today,
+                    next_maintenance_date=today
+                    + timedelta(days=number % 120 - 5),
+                    is_completed=number % 10 == 0,
+                )
+                for number in range(count)
+            ),
+            batch_size=5000,
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.utils.job_runs import track_run
+from apps.utils.outbox import dispatch_outbox_events
+
+
+class Command(BaseCommand):
+    help = "Fan out outbox events to notifications and Telegram messages"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2,
+            help="Seconds to sleep when the outbox is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            with track_run("dispatch_outbox_events", keep_idle=False) as run:
+                stats = dispatch_outbox_events(options["batch_size"])
+                run.add(stats)
+            if stats["rows_scanned"]:
+                self.stdout.write(
+                    f"{stats['rows_scanned']} outbox events processed"
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
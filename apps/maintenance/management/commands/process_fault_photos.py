@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.utils.fault_photos import process_fault_photos
+from apps.utils.job_runs import track_run
+
+
+class Command(BaseCommand):
+    help = "Resize and re-encode reported fault photos in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            with track_run("process_fault_photos", keep_idle=False) as run:
+                stats = process_fault_photos(options["batch_size"])
+                run.add(stats)
+            if stats["rows_scanned"]:
+                self.stdout.write(
+                    f"{stats['rows_scanned']} fault photos processed"
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
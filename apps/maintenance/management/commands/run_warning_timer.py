@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.utils.job_runs import track_run
+from apps.utils.warning_timer import WarningTimer, process_due_schedules
+
+
+class Command(BaseCommand):
+    help = (
+        "Raise maintenance warnings when schedules cross a warning "
+        "threshold, sleeping until the next next_warning_at instant"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the due schedules and exit instead of waiting",
+        )
+
+    def handle(self, *args, **options):
+        timer = WarningTimer()
+        while True:
+            with track_run("run_warning_timer", keep_idle=False) as run:
+                stats, fire_times = process_due_schedules(
+                    batch_size=options["batch_size"]
+                )
+                run.add(stats)
+            timer.push(fire_times)
+            if stats["rows_scanned"]:
+                self.stdout.write(
+                    f"{stats['rows_scanned']} schedules processed"
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(timer.seconds_until_next(timezone.now()))
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.utils.job_runs import track_run
+from apps.utils.telegram import (
+    RateLimiter,
+    TelegramClient,
+    deliver_telegram_messages,
+)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued Telegram messages within the Bot API rate limits"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when no message is due",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the due messages and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.TELEGRAM_BOT_TOKEN:
+            raise CommandError("BOT_TOKEN is not set")
+
+        client = TelegramClient()
+        limiter = RateLimiter()
+        try:
+            while True:
+                with track_run(
+                    "send_telegram_messages", keep_idle=False
+                ) as run:
+                    stats = deliver_telegram_messages(
+                        client, limiter, options["batch_size"]
+                    )
+                    run.add(stats)
+                if stats["rows_scanned"]:
+                    self.stdout.write(
+                        f"{stats['messages_sent']} Telegram messages sent, "
+                        f"{stats['messages_failed']} failed"
+                    )
+                    continue
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+        finally:
+            client.close()
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0006_keyset_indexes"),
+        ("maintenance", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                fields=["created_at", "id"], name="fault_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="maintenanceschedule",
+            index=models.Index(
+                fields=["created_at", "id"], name="schedule_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="maintenancewarning",
+            index=models.Index(
+                fields=["sent_date", "id"], name="warning_sent_keyset_idx"
+            ),
+        ),
+    ]
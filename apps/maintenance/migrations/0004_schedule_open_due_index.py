@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0009_equipment_geohash"),
+        ("maintenance", "0003_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="maintenanceschedule",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["next_maintenance_date"],
+                name="schedule_open_due_idx",
+            ),
+        ),
+    ]
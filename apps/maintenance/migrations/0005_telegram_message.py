@@ -0,0 +1,110 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("maintenance", "0004_schedule_open_due_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TelegramMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("chat_id", models.CharField(max_length=64, verbose_name="Chat ID")),
+                ("text", models.TextField(verbose_name="Xabar matni")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Navbatda"),
+                            ("sent", "Yuborildi"),
+                            ("failed", "Xatolik"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Holati",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Urinishlar"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Oxirgi xatolik"),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Keyingi urinish vaqti",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Yuborilgan vaqti"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "notification",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="telegram_messages",
+                        to="maintenance.notification",
+                    ),
+                ),
+                (
+                    "warning",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="telegram_messages",
+                        to="maintenance.maintenancewarning",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Telegram xabari",
+                "verbose_name_plural": "Telegram xabarlari",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["next_attempt_at", "id"],
+                        name="telegram_message_due_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "pending")),
+                        fields=("warning",),
+                        name="unique_pending_warning_telegram_message",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "pending")),
+                        fields=("notification",),
+                        name="unique_pending_notification_telegram_message",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("maintenance", "0005_telegram_message"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("maintenance_scheduled", "Texnik xizmat rejalashtirildi"),
+                    ("maintenance_due", "Texnik xizmat muddati yaqinlashmoqda"),
+                    ("maintenance_completed", "Texnik xizmat bajarildi"),
+                    ("fault_reported", "Nosozlik aniqlandi"),
+                    ("fault_resolved", "Nosozlik bartaraf etildi"),
+                    ("system", "Tizim xabarnomasi"),
+                ],
+                default="maintenance_due",
+                max_length=25,
+                verbose_name="Xabarnoma turi",
+            ),
+        ),
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("maintenance_scheduled", "Texnik xizmat rejalashtirildi"),
+                            ("maintenance_due", "Texnik xizmat muddati yaqinlashmoqda"),
+                            ("maintenance_completed", "Texnik xizmat bajarildi"),
+                            ("fault_reported", "Nosozlik aniqlandi"),
+                            ("fault_resolved", "Nosozlik bartaraf etildi"),
+                            ("system", "Tizim xabarnomasi"),
+                        ],
+                        max_length=25,
+                        verbose_name="Hodisa turi",
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict, verbose_name="Ma'lumotlar")),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Urinishlar"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Oxirgi xatolik"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Qayta ishlangan vaqti"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Hodisa",
+                "verbose_name_plural": "Hodisalar",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("processed_at__isnull", True)),
+                        fields=["id"],
+                        name="outbox_event_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
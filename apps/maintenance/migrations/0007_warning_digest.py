@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("maintenance", "0006_outbox_event"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="telegrammessage",
+            name="digest_warning_ids",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Jamlanma ogohlantirishlari"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def arm_open_schedules(apps, schema_editor):
+    # The warning timer processes every open schedule once and re-arms it
+    MaintenanceSchedule = apps.get_model("maintenance", "MaintenanceSchedule")
+    MaintenanceSchedule.objects.filter(
+        is_completed=False, next_maintenance_date__isnull=False
+    ).update(next_warning_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0009_equipment_geohash"),
+        ("maintenance", "0007_warning_digest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="maintenanceschedule",
+            name="next_warning_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="maintenanceschedule",
+            index=models.Index(
+                condition=models.Q(("next_warning_at__isnull", False)),
+                fields=["next_warning_at"],
+                name="schedule_next_warning_idx",
+            ),
+        ),
+        migrations.RunPython(arm_open_schedules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("companies", "0003_warning_digest"),
+        ("equipment", "0009_equipment_geohash"),
+        ("maintenance", "0008_schedule_next_warning_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaintenanceCalendarEntry",
+            fields=[
+                (
+                    "schedule",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="calendar_entry",
+                        serialize=False,
+                        to="maintenance.maintenanceschedule",
+                    ),
+                ),
+                (
+                    "equipment_type",
+                    models.CharField(
+                        max_length=50, verbose_name="Uskuna turi"
+                    ),
+                ),
+                (
+                    "equipment_name",
+                    models.CharField(
+                        max_length=255, verbose_name="Uskuna nomi"
+                    ),
+                ),
+                (
+                    "maintenance_type",
+                    models.CharField(
+                        choices=[
+                            ("inspection", "Texnik ko'rik"),
+                            ("full_inspection", "To'liq texnik ko'rik"),
+                            ("partial_inspection", "Qisman texnik ko'rik"),
+                            ("voltmeter_check", "Voltmetr tekshiruvi"),
+                            ("manometer_check", "Manometr tekshiruvi"),
+                            ("hydraulic_test", "Gidravlik sinov"),
+                            ("pressure_test", "Bosim sinovi"),
+                            ("flush_test", "Yuvish va sinov"),
+                            ("inner_outer_check", "Ichki/tashqi tekshiruv"),
+                            ("lab_test", "Laboratoriya tekshiruvi"),
+                            ("leveling_check", "Nivelirovka tekshiruvi"),
+                            (
+                                "safety_valve_check",
+                                "Xavfsizlik klapani tekshiruvi",
+                            ),
+                            ("lubrication_check", "Yog'lash tekshiruvi"),
+                            ("alignment_check", "Markalash tekshiruvi"),
+                            ("calibration_check", "Kalibrlash tekshiruvi"),
+                        ],
+                        max_length=50,
+                        verbose_name="Texnik xizmat turi",
+                    ),
+                ),
+                ("due_date", models.DateField(verbose_name="Ko'rik sanasi")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("planned", "Rejalashtirilgan"),
+                            ("completed", "Bajarildi"),
+                        ],
+                        max_length=10,
+                        verbose_name="Holati",
+                    ),
+                ),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="companies.company",
+                    ),
+                ),
+                (
+                    "equipment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="equipment.equipment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kalendar yozuvi",
+                "verbose_name_plural": "Kalendar yozuvlari",
+                "indexes": [
+                    models.Index(
+                        fields=["company", "due_date", "schedule"],
+                        name="calendar_company_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,203 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:35
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("companies", "0003_warning_digest"),
+        ("equipment", "0009_equipment_geohash"),
+        ("maintenance", "0009_maintenance_calendar"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="maintenanceschedule",
+            name="occurrence_date",
+            field=models.DateField(
+                blank=True, null=True, verbose_name="Takrorlanish sanasi"
+            ),
+        ),
+        migrations.CreateModel(
+            name="MaintenanceRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "maintenance_type",
+                    models.CharField(
+                        choices=[
+                            ("inspection", "Texnik ko'rik"),
+                            ("full_inspection", "To'liq texnik ko'rik"),
+                            ("partial_inspection", "Qisman texnik ko'rik"),
+                            ("voltmeter_check", "Voltmetr tekshiruvi"),
+                            ("manometer_check", "Manometr tekshiruvi"),
+                            ("hydraulic_test", "Gidravlik sinov"),
+                            ("pressure_test", "Bosim sinovi"),
+                            ("flush_test", "Yuvish va sinov"),
+                            ("inner_outer_check", "Ichki/tashqi tekshiruv"),
+                            ("lab_test", "Laboratoriya tekshiruvi"),
+                            ("leveling_check", "Nivelirovka tekshiruvi"),
+                            (
+                                "safety_valve_check",
+                                "Xavfsizlik klapani tekshiruvi",
+                            ),
+                            ("lubrication_check", "Yog'lash tekshiruvi"),
+                            ("alignment_check", "Markalash tekshiruvi"),
+                            ("calibration_check", "Kalibrlash tekshiruvi"),
+                        ],
+                        max_length=50,
+                        verbose_name="Texnik xizmat turi",
+                    ),
+                ),
+                (
+                    "description",
+                    models.TextField(blank=True, verbose_name="Ta'rif"),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("daily", "Kunlik"),
+                            ("weekly", "Haftalik"),
+                            ("monthly", "Oylik"),
+                            ("yearly", "Yillik"),
+                        ],
+                        max_length=10,
+                        verbose_name="Takrorlanish",
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveSmallIntegerField(
+                        default=1,
+                        validators=[
+                            django.core.validators.MinValueValidator(1)
+                        ],
+                        verbose_name="Oraliq",
+                    ),
+                ),
+                (
+                    "start_date",
+                    models.DateField(verbose_name="Birinchi ko'rik sanasi"),
+                ),
+                (
+                    "end_date",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Tugash sanasi"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(default=True, verbose_name="Faol"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="maintenance_rules",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="companies.company",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_maintenance_rules",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "equipment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="maintenance_rules",
+                        to="equipment.equipment",
+                        verbose_name="Uskuna",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Texnik xizmat qoidasi",
+                "verbose_name_plural": "Texnik xizmat qoidalari",
+            },
+        ),
+        migrations.AddField(
+            model_name="maintenancecalendarentry",
+            name="rule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="maintenance.maintenancerule",
+            ),
+        ),
+        migrations.AddField(
+            model_name="maintenanceschedule",
+            name="rule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="schedules",
+                to="maintenance.maintenancerule",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="maintenanceschedule",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("rule__isnull", False)),
+                fields=("rule", "occurrence_date"),
+                name="unique_rule_occurrence",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="maintenancerule",
+            index=models.Index(
+                fields=["created_at", "id"], name="rule_created_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="maintenancerule",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["company", "start_date"],
+                name="rule_active_company_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="maintenancerule",
+            constraint=models.UniqueConstraint(
+                fields=("equipment", "maintenance_type"),
+                name="unique_equipment_maintenance_rule",
+            ),
+        ),
+    ]
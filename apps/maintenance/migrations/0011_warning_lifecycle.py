@@ -0,0 +1,95 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Q
+
+LIVE_STATUSES = ["pending", "sent", "acknowledged"]
+
+
+def set_warning_statuses(apps, schema_editor):
+    MaintenanceWarning = apps.get_model("maintenance", "MaintenanceWarning")
+    MaintenanceWarning.objects.filter(
+        Q(is_sent=True) | Q(sent_to_telegram=True)
+    ).update(status="sent", is_sent=True)
+    MaintenanceWarning.objects.filter(
+        maintenance_schedule__is_completed=True
+    ).update(status="resolved")
+    # Keep the newest live warning of each schedule
+    live = MaintenanceWarning.objects.filter(status__in=LIVE_STATUSES)
+    newest = (
+        live.values("maintenance_schedule")
+        .annotate(newest=Max("pk"))
+        .values_list("newest", flat=True)
+    )
+    live.exclude(pk__in=list(newest)).update(status="superseded")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("maintenance", "0010_maintenance_rule"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="maintenancewarning",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="maintenancewarning",
+            name="acknowledged_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Tasdiqlangan vaqti"
+            ),
+        ),
+        migrations.AddField(
+            model_name="maintenancewarning",
+            name="acknowledged_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="acknowledged_warnings",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="maintenancewarning",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("sent", "Yuborildi"),
+                    ("acknowledged", "Tasdiqlandi"),
+                    ("superseded", "Almashtirildi"),
+                    ("resolved", "Hal qilindi"),
+                ],
+                default="pending",
+                max_length=15,
+                verbose_name="Holati",
+            ),
+        ),
+        migrations.RunPython(set_warning_statuses, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="maintenancewarning",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["pending", "sent", "acknowledged"])
+                ),
+                fields=["sent_date", "id"],
+                name="warning_live_keyset_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="maintenancewarning",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("status__in", ["pending", "sent", "acknowledged"])
+                ),
+                fields=("maintenance_schedule",),
+                name="unique_live_warning",
+            ),
+        ),
+    ]
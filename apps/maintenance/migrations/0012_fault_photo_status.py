@@ -0,0 +1,51 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_photos_ready(apps, schema_editor):
+    # Resized when they were saved, before the worker existed
+    EquipmentFault = apps.get_model("maintenance", "EquipmentFault")
+    EquipmentFault.objects.update(photo_status="ready")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0009_equipment_geohash"),
+        ("maintenance", "0011_warning_lifecycle"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="equipmentfault",
+            name="photo_error",
+            field=models.TextField(blank=True, verbose_name="Rasm xatoligi"),
+        ),
+        migrations.AddField(
+            model_name="equipmentfault",
+            name="photo_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Navbatda"),
+                    ("ready", "Tayyor"),
+                    ("failed", "Xatolik"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="Rasm holati",
+            ),
+        ),
+        migrations.RunPython(
+            mark_existing_photos_ready, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                condition=models.Q(("photo_status", "pending")),
+                fields=["id"],
+                name="fault_photo_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:50
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("maintenance", "0012_fault_photo_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FaultPhotoUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=255, verbose_name="Fayl nomi"),
+                ),
+                ("size", models.PositiveBigIntegerField(verbose_name="Hajmi")),
+                (
+                    "checksum",
+                    models.CharField(
+                        max_length=64, verbose_name="Nazorat yig'indisi"
+                    ),
+                ),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Qabul qilingan"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("open", "Yuklanmoqda"),
+                            ("completed", "Yakunlandi"),
+                        ],
+                        default="open",
+                        max_length=10,
+                        verbose_name="Holati",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fault_photo_uploads",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Yuklovchi",
+                    ),
+                ),
+                (
+                    "fault",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="maintenance.equipmentfault",
+                        verbose_name="Nosozlik",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Nosozlik rasmi yuklanishi",
+                "verbose_name_plural": "Nosozlik rasmlari yuklanishi",
+                "indexes": [
+                    models.Index(
+                        fields=["updated_at"], name="fault_upload_updated_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("equipment", "0010_equipment_type_index"),
+        ("maintenance", "0013_fault_photo_uploads"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                condition=models.Q(("is_resolved", False)),
+                fields=["equipment", "severity", "reported_at"],
+                name="fault_open_equipment_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                condition=models.Q(("is_resolved", False)),
+                fields=["severity", "reported_at"],
+                name="fault_open_severity_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                fields=["equipment", "reported_at"],
+                name="fault_equipment_reported_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                condition=models.Q(("is_resolved", True)),
+                fields=["resolved_at"],
+                name="fault_resolved_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+EQUIPMENT_MODELS = [
+    "heatingboiler",
+    "lathemachine",
+    "liftingcrane",
+    "pressurevessel",
+    "weldingequipment",
+]
+
+
+def fill_fault_company(apps, schema_editor):
+    # One UPDATE per equipment type, from the responsible person's company
+    EquipmentFault = apps.get_model("maintenance", "EquipmentFault")
+    for model_name in EQUIPMENT_MODELS:
+        model = apps.get_model("equipment", model_name)
+        EquipmentFault.objects.filter(
+            equipment_id__in=model.objects.values("pk")
+        ).update(
+            company_id=Subquery(
+                model.objects.filter(pk=OuterRef("equipment_id")).values(
+                    "responsible_person__company_id"
+                )[:1]
+            )
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("companies", "0003_warning_digest"),
+        ("equipment", "0010_equipment_type_index"),
+        ("maintenance", "0014_fault_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="equipmentfault",
+            name="company",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="companies.company",
+            ),
+        ),
+        migrations.RunPython(fill_fault_company, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="equipmentfault",
+            index=models.Index(
+                fields=["company", "reported_at"],
+                name="fault_company_reported_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("maintenance", "0015_fault_company"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="telegrammessage",
+            name="unique_pending_notification_telegram_message",
+        ),
+        migrations.RemoveField(
+            model_name="telegrammessage",
+            name="notification",
+        ),
+        migrations.AddField(
+            model_name="telegrammessage",
+            name="notification_ids",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Bildirishnomalar"
+            ),
+        ),
+    ]
@@ -1,14 +1,26 @@
+import os
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.core.validators import FileExtensionValidator
+from django.core.validators import FileExtensionValidator, MinValueValidator
 from django.db import models
-from django.db.models.signals import post_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from PIL import Image
 from rest_framework.exceptions import ValidationError
 
+from apps.equipment.models import (
+    EQUIPMENT_TYPE_MODELS,
+    resolve_child_values,
+    resolve_equipment_names,
+)
+from apps.users.models import User
+from apps.utils import detail_cache
 from apps.utils.get_upload_path import get_upload_path
 
 #  Ta'mirlash jadvali
@@ -85,17 +97,252 @@ class MaintenanceSchedule(models.Model):
         null=True,
         blank=True,
     )
+    # Occurrence of a recurrence rule this schedule materializes
+    rule = models.ForeignKey(
+        "MaintenanceRule",
+        on_delete=models.SET_NULL,
+        related_name="schedules",
+        null=True,
+        blank=True,
+    )
+    occurrence_date = models.DateField(
+        _("Takrorlanish sanasi"), null=True, blank=True
+    )
+    # Next instant the warning timer processes this schedule
+    next_warning_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields whose change re-arms the warning timer
+    WARNING_TIMER_FIELDS = {"next_maintenance_date", "is_completed"}
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rule", "occurrence_date"],
+                condition=models.Q(rule__isnull=False),
+                name="unique_rule_occurrence",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="schedule_created_keyset_idx",
+            ),
+            models.Index(
+                fields=["next_warning_at"],
+                condition=models.Q(next_warning_at__isnull=False),
+                name="schedule_next_warning_idx",
+            ),
+            # Warning sweep: open schedules by due date
+            models.Index(
+                fields=["next_maintenance_date"],
+                condition=models.Q(is_completed=False),
+                name="schedule_open_due_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.get_maintenance_type_display()} - {self.scheduled_date}"
 
+    def save(self, *args, **kwargs):
+        # Let the warning timer (re)process the schedule right away; it
+        # resolves the warnings of completed schedules and disarms them
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.WARNING_TIMER_FIELDS & set(
+            update_fields
+        ):
+            self.next_warning_at = timezone.now()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "next_warning_at"}
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=MaintenanceSchedule)
+@receiver(post_delete, sender=MaintenanceSchedule)
+def invalidate_schedule_detail_cache(sender, instance, **kwargs):
+    detail_cache.invalidate(MaintenanceSchedule, [instance.pk])
+
+
+# Takroriy texnik xizmat qoidalari
+# ------------------------------------------------------------------------------------------
+class MaintenanceRule(models.Model):
+    """
+    Recurring maintenance of an equipment: every ``interval`` days,
+    weeks, months or years from ``start_date``. Occurrences are expanded
+    on demand; only the next open one (and any completed or edited one)
+    is stored as a ``MaintenanceSchedule``.
+    """
+
+    FREQUENCY_CHOICES = [
+        ("daily", _("Kunlik")),
+        ("weekly", _("Haftalik")),
+        ("monthly", _("Oylik")),
+        ("yearly", _("Yillik")),
+    ]
+    # relativedelta argument and the longest period in days
+    FREQUENCY_UNITS = {
+        "daily": ("days", 1),
+        "weekly": ("weeks", 7),
+        "monthly": ("months", 31),
+        "yearly": ("years", 366),
+    }
+
+    equipment = models.ForeignKey(
+        "equipment.Equipment",
+        on_delete=models.CASCADE,
+        verbose_name=_("Uskuna"),
+        related_name="maintenance_rules",
+    )
+    # Company of the equipment's responsible person
+    company = models.ForeignKey(
+        "companies.Company",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    maintenance_type = models.CharField(
+        _("Texnik xizmat turi"),
+        max_length=50,
+        choices=MaintenanceSchedule.MAINTENANCE_TYPE_CHOICES,
+    )
+    description = models.TextField(_("Ta'rif"), blank=True)
+    frequency = models.CharField(
+        _("Takrorlanish"), max_length=10, choices=FREQUENCY_CHOICES
+    )
+    interval = models.PositiveSmallIntegerField(
+        _("Oraliq"), default=1, validators=[MinValueValidator(1)]
+    )
+    start_date = models.DateField(_("Birinchi ko'rik sanasi"))
+    end_date = models.DateField(_("Tugash sanasi"), null=True, blank=True)
+    assigned_to = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        related_name="maintenance_rules",
+        null=True,
+        blank=True,
+    )
+    is_active = models.BooleanField(_("Faol"), default=True)
+    created_by = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        related_name="created_maintenance_rules",
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Texnik xizmat qoidasi")
+        verbose_name_plural = _("Texnik xizmat qoidalari")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["equipment", "maintenance_type"],
+                name="unique_equipment_maintenance_rule",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="rule_created_keyset_idx"
+            ),
+            models.Index(
+                fields=["company", "start_date"],
+                condition=models.Q(is_active=True),
+                name="rule_active_company_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_maintenance_type_display()} - "
+            f"{self.interval} {self.get_frequency_display()}"
+        )
+
+    def save(self, *args, **kwargs):
+        self.company_id = resolve_child_values(
+            {self.equipment_id: self.equipment.type},
+            "responsible_person__company_id",
+        ).get(self.equipment_id)
+        super().save(*args, **kwargs)
+
+    def occurrence(self, index):
+        unit, _days = self.FREQUENCY_UNITS[self.frequency]
+        return self.start_date + relativedelta(**{unit: index * self.interval})
+
+    def occurrences(self, start, end):
+        """Occurrence dates between ``start`` and ``end`` (inclusive)"""
+        if self.end_date is not None:
+            end = min(end, self.end_date)
+        _unit, days = self.FREQUENCY_UNITS[self.frequency]
+        # Skip whole periods before the window; never past its first date
+        index = max(
+            (start - self.start_date).days // (days * self.interval), 0
+        )
+        while True:
+            day = self.occurrence(index)
+            if day > end:
+                return
+            if day >= start:
+                yield day
+            index += 1
+
+    def next_occurrence(self, after=None):
+        """First occurrence after ``after`` (from the start if None)"""
+        start = self.start_date if after is None else after + timedelta(days=1)
+        return next(self.occurrences(start, date.max), None)
+
+    def materialize(self, occurrence_date):
+        """``(schedule, created)`` for an occurrence, stored on first use"""
+        return MaintenanceSchedule.objects.get_or_create(
+            rule=self,
+            occurrence_date=occurrence_date,
+            defaults={
+                "equipment_id": self.equipment_id,
+                "maintenance_type": self.maintenance_type,
+                "description": self.description,
+                "scheduled_date": occurrence_date,
+                "next_maintenance_date": occurrence_date,
+                "assigned_to_id": self.assigned_to_id,
+                "created_by_id": self.created_by_id,
+            },
+        )
+
+    def roll_forward(self, after=None):
+        """Store the occurrence after ``after`` so it gets warnings"""
+        if not self.is_active:
+            return None
+        occurrence_date = self.next_occurrence(after)
+        if occurrence_date is None:
+            return None
+        return self.materialize(occurrence_date)[0]
+
+
+@receiver(post_save, sender=MaintenanceRule)
+def materialize_first_occurrence(sender, instance, created, **kwargs):
+    if created:
+        instance.roll_forward()
+
 
 # Xizmat haqida ogohlantirish
 # ------------------------------------------------------------------------------------------
 
 
+class MaintenanceWarningQuerySet(models.QuerySet):
+    def live(self):
+        return self.filter(status__in=MaintenanceWarning.LIVE_STATUSES)
+
+    def transition(self, status, **fields):
+        """
+        Move the rows allowed to reach ``status`` (``TRANSITIONS``) in one
+        ``UPDATE``; the others keep their status. Returns the count.
+        """
+        return self.filter(
+            status__in=MaintenanceWarning.TRANSITIONS[status]
+        ).update(status=status, updated_at=timezone.now(), **fields)
+
+
 class MaintenanceWarning(models.Model):
     WARNING_TIME = (
         ("one_month", _("1 oy oldin")),
@@ -109,6 +356,37 @@ class MaintenanceWarning(models.Model):
         ("high", _("Yuqori")),
         ("critical", _("Favqulodda")),
     )
+    # (max days left, warning time, warning level)
+    WARNING_THRESHOLDS = (
+        (3, "three_days", "critical"),
+        (7, "seven_days", "high"),
+        (15, "fifteen_days", "medium"),
+        (30, "one_month", "low"),
+    )
+    WARNING_WINDOW_DAYS = WARNING_THRESHOLDS[-1][0]
+    # Lifecycle: pending -> sent -> acknowledged; a live warning is
+    # superseded when its level changes and resolved when the schedule
+    # is completed or leaves the warning window
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_ACKNOWLEDGED = "acknowledged"
+    STATUS_SUPERSEDED = "superseded"
+    STATUS_RESOLVED = "resolved"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Navbatda")),
+        (STATUS_SENT, _("Yuborildi")),
+        (STATUS_ACKNOWLEDGED, _("Tasdiqlandi")),
+        (STATUS_SUPERSEDED, _("Almashtirildi")),
+        (STATUS_RESOLVED, _("Hal qilindi")),
+    ]
+    LIVE_STATUSES = [STATUS_PENDING, STATUS_SENT, STATUS_ACKNOWLEDGED]
+    # Target status -> statuses it can be reached from
+    TRANSITIONS = {
+        STATUS_SENT: [STATUS_PENDING],
+        STATUS_ACKNOWLEDGED: [STATUS_PENDING, STATUS_SENT],
+        STATUS_SUPERSEDED: LIVE_STATUSES,
+        STATUS_RESOLVED: LIVE_STATUSES,
+    }
     maintenance_schedule = models.ForeignKey(
         MaintenanceSchedule, on_delete=models.CASCADE, related_name="warnings"
     )
@@ -129,16 +407,53 @@ class MaintenanceWarning(models.Model):
     sent_to_telegram = models.BooleanField(
         _("Telegramga yuborilgan"), default=False
     )
+    status = models.CharField(
+        _("Holati"),
+        max_length=15,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    acknowledged_at = models.DateTimeField(
+        _("Tasdiqlangan vaqti"), null=True, blank=True
+    )
+    acknowledged_by = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        related_name="acknowledged_warnings",
+        null=True,
+        blank=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MaintenanceWarningQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Maintenance Warning")
         verbose_name_plural = _("Maintenance Warnings")
-        unique_together = (
-            "maintenance_schedule",
-            "warning_level",
-        )  # Prevent duplicate warnings
+        constraints = [
+            # One live warning per schedule
+            models.UniqueConstraint(
+                fields=["maintenance_schedule"],
+                condition=models.Q(
+                    status__in=["pending", "sent", "acknowledged"]
+                ),
+                name="unique_live_warning",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["sent_date", "id"], name="warning_sent_keyset_idx"
+            ),
+            # Warnings list: live rows only
+            models.Index(
+                fields=["sent_date", "id"],
+                condition=models.Q(
+                    status__in=["pending", "sent", "acknowledged"]
+                ),
+                name="warning_live_keyset_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -158,6 +473,18 @@ class MaintenanceWarning(models.Model):
             ).days
         return None
 
+    @classmethod
+    def get_warning_time(cls, days_left):
+        """(warning time, warning level) for the remaining days or None"""
+        for max_days, warning_time, warning_level in cls.WARNING_THRESHOLDS:
+            if days_left <= max_days:
+                return warning_time, warning_level
+        return None
+
+    @staticmethod
+    def build_message(equipment_name, days_left, next_maintenance_date):
+        return f"{equipment_name.capitalize()} ning texnik ko‘rikga {days_left} kun qoldi. ({next_maintenance_date})"
+
     def set_warning_time(self):
         """
         This method determines the warning time based on the remaining days.
@@ -166,25 +493,19 @@ class MaintenanceWarning(models.Model):
         days_left = self.calculate_days_until_next_maintenance()
 
         if days_left is not None:
-            if days_left <= 3:
-                self.warning_time = "three_days"
-                self.warning_level = "critical"
-            elif days_left <= 7:
-                self.warning_time = "seven_days"
-                self.warning_level = "high"
-            elif days_left <= 15:
-                self.warning_time = "fifteen_days"
-                self.warning_level = "medium"
-            elif days_left <= 30:
-                self.warning_time = "one_month"
-                self.warning_level = "low"
-            else:
+            warning = self.get_warning_time(days_left)
+            if warning is None:
                 self.warning_time = None
                 self.message = ""
                 return
-                # Set the message
+            self.warning_time, self.warning_level = warning
 
-            self.message = f"{str(self.maintenance_schedule.equipment).capitalize()} ning texnik ko‘rikga {days_left} kun qoldi. ({self.maintenance_schedule.next_maintenance_date})"
+            # Set the message
+            self.message = self.build_message(
+                str(self.maintenance_schedule.equipment),
+                days_left,
+                self.maintenance_schedule.next_maintenance_date,
+            )
         else:
             self.warning_time = None
             self.message = ""
@@ -193,6 +514,63 @@ class MaintenanceWarning(models.Model):
 
 
 # ------------------------------------------------------------------------------------------
+class EquipmentFaultQuerySet(models.QuerySet):
+    def open(self):
+        return self.filter(is_resolved=False)
+
+    def filter_by(
+        self,
+        equipment=None,
+        equipment_type=None,
+        severity=None,
+        is_resolved=None,
+        reported_by=None,
+        reported_from=None,
+        reported_to=None,
+        resolved_from=None,
+        resolved_to=None,
+    ):
+        """
+        Typed list filters; omitted (``None``) ones are skipped. Date
+        bounds are inclusive days, compared as a half-open range of
+        timestamps so ``reported_at``/``resolved_at`` indexes apply.
+        """
+        conditions = {
+            "equipment_id": equipment,
+            "equipment__type": equipment_type,
+            "severity__in": severity,
+            "is_resolved": is_resolved,
+            "reported_by_id": reported_by,
+            "reported_at__gte": day_start(reported_from),
+            "reported_at__lt": day_start(reported_to, 1),
+            "resolved_at__gte": day_start(resolved_from),
+            "resolved_at__lt": day_start(resolved_to, 1),
+        }
+        return self.filter(
+            **{
+                lookup: value
+                for lookup, value in conditions.items()
+                if value is not None
+            }
+        )
+
+    def move_to_company(self, company_id):
+        """Re-home faults whose equipment changed company"""
+        faults = self.exclude(company_id=company_id)
+        previous = set(faults.values_list("company_id", flat=True).distinct())
+        if previous:
+            faults.update(company_id=company_id)
+            invalidate_reliability([*previous, company_id])
+
+
+def day_start(day, days=0):
+    if day is None:
+        return None
+    return timezone.make_aware(
+        datetime.combine(day + timedelta(days=days), time.min)
+    )
+
+
 class EquipmentFault(models.Model):
     FAULT_SEVERITY = (
         ("minor", _("Yengil")),
@@ -200,12 +578,31 @@ class EquipmentFault(models.Model):
         ("major", _("Jiddiy")),
         ("critical", _("Favqulodda")),
     )
+    PHOTO_STATUS_PENDING = "pending"
+    PHOTO_STATUS_READY = "ready"
+    PHOTO_STATUS_FAILED = "failed"
+    PHOTO_STATUS_CHOICES = [
+        (PHOTO_STATUS_PENDING, _("Navbatda")),
+        (PHOTO_STATUS_READY, _("Tayyor")),
+        (PHOTO_STATUS_FAILED, _("Xatolik")),
+    ]
+    PHOTO_EXTENSIONS = ["jpg", "jpeg", "png", "heic"]
+    # Version token label of the cached reliability reports
+    RELIABILITY_CACHE_LABEL = "maintenance.reliability"
     equipment = models.ForeignKey(
         "equipment.Equipment",
         on_delete=models.CASCADE,
         verbose_name=_("Uskuna"),
         related_name="faults",
     )
+    # Company of the equipment's responsible person
+    company = models.ForeignKey(
+        "companies.Company",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     title = models.CharField(_("Nosozlik nomi"), max_length=255, blank=True)
     description = models.TextField(_("Ta'rifi"), blank=True)
     severity = models.CharField(
@@ -215,9 +612,7 @@ class EquipmentFault(models.Model):
         _("Rasmi"),
         upload_to=get_upload_path,
         validators=[
-            FileExtensionValidator(
-                allowed_extensions=["jpg", "jpeg", "png", "heic"]
-            )
+            FileExtensionValidator(allowed_extensions=PHOTO_EXTENSIONS)
         ],
     )
     capture_time = models.DateTimeField(
@@ -248,34 +643,97 @@ class EquipmentFault(models.Model):
     gps_location = models.CharField(
         _("GPS location"), max_length=255, blank=True, null=True
     )
+    photo_status = models.CharField(
+        _("Rasm holati"),
+        max_length=10,
+        choices=PHOTO_STATUS_CHOICES,
+        default=PHOTO_STATUS_PENDING,
+    )
+    photo_error = models.TextField(_("Rasm xatoligi"), blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EquipmentFaultQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Uskunalar nosozligi")
         verbose_name_plural = _("Uskunalar nosozliklari")
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="fault_created_keyset_idx"
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(photo_status="pending"),
+                name="fault_photo_pending_idx",
+            ),
+            # Triage: open faults by equipment and/or severity and date
+            models.Index(
+                fields=["equipment", "severity", "reported_at"],
+                condition=models.Q(is_resolved=False),
+                name="fault_open_equipment_idx",
+            ),
+            models.Index(
+                fields=["severity", "reported_at"],
+                condition=models.Q(is_resolved=False),
+                name="fault_open_severity_idx",
+            ),
+            # Fault history of an equipment, resolved ones included
+            models.Index(
+                fields=["equipment", "reported_at"],
+                name="fault_equipment_reported_idx",
+            ),
+            models.Index(
+                fields=["resolved_at"],
+                condition=models.Q(is_resolved=True),
+                name="fault_resolved_at_idx",
+            ),
+            # Reliability report of a company over a date range
+            models.Index(
+                fields=["company", "reported_at"],
+                name="fault_company_reported_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.equipment}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Photo as loaded, so save() needs no SELECT to compare
+        instance._loaded_photo = instance.__dict__.get("photo")
+        instance._loaded_equipment_id = instance.__dict__.get("equipment_id")
+        instance._loaded_company_id = instance.__dict__.get("company_id")
+        instance._loaded_is_resolved = instance.__dict__.get("is_resolved")
+        return instance
+
     def save(self, *args, **kwargs):
+        # Stored as uploaded; process_fault_photos resizes it later
+        if (
+            not self._state.adding
+            and "photo" in self.__dict__
+            and getattr(self, "_loaded_photo", None)
+            and self.photo.name != self._loaded_photo
+        ):
+            raise ValidationError(
+                "You cannot change the photo after submission."
+            )
+        if self._state.adding or self.equipment_id != getattr(
+            self, "_loaded_equipment_id", None
+        ):
+            self.company_id = resolve_child_values(
+                {self.equipment_id: self.equipment.type},
+                "responsible_person__company_id",
+            ).get(self.equipment_id)
         super().save(*args, **kwargs)
 
-        img = Image.open(self.photo.path)
-        max_width = 800
-        max_height = 600
-        if img.width > max_width or img.height > max_height:
-            new_size = (max_width, max_height)
-            img.thumbnail(new_size, Image.Resampling.LANCZOS)
-            img.save(self.photo.path)
-
-        if self.pk:
-            old = EquipmentFault.objects.get(pk=self.pk)
-            if old.photo and self.photo != old.photo:
-                raise ValidationError(
-                    "You cannot change the photo after submission."
-                )
-        super().save(*args, **kwargs)
+
+def invalidate_reliability(company_ids):
+    """Retire the cached reliability reports of the given companies"""
+    detail_cache.invalidate_versions(
+        EquipmentFault.RELIABILITY_CACHE_LABEL, company_ids
+    )
 
 
 @receiver(post_delete, sender=EquipmentFault)
@@ -284,22 +742,79 @@ def delete_fault_photo(sender, instance, **kwargs):
         instance.photo.delete(save=False)
 
 
-@receiver(pre_save, sender=EquipmentFault)
-def delete_old_fault_photo(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old_instance = sender.objects.get(pk=instance.pk)
-            if instance.photo != old_instance.photo:
-                if old_instance.photo:
-                    old_instance.photo.delete(save=False)
-        except sender.DoesNotExist:
-            pass
+@receiver(post_save, sender=EquipmentFault)
+@receiver(post_delete, sender=EquipmentFault)
+def invalidate_fault_reliability(sender, instance, **kwargs):
+    invalidate_reliability(
+        [instance.company_id, getattr(instance, "_loaded_company_id", None)]
+    )
+
+
+class FaultPhotoUpload(models.Model):
+    """
+    Resumable upload of a fault photo: chunks are appended to
+    ``path`` (``PUT`` with ``Content-Range``) until ``offset`` reaches
+    ``size``, then finalizing checks ``checksum`` and creates the fault.
+    """
+
+    STATUS_OPEN = "open"
+    STATUS_COMPLETED = "completed"
+    STATUS_CHOICES = [
+        (STATUS_OPEN, _("Yuklanmoqda")),
+        (STATUS_COMPLETED, _("Yakunlandi")),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="fault_photo_uploads",
+        verbose_name=_("Yuklovchi"),
+    )
+    filename = models.CharField(_("Fayl nomi"), max_length=255)
+    size = models.PositiveBigIntegerField(_("Hajmi"))
+    # SHA-256 of the whole file, hex
+    checksum = models.CharField(_("Nazorat yig'indisi"), max_length=64)
+    offset = models.PositiveBigIntegerField(_("Qabul qilingan"), default=0)
+    status = models.CharField(
+        _("Holati"),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_OPEN,
+    )
+    fault = models.ForeignKey(
+        EquipmentFault,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Nosozlik"),
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Nosozlik rasmi yuklanishi")
+        verbose_name_plural = _("Nosozlik rasmlari yuklanishi")
+        indexes = [
+            models.Index(
+                fields=["updated_at"], name="fault_upload_updated_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def path(self):
+        return os.path.join(settings.FAULT_PHOTO_UPLOAD_DIR, f"{self.pk}.part")
 
 
 # Bildirishnoma jurnali
 # ------------------------------------------------------------------------------------------
 class Notification(models.Model):
     NOTIFICATION_TYPE = (
+        ("maintenance_scheduled", _("Texnik xizmat rejalashtirildi")),
         ("maintenance_due", _("Texnik xizmat muddati yaqinlashmoqda")),
         ("maintenance_completed", _("Texnik xizmat bajarildi")),
         ("fault_reported", _("Nosozlik aniqlandi")),
@@ -338,3 +853,412 @@ class Notification(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.user.username}"
+
+
+# Hodisalar navbati (outbox)
+# ------------------------------------------------------------------------------------------
+class OutboxEvent(models.Model):
+    """
+    Domain event written in the transaction of the change that caused it
+    and fanned out to notifications by ``dispatch_outbox_events``.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    event_type = models.CharField(
+        _("Hodisa turi"),
+        max_length=25,
+        choices=Notification.NOTIFICATION_TYPE,
+    )
+    payload = models.JSONField(_("Ma'lumotlar"), default=dict)
+    attempts = models.PositiveSmallIntegerField(_("Urinishlar"), default=0)
+    last_error = models.TextField(_("Oxirgi xatolik"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(
+        _("Qayta ishlangan vaqti"), null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = _("Hodisa")
+        verbose_name_plural = _("Hodisalar")
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="outbox_event_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} - {self.created_at}"
+
+
+@receiver(pre_save, sender=MaintenanceSchedule)
+def track_schedule_completion(sender, instance, **kwargs):
+    instance._completed_now = (
+        instance.is_completed
+        and not instance._state.adding
+        and sender.objects.filter(pk=instance.pk, is_completed=False).exists()
+    )
+
+
+@receiver(post_save, sender=MaintenanceSchedule)
+def record_schedule_events(sender, instance, created, **kwargs):
+    payload = {
+        "schedule_id": instance.pk,
+        "equipment_id": instance.equipment_id,
+        "maintenance_type": instance.maintenance_type,
+        "assigned_to_id": instance.assigned_to_id,
+    }
+    if created:
+        OutboxEvent.objects.create(
+            event_type="maintenance_scheduled",
+            payload={
+                **payload,
+                "date": str(
+                    instance.next_maintenance_date or instance.scheduled_date
+                ),
+            },
+        )
+    elif getattr(instance, "_completed_now", False):
+        instance._completed_now = False
+        OutboxEvent.objects.create(
+            event_type="maintenance_completed", payload=payload
+        )
+        if instance.rule_id:
+            instance.rule.roll_forward(instance.occurrence_date)
+
+
+@receiver(pre_save, sender=EquipmentFault)
+def track_fault_resolution(sender, instance, **kwargs):
+    if not instance.is_resolved or instance._state.adding:
+        instance._resolved_now = False
+        return
+    # Compared with the value loaded by from_db; queried only for
+    # instances built without it (deferred field, unsaved pk)
+    was_resolved = getattr(instance, "_loaded_is_resolved", None)
+    if was_resolved is None:
+        was_resolved = not sender.objects.filter(
+            pk=instance.pk, is_resolved=False
+        ).exists()
+    instance._resolved_now = not was_resolved
+
+
+@receiver(post_save, sender=EquipmentFault)
+def record_fault_events(sender, instance, created, **kwargs):
+    instance._loaded_is_resolved = instance.is_resolved
+    payload = {
+        "fault_id": instance.pk,
+        "equipment_id": instance.equipment_id,
+        "title": instance.title,
+        "reported_by_id": instance.reported_by_id,
+    }
+    if created:
+        OutboxEvent.objects.create(
+            event_type="fault_reported", payload=payload
+        )
+    elif getattr(instance, "_resolved_now", False):
+        instance._resolved_now = False
+        OutboxEvent.objects.create(
+            event_type="fault_resolved", payload=payload
+        )
+
+
+# Telegram xabarlar navbati
+# ------------------------------------------------------------------------------------------
+class TelegramMessageQuerySet(models.QuerySet):
+    def enqueue(self, messages):
+        """Bulk-create pending messages (one pending per warning)"""
+        return self.bulk_create(messages, ignore_conflicts=True)
+
+
+class TelegramMessage(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Navbatda")),
+        (STATUS_SENT, _("Yuborildi")),
+        (STATUS_FAILED, _("Xatolik")),
+    ]
+    MAX_ATTEMPTS = 5
+
+    chat_id = models.CharField(_("Chat ID"), max_length=64)
+    text = models.TextField(_("Xabar matni"))
+    status = models.CharField(
+        _("Holati"),
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(_("Urinishlar"), default=0)
+    last_error = models.TextField(_("Oxirgi xatolik"), blank=True)
+    next_attempt_at = models.DateTimeField(
+        _("Keyingi urinish vaqti"), default=timezone.now
+    )
+    sent_at = models.DateTimeField(
+        _("Yuborilgan vaqti"), null=True, blank=True
+    )
+    # Delivery is written back to the source's sent_to_telegram
+    warning = models.ForeignKey(
+        MaintenanceWarning,
+        on_delete=models.CASCADE,
+        related_name="telegram_messages",
+        null=True,
+        blank=True,
+    )
+    # Warnings listed in a digest message
+    digest_warning_ids = models.JSONField(
+        _("Jamlanma ogohlantirishlari"), default=list, blank=True
+    )
+    # In-app notifications of the same event (one per recipient)
+    notification_ids = models.JSONField(
+        _("Bildirishnomalar"), default=list, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TelegramMessageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Telegram xabari")
+        verbose_name_plural = _("Telegram xabarlari")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["warning"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_warning_telegram_message",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at", "id"],
+                condition=models.Q(status="pending"),
+                name="telegram_message_due_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.chat_id} - {self.get_status_display()}"
+
+
+# Texnik xizmat kalendari
+# ------------------------------------------------------------------------------------------
+class MaintenanceCalendarQuerySet(models.QuerySet):
+    def refresh(self, schedule_ids):
+        """
+        Rebuild the entries of ``schedule_ids`` from their schedules in a
+        few set-based queries. Schedules without a date lose their entry.
+        """
+        schedules = list(
+            MaintenanceSchedule.objects.filter(pk__in=schedule_ids).values(
+                "pk",
+                "equipment_id",
+                "equipment__type",
+                "maintenance_type",
+                "scheduled_date",
+                "next_maintenance_date",
+                "assigned_to_id",
+                "is_completed",
+                "rule_id",
+            )
+        )
+        equipment_types = {
+            schedule["equipment_id"]: schedule["equipment__type"]
+            for schedule in schedules
+        }
+        names = resolve_equipment_names(equipment_types)
+        responsible = resolve_child_values(
+            equipment_types, "responsible_person_id"
+        )
+        companies = dict(
+            User.objects.filter(
+                pk__in=set(responsible.values()) - {None}
+            ).values_list("pk", "company_id")
+        )
+
+        entries = []
+        for schedule in schedules:
+            due_date = (
+                schedule["next_maintenance_date"] or schedule["scheduled_date"]
+            )
+            if due_date is None:
+                continue
+            equipment_id = schedule["equipment_id"]
+            entries.append(
+                self.model(
+                    schedule_id=schedule["pk"],
+                    company_id=companies.get(responsible.get(equipment_id)),
+                    equipment_id=equipment_id,
+                    equipment_type=schedule["equipment__type"],
+                    equipment_name=names[equipment_id][:255],
+                    maintenance_type=schedule["maintenance_type"],
+                    due_date=due_date,
+                    assigned_to_id=schedule["assigned_to_id"],
+                    rule_id=schedule["rule_id"],
+                    status=(
+                        self.model.STATUS_COMPLETED
+                        if schedule["is_completed"]
+                        else self.model.STATUS_PLANNED
+                    ),
+                )
+            )
+        self.filter(schedule_id__in=schedule_ids).exclude(
+            schedule_id__in=[entry.schedule_id for entry in entries]
+        ).delete()
+        return self.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=["schedule"],
+            update_fields=self.model.REFRESH_FIELDS,
+        )
+
+
+class MaintenanceCalendarEntry(models.Model):
+    """
+    Compact copy of a schedule for the calendar endpoint, kept in sync by
+    the receivers below so a month view is one ``(company, due_date)``
+    index range scan without the polymorphic equipment lookups.
+    """
+
+    STATUS_PLANNED = "planned"
+    STATUS_COMPLETED = "completed"
+    STATUS_CHOICES = [
+        (STATUS_PLANNED, _("Rejalashtirilgan")),
+        (STATUS_COMPLETED, _("Bajarildi")),
+    ]
+    # Schedule fields copied into the entry
+    SCHEDULE_FIELDS = {
+        "equipment",
+        "maintenance_type",
+        "scheduled_date",
+        "next_maintenance_date",
+        "assigned_to",
+        "is_completed",
+        "rule",
+    }
+    REFRESH_FIELDS = [
+        "company",
+        "equipment",
+        "equipment_type",
+        "equipment_name",
+        "maintenance_type",
+        "due_date",
+        "assigned_to",
+        "rule",
+        "status",
+    ]
+
+    schedule = models.OneToOneField(
+        MaintenanceSchedule,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="calendar_entry",
+    )
+    # Company of the equipment's responsible person
+    company = models.ForeignKey(
+        "companies.Company",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    equipment = models.ForeignKey(
+        "equipment.Equipment", on_delete=models.CASCADE, related_name="+"
+    )
+    equipment_type = models.CharField(_("Uskuna turi"), max_length=50)
+    equipment_name = models.CharField(_("Uskuna nomi"), max_length=255)
+    maintenance_type = models.CharField(
+        _("Texnik xizmat turi"),
+        max_length=50,
+        choices=MaintenanceSchedule.MAINTENANCE_TYPE_CHOICES,
+    )
+    due_date = models.DateField(_("Ko'rik sanasi"))
+    assigned_to = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    rule = models.ForeignKey(
+        MaintenanceRule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    status = models.CharField(
+        _("Holati"), max_length=10, choices=STATUS_CHOICES
+    )
+
+    objects = MaintenanceCalendarQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Kalendar yozuvi")
+        verbose_name_plural = _("Kalendar yozuvlari")
+        indexes = [
+            models.Index(
+                fields=["company", "due_date", "schedule"],
+                name="calendar_company_due_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_name} - {self.due_date}"
+
+
+@receiver(post_save, sender=MaintenanceSchedule)
+def refresh_calendar_entry(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or MaintenanceCalendarEntry.SCHEDULE_FIELDS & {
+        field.removesuffix("_id") for field in update_fields
+    }:
+        MaintenanceCalendarEntry.objects.refresh([instance.pk])
+
+
+def refresh_equipment_calendar_entries(sender, instance, created, **kwargs):
+    # Name and responsible person (hence company) live on the equipment
+    if not created:
+        MaintenanceCalendarEntry.objects.refresh(
+            MaintenanceSchedule.objects.filter(
+                equipment_id=instance.pk
+            ).values_list("pk", flat=True)
+        )
+        company_id = (
+            User.objects.filter(pk=instance.responsible_person_id)
+            .values_list("company_id", flat=True)
+            .first()
+        )
+        MaintenanceRule.objects.filter(equipment_id=instance.pk).update(
+            company_id=company_id
+        )
+        EquipmentFault.objects.filter(
+            equipment_id=instance.pk
+        ).move_to_company(company_id)
+
+
+for equipment_model in EQUIPMENT_TYPE_MODELS.values():
+    post_save.connect(
+        refresh_equipment_calendar_entries, sender=equipment_model
+    )
+
+
+@receiver(post_save, sender=User)
+def update_calendar_company(sender, instance, created, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if created or (
+        update_fields is not None and "company" not in update_fields
+    ):
+        return
+    for model in EQUIPMENT_TYPE_MODELS.values():
+        equipment_ids = model.objects.filter(
+            responsible_person=instance
+        ).values("pk")
+        for related_model in (MaintenanceCalendarEntry, MaintenanceRule):
+            related_model.objects.filter(
+                equipment_id__in=equipment_ids
+            ).exclude(company_id=instance.company_id).update(
+                company_id=instance.company_id
+            )
+        EquipmentFault.objects.filter(
+            equipment_id__in=equipment_ids
+        ).move_to_company(instance.company_id)
@@ -4,6 +4,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from apps.companies.api.serializers import CompanyModelSerializer
+from apps.core.api.serializers import RenditionsField
 from apps.users.models import LoginLog
 from apps.users.models import User as UserType
 from apps.users.models import UserRole
@@ -13,6 +14,7 @@ User = get_user_model()
 
 class UserSerializer(serializers.ModelSerializer[UserType]):
     company = CompanyModelSerializer(read_only=True)
+    image_renditions = RenditionsField(source="image")
 
     class Meta:
         model = User
@@ -22,6 +24,7 @@ class UserSerializer(serializers.ModelSerializer[UserType]):
             "name",
             "role",
             "image",
+            "image_renditions",
             "company",
             "phone_number",
             "jshshir",
@@ -54,6 +54,7 @@ class UserListAPIView(ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("pk",)
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["username", "name", "phone_number"]
 
@@ -85,6 +86,7 @@ class UserDeleteAPIView(DestroyAPIView):
 class LoginLogListAPIView(ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ("-time", "-pk")
     serializer_class = LoginLogSerializer
 
     def get_queryset(self):
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_loginlog"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="loginlog",
+            index=models.Index(
+                fields=["user", "time", "id"], name="loginlog_time_keyset_idx"
+            ),
+        ),
+    ]
@@ -6,10 +6,14 @@ from django.core.exceptions import ValidationError
 from django.core.files import File
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 
+from apps.core.models import enqueue_image_renditions
+from apps.utils import detail_cache
 from apps.utils.get_upload_path import get_upload_path
 
 
@@ -135,6 +139,26 @@ class User(AbstractUser):
         super().save(*args, **kwargs)
 
 
+# Fields of the user that are rendered into cached detail payloads
+DETAIL_CACHE_FIELDS = {"name", "username"}
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_detail_cache(sender, instance, update_fields, **kwargs):
+    # Logins only touch last_login
+    if update_fields and not DETAIL_CACHE_FIELDS.intersection(update_fields):
+        return
+    detail_cache.invalidate(User, [instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_detail_cache(sender, instance, **kwargs):
+    detail_cache.invalidate(User, [instance.pk])
+
+
+post_save.connect(enqueue_image_renditions("image"), sender=User, weak=False)
+
+
 class LoginLog(models.Model):
     user = models.ForeignKey(
         "users.User", on_delete=models.CASCADE, related_name="login_logs"
@@ -142,5 +166,12 @@ class LoginLog(models.Model):
     device = models.TextField()
     time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "time", "id"], name="loginlog_time_keyset_idx"
+            )
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.time}"
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
+
+from apps.maintenance.models import FaultPhotoUpload
+
+# Bytes read from the request or the file at a time
+COPY_BUFFER_SIZE = 64 * 1024
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+
+class AssembledUploadedFile(UploadedFile):
+    """
+    The finished upload, read from disk like a ``TemporaryUploadedFile``:
+    image validation opens the path and the storage moves the file
+    instead of copying it through memory.
+    """
+
+    def __init__(self, path, name, size):
+        super().__init__(open(path, "rb"), name, None, size)
+        self.path = path
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def parse_content_range(header, size):
+    """
+    ``(start, end)`` of ``Content-Range: bytes start-end/total``, end
+    exclusive; ``None`` when the header is missing or does not fit.
+    """
+    match = CONTENT_RANGE.match(header or "")
+    if match is None:
+        return None
+    start, last, total = match.groups()
+    start, end = int(start), int(last) + 1
+    if total != "*" and int(total) != size:
+        return None
+    if start >= end or end > size:
+        return None
+    return start, end
+
+
+def create_upload_file(upload):
+    os.makedirs(settings.FAULT_PHOTO_UPLOAD_DIR, exist_ok=True)
+    open(upload.path, "wb").close()
+
+
+def write_chunk(upload, stream, start, length):
+    """
+    Copy ``length`` bytes of ``stream`` into the upload file at
+    ``start``, ``COPY_BUFFER_SIZE`` at a time. Returns the bytes written,
+    fewer when the client disconnected.
+    """
+    written = 0
+    with open(upload.path, "r+b") as file:
+        file.seek(start)
+        while written < length:
+            block = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not block:
+                break
+            file.write(block)
+            written += len(block)
+    return written
+
+
+def advance_offset(upload, start, written):
+    """
+    Move the offset past a written chunk unless another request moved
+    it first; returns whether this request did.
+    """
+    return bool(
+        FaultPhotoUpload.objects.filter(pk=upload.pk, offset=start).update(
+            offset=start + written, updated_at=timezone.now()
+        )
+    )
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(COPY_BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def delete_upload_file(upload):
+    try:
+        os.remove(upload.path)
+    except FileNotFoundError:
+        pass
+
+
+def prune_fault_photo_uploads(now=None):
+    """
+    Delete uploads untouched for ``FAULT_PHOTO_UPLOAD_EXPIRY_HOURS`` and
+    their partial files; completed ones were kept to answer retried
+    finalize requests.
+    """
+    now = now or timezone.now()
+    expired = list(
+        FaultPhotoUpload.objects.filter(
+            updated_at__lt=now
+            - timedelta(hours=settings.FAULT_PHOTO_UPLOAD_EXPIRY_HOURS)
+        ).only("pk")
+    )
+    for upload in expired:
+        delete_upload_file(upload)
+    FaultPhotoUpload.objects.filter(
+        pk__in=[upload.pk for upload in expired]
+    ).delete()
+    return {"rows_scanned": len(expired), "rows_written": len(expired)}
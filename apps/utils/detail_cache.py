@@ -0,0 +1,199 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from apps.utils.sparse_fields import SparseFieldsMixin
+
+STATS_KEYS = ("hits", "misses")
+
+
+def get_cache():
+    return caches[settings.DETAIL_CACHE_ALIAS]
+
+
+def is_shared(cache):
+    """
+    Invalidations are made by whichever process changed the rows (web
+    workers, background workers), so a per-process cache would keep
+    serving stale payloads; without a shared backend nothing is cached.
+    """
+    return not isinstance(cache, LocMemCache)
+
+
+def cache_label(model):
+    """
+    Label shared by a model and its multi-table children, so every
+    equipment type is versioned under ``equipment.equipment``.
+    """
+    parents = model._meta.get_parent_list()
+    return (parents[-1] if parents else model)._meta.label_lower
+
+
+def version_key(label, pk):
+    return f"detail:version:{label}:{pk}"
+
+
+def record_key(label, pk):
+    return f"detail:record:{label}:{pk}"
+
+
+def payload_key(label, pk, variant, tokens):
+    digest = hashlib.sha1(
+        "|".join([variant, *tokens]).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"detail:payload:{label}:{pk}:{digest}"
+
+
+def stats_key(label, name):
+    return f"detail:stats:{label}:{name}"
+
+
+def count(cache, label, name):
+    key = stats_key(label, name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_tokens(cache, objects):
+    """Current version token of every ``(label, pk)``, created if missing"""
+    keys = [version_key(label, pk) for label, pk in objects]
+    tokens = cache.get_many(keys)
+    missing = [key for key in keys if key not in tokens]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, settings.DETAIL_CACHE_TIMEOUT)
+        tokens.update(cache.get_many(missing))
+    return [tokens.get(key, "") for key in keys]
+
+
+def get_or_build(model, pk, variant, build):
+    """
+    Serialized detail payload of ``model`` ``pk`` from the cache.
+
+    ``build()`` returns ``(data, dependencies)`` where dependencies are
+    ``(model, pk)`` pairs of related rows rendered into the payload. The
+    payload is stored under the version tokens of the object and its
+    dependencies, so deleting any of those tokens (``invalidate``)
+    retires it. ``variant`` separates payloads that differ per request
+    (absolute URLs). Tokens are shared by the model's parent chain, while
+    the record and payload are kept per concrete model: a child detail
+    URL asked for another child's pk must not get that child's payload.
+    """
+    cache = get_cache()
+    if not is_shared(cache):
+        return build()[0]
+    label = cache_label(model)
+    kind = model._meta.label_lower
+    record = cache.get(record_key(kind, pk))
+    if record is not None:
+        objects = [(label, pk), *record]
+        tokens = cache.get_many([version_key(*obj) for obj in objects])
+        if len(tokens) == len(objects):
+            data = cache.get(
+                payload_key(
+                    kind,
+                    pk,
+                    variant,
+                    [tokens[version_key(*obj)] for obj in objects],
+                )
+            )
+            if data is not None:
+                count(cache, label, "hits")
+                return data
+    count(cache, label, "misses")
+
+    # The own token is taken before reading the row: a concurrent
+    # invalidation then retires the payload written below
+    (token,) = get_tokens(cache, [(label, pk)])
+    data, dependencies = build()
+    dependencies = sorted(
+        {
+            (cache_label(dep_model), dep_pk)
+            for dep_model, dep_pk in dependencies
+            if dep_pk is not None
+        }
+    )
+    tokens = [token, *get_tokens(cache, dependencies)]
+    cache.set_many(
+        {
+            record_key(kind, pk): dependencies,
+            payload_key(kind, pk, variant, tokens): data,
+        },
+        settings.DETAIL_CACHE_TIMEOUT,
+    )
+    return data
+
+
+def invalidate(model, pks):
+    """Retire cached payloads that include the given rows (after commit)"""
+    invalidate_versions(cache_label(model), pks)
+
+
+def invalidate_versions(label, pks):
+    """Delete the version tokens of ``label`` ``pks`` after commit"""
+    keys = [version_key(label, pk) for pk in set(pks) if pk is not None]
+    if keys and is_shared(get_cache()):
+        transaction.on_commit(lambda: get_cache().delete_many(keys))
+
+
+def get_stats(models):
+    """Hit/miss counters of the given models' detail payloads"""
+    cache = get_cache()
+    labels = [cache_label(model) for model in models]
+    values = cache.get_many(
+        [stats_key(label, name) for label in labels for name in STATS_KEYS]
+    )
+    stats = {}
+    for label in labels:
+        counters = {
+            name: values.get(stats_key(label, name), 0) for name in STATS_KEYS
+        }
+        total = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = (
+            round(counters["hits"] / total, 4) if total else None
+        )
+        stats[label] = counters
+    return stats
+
+
+def reset_stats(models):
+    get_cache().delete_many(
+        [
+            stats_key(cache_label(model), name)
+            for model in models
+            for name in STATS_KEYS
+        ]
+    )
+
+
+class CachedDetailMixin(SparseFieldsMixin):
+    """
+    Detail view whose ``GET`` payload comes from the detail cache.
+    ``get_cache_dependencies()`` lists the related rows in the payload.
+    ``?fields=`` / ``?exclude=`` trim the cached payload.
+    """
+
+    def get_cache_dependencies(self, instance):
+        return []
+
+    def get_cached_data(self):
+        def build():
+            instance = self.get_object()
+            data = self.get_serializer(instance).data
+            return data, self.get_cache_dependencies(instance)
+
+        return self.sparse(
+            get_or_build(
+                self.queryset.model,
+                self.kwargs["pk"],
+                self.request.build_absolute_uri("/"),
+                build,
+            )
+        )
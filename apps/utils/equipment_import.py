@@ -0,0 +1,185 @@
+import csv
+import io
+import os
+from datetime import datetime
+
+import openpyxl
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from apps.equipment.api.serializers import EquipmentPolymorphicSerializer
+from apps.equipment.models import EQUIPMENT_TYPE_MODELS, Equipment, QRCodeJob
+from apps.users.models import User
+
+IMPORT_BATCH_SIZE = 500
+RESPONSIBLE_PERSON_COLUMN = "responsible_person"
+
+
+def read_csv_rows(file):
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        text.detach()
+
+
+def read_xlsx_rows(file):
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [
+            str(value).strip() if value is not None else ""
+            for value in next(rows, [])
+        ]
+        for values in rows:
+            # Date-formatted cells are read as datetimes
+            yield {
+                key: value.date() if isinstance(value, datetime) else value
+                for key, value in zip(header, values)
+            }
+    finally:
+        workbook.close()
+
+
+def read_rows(file, filename):
+    """
+    Stream rows of a CSV/XLSX file as dicts keyed by the header row.
+    Empty cells are dropped so model defaults apply.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        rows = read_csv_rows(file)
+    elif extension == ".xlsx":
+        rows = read_xlsx_rows(file)
+    else:
+        raise ValidationError(
+            {"file": _("Faqat CSV yoki XLSX fayllar qabul qilinadi")}
+        )
+
+    for row in rows:
+        cleaned = {}
+        for key, value in row.items():
+            if not key:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            if value in ("", None):
+                continue
+            cleaned[key.strip()] = value
+        yield cleaned
+
+
+class EquipmentImporter:
+    """
+    Bulk-insert equipment of one type from an iterable of rows.
+
+    Rows are validated with the type's model serializer (one serializer
+    instance for the whole file). Every batch costs one user lookup, one
+    ``INSERT`` into ``Equipment`` and one into the child table. QR codes
+    are deferred to the background worker.
+    """
+
+    def __init__(self, equipment_type, author=None, batch_size=None):
+        if equipment_type not in EQUIPMENT_TYPE_MODELS:
+            raise ValidationError(
+                {"type": _("Noma'lum uskuna turi: %s") % equipment_type}
+            )
+        self.equipment_type = equipment_type
+        self.model = EQUIPMENT_TYPE_MODELS[equipment_type]
+        self.author = author
+        self.batch_size = batch_size or IMPORT_BATCH_SIZE
+        self.serializer = EquipmentPolymorphicSerializer.type_map[
+            equipment_type
+        ]()
+        # Resolved per batch instead of one query per row
+        self.serializer.fields.pop("responsible_person_id", None)
+        self.created = 0
+        self.errors = []
+
+    def run(self, rows):
+        batch = []
+        for row_number, row in enumerate(rows, start=2):
+            person = row.pop(RESPONSIBLE_PERSON_COLUMN, None)
+            errors = {}
+            try:
+                validated_data = self.serializer.run_validation(row)
+            except ValidationError as e:
+                errors = dict(e.detail)
+            # Required like responsible_person_id of the equipment API
+            if not person:
+                errors[RESPONSIBLE_PERSON_COLUMN] = [
+                    _("Bu maydon to'ldirilishi shart.")
+                ]
+            if errors:
+                self.errors.append({"row": row_number, "errors": errors})
+                continue
+            batch.append((row_number, validated_data, person))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        return {"created": self.created, "errors": self.errors}
+
+    def resolve_responsible_persons(self, batch):
+        keys = {str(person) for _row, _data, person in batch}
+        users = {}
+        for pk, username, jshshir in User.objects.filter(
+            Q(username__in=keys) | Q(jshshir__in=keys)
+        ).values_list("pk", "username", "jshshir"):
+            users[username] = pk
+            users[jshshir] = pk
+        return users
+
+    def flush(self, batch):
+        users = self.resolve_responsible_persons(batch)
+        instances = []
+        for row_number, validated_data, person in batch:
+            instance = self.model(**validated_data)
+            if str(person) not in users:
+                self.errors.append(
+                    {
+                        "row": row_number,
+                        "errors": {
+                            RESPONSIBLE_PERSON_COLUMN: [
+                                _("Foydalanuvchi topilmadi: %s") % person
+                            ]
+                        },
+                    }
+                )
+                continue
+            instance.responsible_person_id = users[str(person)]
+            instance.type = self.model.AUTO_TYPE
+            instance.author = self.author
+            instance.update_geohash()
+            instance.prepare_qr_status()
+            instances.append(instance)
+        if not instances:
+            return
+
+        with transaction.atomic():
+            parents = Equipment.objects.bulk_create(
+                [Equipment(type=instance.type) for instance in instances]
+            )
+            for instance, parent in zip(instances, parents):
+                instance.id = instance.equipment_ptr_id = parent.pk
+                instance._state.adding = False
+            # bulk_create() rejects multi-table inheritance, so the child
+            # rows are inserted directly into the child table
+            self.model._base_manager._insert(
+                instances,
+                fields=self.model._meta.local_concrete_fields,
+                using=self.model._base_manager.db,
+            )
+            if settings.QR_CODE_STORE_FILES:
+                QRCodeJob.objects.enqueue(instances)
+        self.created += len(instances)
+
+
+def import_equipment(file, filename, equipment_type, author=None):
+    """Import a CSV/XLSX file and return created count and row errors"""
+    importer = EquipmentImporter(equipment_type, author=author)
+    return importer.run(read_rows(file, filename))
@@ -0,0 +1,215 @@
+import math
+
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Q, Sum
+from django.db.models.functions import Substr
+
+from apps.equipment.models import EQUIPMENT_TYPE_MODELS
+from apps.utils import geohash
+
+# Zoom level from which individual points are returned instead of clusters
+POINT_ZOOM = 15
+MAX_POINTS = 2000
+NEAREST_LIMIT = 10
+NEAREST_MAX_LIMIT = 100
+# Coarsest search block (~156 km cells): the last step is sorted in SQL
+NEAREST_MIN_PRECISION = 3
+# (max zoom, geohash precision of the cluster cells)
+CLUSTER_PRECISIONS = [(2, 1), (5, 2), (7, 3), (10, 4), (12, 5), (14, 6)]
+CONDITIONS = ["working", "faulty"]
+POINT_FIELDS = [
+    "equipment_ptr_id",
+    "detail_name",
+    "latitude",
+    "longitude",
+    "technical_condition",
+]
+
+
+def cluster_precision(zoom):
+    for max_zoom, precision in CLUSTER_PRECISIONS:
+        if zoom <= max_zoom:
+            return precision
+    return CLUSTER_PRECISIONS[-1][1]
+
+
+def prefix_condition(cells):
+    condition = Q()
+    for cell in cells:
+        condition |= Q(geohash__startswith=cell)
+    return condition
+
+
+def located_equipment(model, cells, bbox=None):
+    """Rows of one equipment table inside the geohash cells (index scan)"""
+    queryset = model.objects.filter(prefix_condition(cells))
+    if bbox:
+        min_lat, min_lon, max_lat, max_lon = bbox
+        queryset = queryset.filter(
+            latitude__gte=min_lat,
+            latitude__lte=max_lat,
+            longitude__gte=min_lon,
+            longitude__lte=max_lon,
+        )
+    return queryset.order_by()
+
+
+def point(equipment_type, row):
+    return {
+        "id": row["equipment_ptr_id"],
+        "type": equipment_type,
+        "name": row["detail_name"],
+        "latitude": float(row["latitude"]),
+        "longitude": float(row["longitude"]),
+        "technical_condition": row["technical_condition"],
+    }
+
+
+def viewport_points(cells, bbox):
+    points = []
+    for equipment_type, model in EQUIPMENT_TYPE_MODELS.items():
+        rows = located_equipment(model, cells, bbox).values(*POINT_FIELDS)
+        points.extend(
+            point(equipment_type, row)
+            for row in rows[: MAX_POINTS - len(points) + 1]
+        )
+        if len(points) > MAX_POINTS:
+            break
+    return {
+        "mode": "points",
+        "truncated": len(points) > MAX_POINTS,
+        "items": points[:MAX_POINTS],
+    }
+
+
+def viewport_clusters(cells, bbox, precision):
+    clusters = {}
+    for equipment_type, model in EQUIPMENT_TYPE_MODELS.items():
+        rows = (
+            located_equipment(model, cells, bbox)
+            .annotate(cell=Substr("geohash", 1, precision))
+            .values("cell")
+            .annotate(
+                count=Count("pk"),
+                latitude_sum=Sum("latitude"),
+                longitude_sum=Sum("longitude"),
+                **{
+                    condition: Count(
+                        "pk", filter=Q(technical_condition=condition)
+                    )
+                    for condition in CONDITIONS
+                },
+            )
+        )
+        for row in rows:
+            cluster = clusters.setdefault(
+                row["cell"],
+                {
+                    "count": 0,
+                    "latitude_sum": 0.0,
+                    "longitude_sum": 0.0,
+                    "types": {},
+                    "conditions": dict.fromkeys(CONDITIONS, 0),
+                },
+            )
+            cluster["count"] += row["count"]
+            cluster["latitude_sum"] += float(row["latitude_sum"])
+            cluster["longitude_sum"] += float(row["longitude_sum"])
+            cluster["types"][equipment_type] = row["count"]
+            for condition in CONDITIONS:
+                cluster["conditions"][condition] += row[condition]
+
+    items = [
+        {
+            "geohash": cell,
+            "count": cluster["count"],
+            "latitude": cluster["latitude_sum"] / cluster["count"],
+            "longitude": cluster["longitude_sum"] / cluster["count"],
+            "types": cluster["types"],
+            "conditions": cluster["conditions"],
+        }
+        for cell, cluster in sorted(clusters.items())
+    ]
+    return {"mode": "clusters", "precision": precision, "items": items}
+
+
+def viewport(min_lat, min_lon, max_lat, max_lon, zoom):
+    """
+    Equipment inside a bounding box: individual points from ``POINT_ZOOM``
+    on, otherwise clusters per geohash cell with counts per type and
+    technical condition. Constant number of queries (one per type).
+    """
+    bbox = (min_lat, min_lon, max_lat, max_lon)
+    if zoom >= POINT_ZOOM:
+        return viewport_points(geohash.cover(*bbox), bbox)
+    precision = cluster_precision(zoom)
+    cells = geohash.cover(*bbox)
+    # Cover with cells no finer than the clusters to keep the scan simple
+    if len(next(iter(cells))) > precision:
+        cells = {cell[:precision] for cell in cells}
+    return viewport_clusters(cells, bbox, precision)
+
+
+def nearby_rows(model, cells, latitude, longitude, limit=None):
+    """
+    Point rows of one table inside the cells; with ``limit``, only the
+    closest ones by equirectangular distance, sorted and cut in SQL.
+    """
+    queryset = located_equipment(model, cells)
+    if limit is not None:
+        scale = math.cos(math.radians(latitude))
+        queryset = queryset.alias(
+            distance=ExpressionWrapper(
+                (F("latitude") - latitude) * (F("latitude") - latitude)
+                + (F("longitude") - longitude)
+                * (F("longitude") - longitude)
+                * scale
+                * scale,
+                output_field=FloatField(),
+            )
+        ).order_by("distance")[:limit]
+    return queryset.values(*POINT_FIELDS)
+
+
+def nearest(latitude, longitude, limit=NEAREST_LIMIT):
+    """
+    ``limit`` equipment closest to a point. Searches the 3x3 block of
+    geohash cells around it, widening the precision until enough rows
+    lie within the radius that the block is guaranteed to contain. The
+    widening stops at ``NEAREST_MIN_PRECISION``, where each table returns
+    only its ``limit`` closest rows instead of the whole block.
+    """
+    candidates = []
+    for precision in range(
+        geohash.GEOHASH_PRECISION - 4, NEAREST_MIN_PRECISION - 1, -1
+    ):
+        cells = geohash.neighbours(latitude, longitude, precision)
+        last = precision == NEAREST_MIN_PRECISION
+        candidates = []
+        for equipment_type, model in EQUIPMENT_TYPE_MODELS.items():
+            rows = nearby_rows(
+                model, cells, latitude, longitude, limit if last else None
+            )
+            for row in rows:
+                item = point(equipment_type, row)
+                item["distance_km"] = geohash.distance_km(
+                    latitude, longitude, item["latitude"], item["longitude"]
+                )
+                candidates.append(item)
+
+        height, width = geohash.cell_size(precision)
+        radius_km = min(
+            geohash.distance_km(
+                latitude, longitude, latitude + height, longitude
+            ),
+            geohash.distance_km(
+                latitude, longitude, latitude, longitude + width
+            ),
+        )
+        if (
+            sum(item["distance_km"] <= radius_km for item in candidates)
+            >= limit
+        ):
+            break
+
+    candidates.sort(key=lambda item: item["distance_km"])
+    return candidates[:limit]
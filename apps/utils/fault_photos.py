@@ -0,0 +1,88 @@
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.core.models import ImageRendition
+from apps.maintenance.models import EquipmentFault
+
+logger = logging.getLogger(__name__)
+
+FAULT_PHOTO_MAX_SIZE = (800, 600)
+FAULT_PHOTO_QUALITY = 85
+
+
+def convert_fault_photo(file):
+    """
+    The uploaded photo as a JPEG within ``FAULT_PHOTO_MAX_SIZE``, turned
+    upright from its EXIF orientation. Re-encoding drops the EXIF data.
+    """
+    with Image.open(file) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail(FAULT_PHOTO_MAX_SIZE, Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        image.save(
+            buffer, format="JPEG", quality=FAULT_PHOTO_QUALITY, optimize=True
+        )
+    return buffer.getvalue()
+
+
+def delete_originals(names):
+    storage = EquipmentFault._meta.get_field("photo").storage
+    for name in names:
+        storage.delete(name)
+
+
+def process_fault_photos(batch_size=20):
+    """
+    Resize and re-encode the photos of a batch of faults reported with
+    ``photo_status`` pending. Faults are claimed with ``SKIP LOCKED``, the
+    JPEG is stored under a new name, the upload is deleted and the rows
+    are written back with one ``bulk_update``. Returns the job stats.
+    """
+    with transaction.atomic():
+        faults = list(
+            EquipmentFault.objects.select_for_update(skip_locked=True)
+            .filter(photo_status=EquipmentFault.PHOTO_STATUS_PENDING)
+            .only("pk", "title", "photo")
+            .order_by("id")[:batch_size]
+        )
+        if not faults:
+            return {"rows_scanned": 0}
+
+        now = timezone.now()
+        originals = []
+        for fault in faults:
+            fault.updated_at = now
+            try:
+                with fault.photo.open("rb") as file:
+                    content = convert_fault_photo(file)
+            except Exception as e:
+                logger.exception("Fault %s photo failed", fault.pk)
+                fault.photo_status = EquipmentFault.PHOTO_STATUS_FAILED
+                fault.photo_error = str(e)
+                continue
+            original = fault.photo.name
+            name = os.path.splitext(os.path.basename(original))[0]
+            fault.photo.save(f"{name}.jpg", ContentFile(content), save=False)
+            fault.photo_status = EquipmentFault.PHOTO_STATUS_READY
+            fault.photo_error = ""
+            originals.append(original)
+
+        EquipmentFault.objects.bulk_update(
+            faults, ["photo", "photo_status", "photo_error", "updated_at"]
+        )
+        # Rendered from the processed photo, the upload is deleted below
+        ImageRendition.objects.enqueue(
+            fault.photo.name
+            for fault in faults
+            if fault.photo_status == EquipmentFault.PHOTO_STATUS_READY
+        )
+        transaction.on_commit(lambda: delete_originals(originals))
+    return {"rows_scanned": len(faults), "rows_written": len(originals)}
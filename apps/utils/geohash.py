@@ -0,0 +1,103 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash of a point (latitude/longitude in degrees)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    latitude = float(latitude)
+    longitude = float(longitude)
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        value, value_range = (
+            (longitude, lon_range) if even else (latitude, lat_range)
+        )
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            value_range[0] = middle
+        else:
+            bits = bits * 2
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(geohash)
+
+
+def cell_size(precision):
+    """(height, width) of a geohash cell in degrees"""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def wrap_longitude(longitude):
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def clamp_latitude(latitude):
+    return max(-90.0, min(90.0, latitude))
+
+
+def neighbours(latitude, longitude, precision):
+    """The cell containing the point and its eight neighbours"""
+    height, width = cell_size(precision)
+    return {
+        encode(
+            clamp_latitude(latitude + dy * height),
+            wrap_longitude(longitude + dx * width),
+            precision,
+        )
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+    }
+
+
+def cover(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """
+    Smallest set of equal-precision geohash prefixes covering a bounding
+    box, using the finest precision that needs at most ``max_cells``.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        columns = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * columns <= max_cells:
+            break
+
+    cells = set()
+    latitude = min_lat
+    while True:
+        longitude = min_lon
+        while True:
+            cells.add(encode(latitude, longitude, precision))
+            if longitude >= max_lon:
+                break
+            longitude = min(longitude + width, max_lon)
+        if latitude >= max_lat:
+            break
+        latitude = min(latitude + height, max_lat)
+    return cells
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance in kilometres"""
+    lat1, lon1, lat2, lon2 = map(
+        math.radians, map(float, (lat1, lon1, lat2, lon2))
+    )
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,242 @@
+import hashlib
+import logging
+from io import BytesIO
+from itertools import groupby, islice
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.companies.models import Company
+from apps.core.models import RENDITION_DIR, ImageRendition
+from apps.equipment.models import EQUIPMENT_TYPE_MODELS, Equipment
+from apps.maintenance.models import EquipmentFault
+from apps.users.models import User
+from apps.utils import detail_cache
+
+logger = logging.getLogger(__name__)
+
+# Image fields whose uploads get renditions
+IMAGE_FIELDS = [
+    (User, "image"),
+    (Company, "logo"),
+    (EquipmentFault, "photo"),
+    *((model, "image") for model in EQUIPMENT_TYPE_MODELS.values()),
+]
+ENCODER_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {
+        "format": "JPEG",
+        "quality": 82,
+        "optimize": True,
+        "progressive": True,
+    },
+}
+LOOKUP_BATCH_SIZE = 2000
+
+
+def rendition_name(rendition):
+    """
+    Grouped by source; the row's pk keeps the name unique even when a
+    deleted source's name is reused, so a URL never changes content.
+    """
+    digest = hashlib.sha1(rendition.source.encode()).hexdigest()
+    return (
+        f"{digest[:2]}/{digest}/"
+        f"{rendition.rendition}-{rendition.pk}.{rendition.image_format}"
+    )
+
+
+def flatten(image, image_format):
+    """WebP keeps transparency; JPEG gets a white background"""
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        if image_format == "webp":
+            return image
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB") if image.mode != "RGB" else image
+
+
+def render_renditions(source, renditions, now):
+    """Encode ``renditions`` (rows of one ``source``) from one decode"""
+    with default_storage.open(source, "rb") as file, Image.open(
+        file
+    ) as original:
+        original = ImageOps.exif_transpose(original)
+        original.load()
+    for rendition in renditions:
+        image = original.copy()
+        image.thumbnail(
+            ImageRendition.RENDITIONS[rendition.rendition],
+            Image.Resampling.LANCZOS,
+        )
+        image = flatten(image, rendition.image_format)
+        buffer = BytesIO()
+        image.save(buffer, **ENCODER_OPTIONS[rendition.image_format])
+        rendition.file.save(
+            rendition_name(rendition),
+            ContentFile(buffer.getvalue()),
+            save=False,
+        )
+        rendition.width, rendition.height = image.size
+        rendition.size = buffer.tell()
+        rendition.status = ImageRendition.STATUS_READY
+        rendition.error = ""
+        rendition.rendered_at = now
+
+
+def process_image_renditions(batch_size=60):
+    """
+    Render a batch of pending ``ImageRendition`` rows. Rows are claimed
+    with ``SKIP LOCKED``; each source image is decoded once for all of
+    its renditions and the rows are written back with one
+    ``bulk_update``. Returns the job stats.
+    """
+    with transaction.atomic():
+        renditions = list(
+            ImageRendition.objects.select_for_update(skip_locked=True)
+            .filter(status=ImageRendition.STATUS_PENDING)
+            .order_by("id")[:batch_size]
+        )
+        if not renditions:
+            return {"rows_scanned": 0}
+
+        now = timezone.now()
+        for source, group in groupby(
+            sorted(renditions, key=lambda rendition: rendition.source),
+            key=lambda rendition: rendition.source,
+        ):
+            group = list(group)
+            try:
+                render_renditions(source, group, now)
+            except Exception as e:
+                logger.exception("Renditions of %s failed", source)
+                for rendition in group:
+                    rendition.status = ImageRendition.STATUS_FAILED
+                    rendition.error = str(e)
+                    rendition.rendered_at = now
+
+        ImageRendition.objects.bulk_update(
+            renditions,
+            [
+                "file",
+                "width",
+                "height",
+                "size",
+                "status",
+                "error",
+                "rendered_at",
+            ],
+        )
+        ready = {
+            rendition.source
+            for rendition in renditions
+            if rendition.status == ImageRendition.STATUS_READY
+        }
+        invalidate_equipment_details(ready)
+    return {
+        "rows_scanned": len(renditions),
+        "rows_written": sum(
+            rendition.status == ImageRendition.STATUS_READY
+            for rendition in renditions
+        ),
+    }
+
+
+def invalidate_equipment_details(sources):
+    """Cached equipment payloads render the renditions of their image"""
+    if not sources:
+        return
+    for model in EQUIPMENT_TYPE_MODELS.values():
+        detail_cache.invalidate(
+            Equipment,
+            list(
+                model.objects.filter(image__in=sources).values_list(
+                    "pk", flat=True
+                )
+            ),
+        )
+
+
+def prune_image_renditions():
+    """
+    Delete the renditions, and their files, of images that were replaced
+    or deleted since they were rendered.
+    """
+    sources = iter(
+        ImageRendition.objects.values_list("source", flat=True)
+        .distinct()
+        .order_by("source")
+        .iterator()
+    )
+    deleted = 0
+    while True:
+        chunk = set(islice(sources, LOOKUP_BATCH_SIZE))
+        if not chunk:
+            return {"rows_written": deleted}
+        for model, field_name in IMAGE_FIELDS:
+            chunk -= set(
+                model.objects.filter(
+                    **{f"{field_name}__in": chunk}
+                ).values_list(field_name, flat=True)
+            )
+        stale = ImageRendition.objects.filter(source__in=chunk)
+        files = list(stale.exclude(file="").values_list("file", flat=True))
+        deleted += stale.delete()[0]
+        for name in files:
+            default_storage.delete(name)
+
+
+# Serializer output
+# -----------------------------------------------------------------------------------------
+def rendition_url_prefix():
+    return reverse("image-rendition", kwargs={"name": "x"})[:-1]
+
+
+def rendition_url(prefix, name):
+    """``ImageRenditionAPIView`` URL of a stored rendition file"""
+    return f"{prefix}{name.removeprefix(RENDITION_DIR)}"
+
+
+def render_renditions_data(renditions):
+    """
+    ``{source: {rendition: {"width", "height", format: url}}}`` of the
+    ready rows in ``renditions``
+    """
+    prefix = rendition_url_prefix()
+    data = {}
+    for source, rendition, image_format, name, width, height in renditions:
+        entry = data.setdefault(source, {}).setdefault(
+            rendition, {"width": width, "height": height}
+        )
+        entry[image_format] = rendition_url(prefix, name)
+    return data
+
+
+def get_renditions(names):
+    """Rendition data of the stored images ``names`` in one query"""
+    names = set(names) - {None, ""}
+    if not names:
+        return {}
+    return render_renditions_data(
+        ImageRendition.objects.for_sources(names)
+        .order_by("source", "rendition", "image_format")
+        .values_list(
+            "source", "rendition", "image_format", "file", "width", "height"
+        )
+    )
+
+
+class RenditionValues:
+    """``ValuesSerializer`` renderer of a ``RenditionsField`` column"""
+
+    def render_pks(self, names):
+        return get_renditions(names)
+
+
+rendition_values = RenditionValues()
@@ -0,0 +1,293 @@
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import (
+    Avg,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Min,
+    Q,
+    Sum,
+)
+from django.utils import timezone
+
+from apps.core.models import ImageRendition, JobRun
+from apps.maintenance.models import (
+    EquipmentFault,
+    MaintenanceSchedule,
+    OutboxEvent,
+    TelegramMessage,
+)
+
+# Aggregates cover the runs started in this window
+STATS_WINDOW = timedelta(hours=24)
+DURATION = ExpressionWrapper(
+    F("finished_at") - F("started_at"), output_field=DurationField()
+)
+
+
+@contextmanager
+def track_run(job, keep_idle=True):
+    """
+    Record a ``JobRun`` around the block, which adds its counters with
+    ``run.add(stats)``. Polling workers pass ``keep_idle=False``: a batch
+    that found nothing to do is not stored unless it failed.
+    """
+    run = JobRun(job=job, started_at=timezone.now())
+    if keep_idle:
+        run.save()
+    try:
+        yield run
+    except Exception:
+        run.status = JobRun.STATUS_FAILED
+        run.error = traceback.format_exc()
+        raise
+    else:
+        run.status = JobRun.STATUS_SUCCEEDED
+    finally:
+        run.finished_at = timezone.now()
+        if (
+            run.pk is not None
+            or run.status == JobRun.STATUS_FAILED
+            or run.has_work()
+        ):
+            run.save()
+
+
+def record_skipped(job, reason):
+    now = timezone.now()
+    return JobRun.objects.create(
+        job=job,
+        status=JobRun.STATUS_SKIPPED,
+        started_at=now,
+        finished_at=now,
+        error=reason,
+    )
+
+
+def prune_job_runs(now=None):
+    """Delete runs older than ``JOB_RUN_RETENTION_DAYS``"""
+    now = now or timezone.now()
+    deleted, _by_model = JobRun.objects.filter(
+        started_at__lt=now - timedelta(days=settings.JOB_RUN_RETENTION_DAYS)
+    ).delete()
+    return {"rows_written": deleted}
+
+
+# Aggregates
+# -----------------------------------------------------------------------------------------
+def job_stats(intervals, now=None):
+    """
+    Per job: the run counts, durations and counters of the last
+    ``STATS_WINDOW``, the latest run and, for periodic jobs in
+    ``intervals`` (``{job: timedelta}``), the lag behind their schedule.
+    """
+    now = now or timezone.now()
+    finished = Q(finished_at__isnull=False) & ~Q(status=JobRun.STATUS_SKIPPED)
+    stats = {
+        row["job"]: row
+        for row in JobRun.objects.filter(started_at__gte=now - STATS_WINDOW)
+        .values("job")
+        .annotate(
+            runs=Count("id"),
+            failed=Count("id", filter=Q(status=JobRun.STATUS_FAILED)),
+            skipped=Count("id", filter=Q(status=JobRun.STATUS_SKIPPED)),
+            duration_avg=Avg(DURATION, filter=finished),
+            duration_max=Max(DURATION, filter=finished),
+            **{counter: Sum(counter) for counter in JobRun.COUNTERS},
+        )
+        .order_by()
+    }
+    last_runs = JobRun.objects.filter(
+        pk__in=JobRun.objects.values("job")
+        .annotate(last_id=Max("id"))
+        .values("last_id")
+    )
+    last_successes = dict(
+        JobRun.objects.filter(status=JobRun.STATUS_SUCCEEDED)
+        .values("job")
+        .annotate(last=Max("started_at"))
+        .values_list("job", "last")
+    )
+
+    jobs = {}
+    for run in last_runs:
+        window = stats.get(run.job, {})
+        lag = None
+        if run.job in intervals and run.job in last_successes:
+            due_at = last_successes[run.job] + intervals[run.job]
+            lag = max((now - due_at).total_seconds(), 0)
+        jobs[run.job] = {
+            "runs": window.get("runs", 0),
+            "failed": window.get("failed", 0),
+            "skipped": window.get("skipped", 0),
+            "duration_avg": seconds(window.get("duration_avg")),
+            "duration_max": seconds(window.get("duration_max")),
+            **{
+                counter: window.get(counter) or 0
+                for counter in JobRun.COUNTERS
+            },
+            "last_run": {
+                "status": run.status,
+                "started_at": run.started_at,
+                "duration": run.duration,
+                "error": run.error,
+                **{
+                    counter: getattr(run, counter)
+                    for counter in JobRun.COUNTERS
+                },
+            },
+            "last_success_at": last_successes.get(run.job),
+            "lag": lag,
+        }
+    return jobs
+
+
+def seconds(duration):
+    return duration.total_seconds() if duration is not None else None
+
+
+def queue_stats(now=None):
+    """Backlog and age of the oldest due item of each worker queue"""
+    now = now or timezone.now()
+    queues = {
+        "warning_timer": MaintenanceSchedule.objects.filter(
+            next_warning_at__lte=now
+        ).aggregate(depth=Count("id"), oldest=Min("next_warning_at")),
+        "outbox": OutboxEvent.objects.filter(
+            processed_at__isnull=True,
+            attempts__lt=OutboxEvent.MAX_ATTEMPTS,
+        ).aggregate(depth=Count("id"), oldest=Min("created_at")),
+        "telegram": TelegramMessage.objects.filter(
+            status=TelegramMessage.STATUS_PENDING, next_attempt_at__lte=now
+        ).aggregate(depth=Count("id"), oldest=Min("next_attempt_at")),
+        "fault_photos": EquipmentFault.objects.filter(
+            photo_status=EquipmentFault.PHOTO_STATUS_PENDING
+        ).aggregate(depth=Count("id"), oldest=Min("created_at")),
+        "image_renditions": ImageRendition.objects.filter(
+            status=ImageRendition.STATUS_PENDING
+        ).aggregate(depth=Count("id"), oldest=Min("created_at")),
+    }
+    return {
+        name: {
+            "depth": queue["depth"],
+            "lag": (
+                (now - queue["oldest"]).total_seconds()
+                if queue["oldest"]
+                else 0
+            ),
+        }
+        for name, queue in queues.items()
+    }
+
+
+# Prometheus text format
+# -----------------------------------------------------------------------------------------
+METRICS = [
+    # (name, type, help, value of a job_stats() entry)
+    (
+        "job_runs",
+        "gauge",
+        "Runs started in the last 24 hours",
+        lambda job: job["runs"],
+    ),
+    (
+        "job_failed_runs",
+        "gauge",
+        "Failed runs in the last 24 hours",
+        lambda job: job["failed"],
+    ),
+    (
+        "job_skipped_runs",
+        "gauge",
+        "Skipped runs in the last 24 hours",
+        lambda job: job["skipped"],
+    ),
+    (
+        "job_duration_seconds_avg",
+        "gauge",
+        "Average run duration in the last 24 hours",
+        lambda job: job["duration_avg"],
+    ),
+    (
+        "job_duration_seconds_max",
+        "gauge",
+        "Longest run duration in the last 24 hours",
+        lambda job: job["duration_max"],
+    ),
+    *(
+        (
+            f"job_{counter}",
+            "gauge",
+            f"{counter.replace('_', ' ').capitalize()} in the last 24 hours",
+            lambda job, counter=counter: job[counter],
+        )
+        for counter in JobRun.COUNTERS
+    ),
+    (
+        "job_last_run_duration_seconds",
+        "gauge",
+        "Duration of the latest run",
+        lambda job: job["last_run"]["duration"],
+    ),
+    (
+        "job_last_run_failed",
+        "gauge",
+        "1 if the latest run failed",
+        lambda job: int(job["last_run"]["status"] == JobRun.STATUS_FAILED),
+    ),
+    (
+        "job_last_success_timestamp_seconds",
+        "gauge",
+        "Start of the latest successful run",
+        lambda job: (
+            job["last_success_at"].timestamp()
+            if job["last_success_at"]
+            else None
+        ),
+    ),
+    (
+        "job_lag_seconds",
+        "gauge",
+        "How far a periodic job is behind its interval",
+        lambda job: job["lag"],
+    ),
+]
+
+
+def escape_label(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def render_metrics(intervals, now=None):
+    now = now or timezone.now()
+    jobs = job_stats(intervals, now)
+    lines = []
+    for name, metric_type, help_text, value in METRICS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        for job, stats in sorted(jobs.items()):
+            sample = value(stats)
+            if sample is not None:
+                lines.append(f'{name}{{job="{escape_label(job)}"}} {sample}')
+
+    queues = queue_stats(now)
+    for name, key, help_text in [
+        ("queue_depth", "depth", "Items due in a worker queue"),
+        ("queue_lag_seconds", "lag", "Age of the oldest due item"),
+    ]:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines.extend(
+            f'{name}{{queue="{queue}"}} {stats[key]}'
+            for queue, stats in queues.items()
+        )
+    return "\n".join(lines) + "\n"
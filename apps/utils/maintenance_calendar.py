@@ -0,0 +1,173 @@
+from datetime import timedelta
+
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.equipment.models import resolve_equipment_names
+from apps.maintenance.models import (
+    MaintenanceCalendarEntry,
+    MaintenanceRule,
+    MaintenanceSchedule,
+)
+
+CALENDAR_REBUILD_BATCH_SIZE = 2000
+CALENDAR_MAX_DAYS = 366
+BUCKETS = ["day", "week", "month"]
+ENTRY_FIELDS = [
+    "schedule_id",
+    "equipment_id",
+    "equipment_type",
+    "equipment_name",
+    "maintenance_type",
+    "due_date",
+    "assigned_to_id",
+    "assigned_to__name",
+    "rule_id",
+    "status",
+]
+
+
+def rebuild_calendar(batch_size=CALENDAR_REBUILD_BATCH_SIZE):
+    """
+    Refresh every calendar entry in ``pk`` batches: backfills the table
+    and repairs rows written without ``save()`` (``bulk_create``,
+    ``QuerySet.update``). Returns the job stats.
+    """
+    scanned = written = 0
+    last_pk = 0
+    while True:
+        schedule_ids = list(
+            MaintenanceSchedule.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not schedule_ids:
+            return {"rows_scanned": scanned, "rows_written": written}
+        scanned += len(schedule_ids)
+        written += len(MaintenanceCalendarEntry.objects.refresh(schedule_ids))
+        last_pk = schedule_ids[-1]
+
+
+def bucket_start(day, bucket):
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def entry(row, today):
+    status = row["status"]
+    if (
+        status == MaintenanceCalendarEntry.STATUS_PLANNED
+        and row["due_date"] < today
+    ):
+        status = "overdue"
+    return {
+        "schedule_id": row["schedule_id"],
+        "equipment": {
+            "id": row["equipment_id"],
+            "type": row["equipment_type"],
+            "name": row["equipment_name"],
+        },
+        "maintenance_type": row["maintenance_type"],
+        "due_date": row["due_date"],
+        "assigned_to": (
+            {"id": row["assigned_to_id"], "name": row["assigned_to__name"]}
+            if row["assigned_to_id"]
+            else None
+        ),
+        "rule_id": row["rule_id"],
+        "status": status,
+    }
+
+
+def rule_occurrences(company_id, start, end):
+    """
+    Calendar rows of the occurrences of a company's active rules that
+    are not stored yet: those after the last completed one that no
+    schedule materializes. They have no ``schedule_id``.
+    """
+    rules = list(
+        MaintenanceRule.objects.filter(
+            company_id=company_id, is_active=True, start_date__lte=end
+        )
+        .exclude(end_date__lt=start)
+        .select_related("equipment", "assigned_to")
+    )
+    if not rules:
+        return []
+    last_completed = dict(
+        MaintenanceSchedule.objects.filter(rule__in=rules, is_completed=True)
+        .values("rule_id")
+        .annotate(last=Max("occurrence_date"))
+        .values_list("rule_id", "last")
+    )
+    stored = set(
+        MaintenanceSchedule.objects.filter(
+            rule__in=rules, occurrence_date__range=(start, end)
+        ).values_list("rule_id", "occurrence_date")
+    )
+    names = resolve_equipment_names(
+        {rule.equipment_id: rule.equipment.type for rule in rules}
+    )
+
+    rows = []
+    for rule in rules:
+        first = start
+        if last_completed.get(rule.pk):
+            first = max(start, last_completed[rule.pk] + timedelta(days=1))
+        rows.extend(
+            {
+                "schedule_id": None,
+                "equipment_id": rule.equipment_id,
+                "equipment_type": rule.equipment.type,
+                "equipment_name": names[rule.equipment_id],
+                "maintenance_type": rule.maintenance_type,
+                "due_date": day,
+                "assigned_to_id": rule.assigned_to_id,
+                "assigned_to__name": (
+                    rule.assigned_to.name if rule.assigned_to else None
+                ),
+                "rule_id": rule.pk,
+                "status": MaintenanceCalendarEntry.STATUS_PLANNED,
+            }
+            for day in rule.occurrences(first, end)
+            if (rule.pk, day) not in stored
+        )
+    return rows
+
+
+def calendar(company_id, start, end, bucket="day"):
+    """
+    Entries of a company due between ``start`` and ``end`` (inclusive),
+    grouped into day, week (from Monday) or month buckets. Planned
+    entries past their date are reported as ``overdue``; users without a
+    company see none. Recurring rules are expanded for the range.
+    """
+    if company_id is None:
+        return {"start": start, "end": end, "bucket": bucket, "buckets": []}
+    rows = list(
+        MaintenanceCalendarEntry.objects.filter(
+            company_id=company_id, due_date__range=(start, end)
+        )
+        .order_by("due_date", "schedule_id")
+        .values(*ENTRY_FIELDS)
+    )
+    virtual = rule_occurrences(company_id, start, end)
+    if virtual:
+        rows = sorted(rows + virtual, key=lambda row: row["due_date"])
+    today = timezone.localdate()
+    buckets = {}
+    for row in rows:
+        items = buckets.setdefault(bucket_start(row["due_date"], bucket), [])
+        items.append(entry(row, today))
+    return {
+        "start": start,
+        "end": end,
+        "bucket": bucket,
+        "buckets": [
+            {"start": day, "count": len(items), "items": items}
+            for day, items in buckets.items()
+        ],
+    }
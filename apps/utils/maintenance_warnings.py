@@ -0,0 +1,178 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.equipment.models import resolve_equipment_names
+from apps.maintenance.models import (
+    MaintenanceSchedule,
+    MaintenanceWarning,
+    OutboxEvent,
+)
+from apps.utils.warning_digest import send_warning_digests
+
+WARNING_SWEEP_BATCH_SIZE = 2000
+WARNING_FIELDS = ["warning_time", "message", "updated_at"]
+
+
+def due_schedules(today):
+    """Open schedules due inside the warning window (partial index scan)"""
+    window_end = today + timedelta(days=MaintenanceWarning.WARNING_WINDOW_DAYS)
+    return (
+        MaintenanceSchedule.objects.filter(
+            is_completed=False, next_maintenance_date__lte=window_end
+        )
+        .order_by()
+        .values(
+            "pk",
+            "equipment_id",
+            "equipment__type",
+            "assigned_to_id",
+            "next_maintenance_date",
+        )
+    )
+
+
+def sweep_batch(schedules, today, now):
+    """
+    Refresh the live warning of each schedule: a pending one gets the
+    current days-left message, and a change of threshold supersedes the
+    live warning with a new row at the new level. Sent and acknowledged
+    messages are left as they were delivered.
+    """
+    names = resolve_equipment_names(
+        {
+            schedule["equipment_id"]: schedule["equipment__type"]
+            for schedule in schedules
+        }
+    )
+    # At most one live warning per schedule (unique_live_warning)
+    warnings = {
+        warning.maintenance_schedule_id: warning
+        for warning in MaintenanceWarning.objects.live().filter(
+            maintenance_schedule_id__in=[
+                schedule["pk"] for schedule in schedules
+            ]
+        )
+    }
+
+    created = []
+    updated = []
+    superseded = []
+    raised = []
+    for schedule in schedules:
+        days_left = (schedule["next_maintenance_date"] - today).days
+        warning_time, warning_level = MaintenanceWarning.get_warning_time(
+            days_left
+        )
+        message = MaintenanceWarning.build_message(
+            names[schedule["equipment_id"]],
+            days_left,
+            schedule["next_maintenance_date"],
+        )
+        warning = warnings.get(schedule["pk"])
+        if warning is not None and warning.warning_level != warning_level:
+            superseded.append(warning.pk)
+            warning = None
+        if warning is None:
+            warning = MaintenanceWarning(
+                maintenance_schedule_id=schedule["pk"],
+                warning_time=warning_time,
+                warning_level=warning_level,
+                message=message,
+            )
+            created.append(warning)
+            raised.append((warning, schedule))
+        elif warning.status == MaintenanceWarning.STATUS_PENDING and (
+            warning.warning_time,
+            warning.message,
+        ) != (warning_time, message):
+            warning.warning_time = warning_time
+            warning.message = message
+            warning.updated_at = now
+            updated.append(warning)
+        warnings[schedule["pk"]] = warning
+
+    with transaction.atomic():
+        MaintenanceWarning.objects.filter(pk__in=superseded).transition(
+            MaintenanceWarning.STATUS_SUPERSEDED
+        )
+        MaintenanceWarning.objects.bulk_create(created)
+        MaintenanceWarning.objects.bulk_update(updated, WARNING_FIELDS)
+        # New and escalated warnings are notified by dispatch_outbox_events
+        OutboxEvent.objects.bulk_create(
+            OutboxEvent(
+                event_type="maintenance_due",
+                payload={
+                    "warning_id": warning.pk,
+                    "schedule_id": schedule["pk"],
+                    "equipment_id": schedule["equipment_id"],
+                    "assigned_to_id": schedule["assigned_to_id"],
+                },
+            )
+            for warning, schedule in raised
+        )
+    return len(created), len(updated), [warning.pk for warning, _ in raised]
+
+
+def resolve_warnings(schedule_ids):
+    """Resolve the live warnings of schedules no longer due"""
+    return (
+        MaintenanceWarning.objects.live()
+        .filter(maintenance_schedule_id__in=schedule_ids)
+        .transition(MaintenanceWarning.STATUS_RESOLVED)
+    )
+
+
+def resolve_stale_warnings(today):
+    """
+    Resolve live warnings of schedules that were completed, lost their
+    date or moved out of the warning window
+    """
+    window_end = today + timedelta(days=MaintenanceWarning.WARNING_WINDOW_DAYS)
+    return (
+        MaintenanceWarning.objects.live()
+        .filter(
+            Q(maintenance_schedule__is_completed=True)
+            | Q(maintenance_schedule__next_maintenance_date__isnull=True)
+            | Q(maintenance_schedule__next_maintenance_date__gt=window_end)
+        )
+        .transition(MaintenanceWarning.STATUS_RESOLVED)
+    )
+
+
+def sweep_maintenance_warnings(
+    today=None, batch_size=WARNING_SWEEP_BATCH_SIZE
+):
+    """
+    Create or refresh the warning of every open schedule due within
+    ``WARNING_WINDOW_DAYS``, recording an outbox event for new and
+    escalated ones. Per batch of schedules: one warnings query, one name
+    query per equipment type, one ``bulk_create``, one ``bulk_update``
+    and one event ``bulk_create``. Companies in digest mode get one
+    message per group for a batch's raised warnings, queued in the
+    batch's transaction: the outbox skips their warnings, which are not
+    raised again. Live warnings of schedules no longer due are resolved.
+    """
+    now = timezone.now()
+    today = today or now.date()
+    stats = dict.fromkeys(
+        ["schedules", "created", "updated", "raised", "digests"], 0
+    )
+    stats["resolved"] = resolve_stale_warnings(today)
+
+    rows = due_schedules(today).iterator(chunk_size=batch_size)
+    while True:
+        schedules = list(islice(rows, batch_size))
+        if not schedules:
+            break
+        with transaction.atomic():
+            created, updated, raised = sweep_batch(schedules, today, now)
+            stats["digests"] += send_warning_digests(raised)
+        stats["schedules"] += len(schedules)
+        stats["created"] += created
+        stats["updated"] += updated
+        stats["raised"] += len(raised)
+    return stats
@@ -0,0 +1,231 @@
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import escape
+
+from apps.companies.models import Company
+from apps.equipment.models import (
+    Equipment,
+    resolve_child_values,
+    resolve_equipment_names,
+)
+from apps.maintenance.models import (
+    MaintenanceSchedule,
+    MaintenanceWarning,
+    Notification,
+    OutboxEvent,
+    TelegramMessage,
+)
+from apps.users.models import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+EVENT_MESSAGES = {
+    "maintenance_scheduled": (
+        "{equipment} uchun texnik xizmat rejalashtirildi: "
+        "{maintenance_type} ({date})"
+    ),
+    "maintenance_completed": (
+        "{equipment} texnik xizmati bajarildi: {maintenance_type}"
+    ),
+    "fault_reported": "{equipment}: nosozlik aniqlandi. {title}",
+    "fault_resolved": "{equipment}: nosozlik bartaraf etildi. {title}",
+}
+# Events also posted to the Telegram chat; new schedules stay in-app
+TELEGRAM_EVENT_TYPES = {
+    "maintenance_due",
+    "maintenance_completed",
+    "fault_reported",
+    "fault_resolved",
+}
+# Payload keys holding users that are notified directly
+RECIPIENT_KEYS = ("assigned_to_id", "reported_by_id")
+
+
+def get_recipients(events, responsible, companies):
+    """
+    ``{event pk: [user ids]}``: the users named in the payload, the
+    equipment's responsible person and the admins of that person's
+    company. Users deleted since the event (not in ``companies``) are
+    dropped.
+    """
+    admins = defaultdict(set)
+    company_ids = {
+        companies.get(person) for person in responsible.values()
+    } - {None}
+    for pk, company_id in User.objects.filter(
+        role=UserRole.COMPANY_ADMIN, is_active=True, company_id__in=company_ids
+    ).values_list("pk", "company_id"):
+        admins[company_id].add(pk)
+
+    recipients = {}
+    for event in events:
+        person = responsible.get(event.payload.get("equipment_id"))
+        users = {event.payload.get(key) for key in RECIPIENT_KEYS} | {person}
+        users = {pk for pk in users if pk in companies}
+        users |= admins.get(companies.get(person), set())
+        recipients[event.pk] = sorted(users)
+    return recipients
+
+
+def fan_out(events):
+    """Bulk-create the notifications and Telegram messages of ``events``"""
+    equipment_types = dict(
+        Equipment.objects.filter(
+            pk__in={event.payload.get("equipment_id") for event in events}
+        ).values_list("pk", "type")
+    )
+    names = resolve_equipment_names(equipment_types)
+    responsible = resolve_child_values(
+        equipment_types, "responsible_person_id"
+    )
+    warnings = MaintenanceWarning.objects.only(
+        "message", "sent_to_telegram", "status"
+    ).in_bulk(
+        [
+            event.payload["warning_id"]
+            for event in events
+            if event.event_type == "maintenance_due"
+        ]
+    )
+    user_ids = {
+        event.payload.get(key) for event in events for key in RECIPIENT_KEYS
+    } | set(responsible.values())
+    # user -> company, and the company's Telegram routing
+    companies = dict(
+        User.objects.filter(pk__in=user_ids - {None}).values_list(
+            "pk", "company_id"
+        )
+    )
+    chats = {
+        pk: (chat_id or settings.TELEGRAM_CHAT_ID, warning_digest)
+        for pk, chat_id, warning_digest in Company.objects.filter(
+            pk__in=set(companies.values()) - {None}
+        ).values_list("pk", "telegram_chat_id", "warning_digest")
+    }
+    recipients = get_recipients(events, responsible, companies)
+    titles = dict(Notification.NOTIFICATION_TYPE)
+    maintenance_types = dict(MaintenanceSchedule.MAINTENANCE_TYPE_CHOICES)
+
+    notifications = []
+    messages = []
+    notified_warnings = []
+    for event in events:
+        payload = event.payload
+        warning = None
+        if event.event_type == "maintenance_due":
+            warning = warnings.get(payload["warning_id"])
+            # Superseded or resolved before it was dispatched
+            if (
+                warning is None
+                or warning.status not in MaintenanceWarning.LIVE_STATUSES
+            ):
+                continue
+            notified_warnings.append(warning.pk)
+            text = warning.message
+        else:
+            text = EVENT_MESSAGES[event.event_type].format(
+                equipment=names.get(payload["equipment_id"], ""),
+                maintenance_type=maintenance_types.get(
+                    payload.get("maintenance_type"), ""
+                ),
+                date=payload.get("date", ""),
+                title=payload.get("title", ""),
+            )
+
+        event_notifications = [
+            Notification(
+                user_id=user_id,
+                title=str(titles[event.event_type]),
+                message=text,
+                notification_type=event.event_type,
+            )
+            for user_id in recipients[event.pk]
+        ]
+        notifications.extend(event_notifications)
+        if event.event_type not in TELEGRAM_EVENT_TYPES:
+            continue
+        if warning is not None and warning.sent_to_telegram:
+            continue
+        company_id = companies.get(
+            responsible.get(payload.get("equipment_id"))
+        )
+        chat_id, warning_digest = chats.get(
+            company_id, (settings.TELEGRAM_CHAT_ID, Company.WARNING_DIGEST_OFF)
+        )
+        if (
+            warning is not None
+            and warning_digest != Company.WARNING_DIGEST_OFF
+        ):
+            # Sent in the sweep's digest (send_warning_digests)
+            continue
+        messages.append(
+            (
+                TelegramMessage(
+                    chat_id=chat_id,
+                    text=escape(text),
+                    warning_id=warning.pk if warning else None,
+                ),
+                event_notifications,
+            )
+        )
+
+    Notification.objects.bulk_create(notifications)
+    # Delivery flags the event's notifications (sent_to_telegram)
+    for message, event_notifications in messages:
+        message.notification_ids = [n.pk for n in event_notifications]
+    TelegramMessage.objects.enqueue(
+        [message for message, _notifications in messages]
+    )
+    MaintenanceWarning.objects.filter(pk__in=notified_warnings).transition(
+        MaintenanceWarning.STATUS_SENT, is_sent=True, sent_date=timezone.now()
+    )
+
+
+def dispatch_outbox_events(batch_size=100):
+    """
+    Fan out a batch of unprocessed ``OutboxEvent`` rows. Events are
+    claimed with ``SKIP LOCKED`` and marked processed in the transaction
+    that writes their notifications, so a crash replays them instead of
+    losing them. A failing batch is retried event by event to isolate
+    the failing ones. Returns the job stats.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                processed_at__isnull=True,
+                attempts__lt=OutboxEvent.MAX_ATTEMPTS,
+            )
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return {"rows_scanned": 0}
+
+        try:
+            with transaction.atomic():
+                fan_out(events)
+            done = events
+        except Exception:
+            done = []
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        fan_out([event])
+                except Exception as e:
+                    logger.exception("Outbox event %s failed", event.pk)
+                    event.attempts += 1
+                    event.last_error = str(e)
+                else:
+                    done.append(event)
+
+        now = timezone.now()
+        for event in done:
+            event.processed_at = now
+        OutboxEvent.objects.bulk_update(
+            events, ["attempts", "last_error", "processed_at"]
+        )
+    return {"rows_scanned": len(events), "rows_written": len(done)}
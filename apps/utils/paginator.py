@@ -1,7 +1,319 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+
+def approximate_count(queryset):
+    """
+    Row count estimated by the PostgreSQL planner (no table scan).
+    Small estimates and non-PostgreSQL databases fall back to ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < APPROXIMATE_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
+
+
+class ApproximateCountPaginator(DjangoPaginator):
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, "query"):
+            return approximate_count(self.object_list)
+        return len(self.object_list)
+
+
+def _get_field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    return model._meta.get_field(name)
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def keyset_order_by(ordering):
+    """
+    ``order_by()`` expressions for a keyset ordering. NULLs are treated as
+    the largest value (PostgreSQL's default) so both scan directions agree.
+    """
+    expressions = []
+    for field_name in ordering:
+        name = field_name.lstrip("-")
+        if field_name.startswith("-"):
+            expressions.append(F(name).desc(nulls_first=True))
+        else:
+            expressions.append(F(name).asc(nulls_last=True))
+    return expressions
+
+
+def keyset_filter(model, ordering, position):
+    """Rows strictly after ``position`` when scanning in ``ordering``"""
+    condition = None
+    for field_name, value in reversed(list(zip(ordering, position))):
+        name = field_name.lstrip("-")
+        nullable = _get_field(model, name).null
+
+        if value is None:
+            equal = Q(**{f"{name}__isnull": True})
+        else:
+            equal = Q(**{name: value})
+        tail = equal & condition if condition is not None else None
+
+        if field_name.startswith("-"):
+            if value is None:
+                head = Q(**{f"{name}__isnull": False})
+            else:
+                head = Q(**{f"{name}__lt": value})
+        elif value is None:
+            head = None
+        else:
+            head = Q(**{f"{name}__gt": value})
+            if nullable:
+                head |= Q(**{f"{name}__isnull": True})
+
+        parts = [part for part in (head, tail) if part is not None]
+        if not parts:
+            condition = Q(pk__in=[])
+        elif len(parts) == 1:
+            condition = parts[0]
+        else:
+            condition = parts[0] | parts[1]
+    return condition
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the view's ``keyset_ordering``
+    (e.g. ``("-created_at", "-pk")``). Every page is one index range scan,
+    no ``COUNT(*)`` and no ``OFFSET``. The last key must be unique.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    default_ordering = ("-pk",)
+    invalid_cursor_message = _("Yaroqsiz kursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(
+            getattr(view, "keyset_ordering", None) or self.default_ordering
+        )
+        self.page_size = self.get_page_size(request)
+        self.pk_name = queryset.model._meta.pk.attname
+        position, reverse = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) == "approximate":
+            self.count = approximate_count(queryset)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                name[1:] if name.startswith("-") else f"-{name}"
+                for name in ordering
+            )
+        queryset = queryset.order_by(*keyset_order_by(ordering))
+        if position is not None:
+            queryset = queryset.filter(
+                keyset_filter(queryset.model, ordering, position)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position(self, instance):
+        names = [name.lstrip("-") for name in self.ordering]
+        if isinstance(instance, dict):
+            # .values() rows
+            names = [self.pk_name if name == "pk" else name for name in names]
+            return [_encode_value(instance[name]) for name in names]
+        return [_encode_value(getattr(instance, name)) for name in names]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded.encode("ascii"))
+            )
+            position = cursor["p"]
+            reverse = bool(cursor.get("r"))
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            UnicodeError,
+            ValueError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(
+            self.ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = {"p": position}
+        if reverse:
+            cursor["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response["count"] = self.count
+        response["next"] = self.get_next_link()
+        response["previous"] = self.get_previous_link()
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
 
 
 class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Page-number pagination by default. ``?pagination=cursor`` switches to
+    keyset pagination and ``?count=approximate`` replaces ``COUNT(*)`` with
+    the planner's estimate.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    pagination_query_param = "pagination"
+    count_query_param = "count"
+    keyset_pagination_class = KeysetPagination
+    keyset = None
+
+    def is_keyset_requested(self, request):
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or self.keyset_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_requested(request):
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.count_query_param) == "approximate":
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`cursor` - keyset pagination",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": self.keyset_pagination_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`approximate` - planner row estimate",
+                "schema": {"type": "string", "enum": ["approximate"]},
+            },
+        ]
+        return parameters
@@ -1,40 +1,164 @@
-import uuid
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
 from io import BytesIO
 
 import qrcode
 from django.conf import settings
-from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from qrcode.image.svg import SvgPathImage
 
+from apps.equipment.models import (
+    QR_STATUS_FAILED,
+    QR_STATUS_READY,
+    Equipment,
+    QRCodeJob,
+    resolve_real_instances,
+)
+from apps.utils import detail_cache
+
+QR_CODE_CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+QR_CODE_MIN_SIZE = 64
+QR_CODE_MAX_SIZE = 2048
+# Bump when rendering parameters change so cached bytes and ETags rotate
+QR_CODE_RENDER_VERSION = 1
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a fixed number of entries"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+qr_code_cache = LRUCache(settings.QR_CODE_CACHE_SIZE)
+
+
+def qr_code_hash(payload, image_format="png", size=None):
+    """Content address of a rendered QR code"""
+    key = f"{QR_CODE_RENDER_VERSION}:{image_format}:{size}:{payload}"
+    return hashlib.sha256(key.encode()).hexdigest()
 
-def generate_equipment_qr_code(
-    equipment_instance, base_url="https://api.ppr.vchdqarshi.uz/api"
-):
-    """
-    Generate QR code for equipment instance
-    """
-    # Determine the URL based on equipment type
-    if hasattr(equipment_instance, "AUTO_TYPE"):
-        equipment_type = equipment_instance.AUTO_TYPE.replace("_", "-")
-        url = f"{base_url}/{equipment_type}-detail/{equipment_instance.pk}/"
-    else:
-        url = f"{base_url}/equipment-detail/{equipment_instance.pk}/"
 
-    # Create QR code
+def build_qr_code(payload, image_format="png", size=None):
+    """Render ``payload`` as PNG or SVG bytes, about ``size`` pixels wide"""
+    border = 4
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
         box_size=10,
-        border=4,
+        border=border,
     )
-    qr.add_data(url)
+    qr.add_data(payload)
     qr.make(fit=True)
+    if size:
+        qr.box_size = max(1, size // (qr.modules_count + 2 * border))
 
-    # Create image
-    qr_image = qr.make_image(fill_color="black", back_color="white")
+    if image_format == "svg":
+        qr_image = qr.make_image(image_factory=SvgPathImage)
+        buffer = BytesIO()
+        qr_image.save(buffer)
+    else:
+        qr_image = qr.make_image(fill_color="black", back_color="white")
+        buffer = BytesIO()
+        qr_image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_qr_code(payload, image_format="png", size=None):
+    """
+    Return ``(hash, content)`` for a QR code, served from the LRU cache
+    when the same payload was rendered before.
+    """
+    key = qr_code_hash(payload, image_format, size)
+    content = qr_code_cache.get(key)
+    if content is None:
+        content = build_qr_code(payload, image_format, size)
+        qr_code_cache.set(key, content)
+    return key, content
+
+
+def generate_equipment_qr_code(equipment_instance):
+    """
+    Generate QR code for equipment instance
+    """
+    url = equipment_instance.get_detail_url()
+    _, content = render_qr_code(url)
+    return BytesIO(content), url
+
+
+def process_qr_code_jobs(batch_size=100):
+    """
+    Render QR codes for a batch of pending ``QRCodeJob`` rows in one pass:
+    jobs are claimed with ``SKIP LOCKED`` (safe with several workers),
+    child rows are loaded with one query per equipment type and written
+    back with one ``bulk_update`` per type. Returns the number of jobs.
+    """
+    with transaction.atomic():
+        jobs = list(
+            QRCodeJob.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("equipment")
+            .filter(status=QRCodeJob.STATUS_PENDING)
+            .order_by("id")[:batch_size]
+        )
+        if not jobs:
+            return 0
 
-    # Save to BytesIO
-    buffer = BytesIO()
-    qr_image.save(buffer, format="PNG")
-    buffer.seek(0)
+        equipments = resolve_real_instances([job.equipment for job in jobs])
+        now = timezone.now()
+        rendered = defaultdict(list)
+        for job, equipment in zip(jobs, equipments):
+            job.attempts += 1
+            job.processed_at = now
+            if equipment.__class__ is Equipment:
+                job.status = QRCodeJob.STATUS_FAILED
+                job.last_error = "Equipment subclass row is missing"
+                continue
+            try:
+                equipment.generate_qr_code(equipment.get_detail_url())
+            except Exception as e:
+                job.last_error = str(e)
+                if job.attempts < QRCodeJob.MAX_ATTEMPTS:
+                    continue
+                job.status = QRCodeJob.STATUS_FAILED
+                equipment.qr_status = QR_STATUS_FAILED
+            else:
+                job.status = QRCodeJob.STATUS_DONE
+                job.last_error = ""
+                equipment.qr_status = QR_STATUS_READY
+            equipment.updated_at = now
+            rendered[equipment.__class__].append(equipment)
 
-    return buffer, url
+        for model, instances in rendered.items():
+            model.objects.bulk_update(
+                instances, ["qr_code", "qr_status", "updated_at"]
+            )
+            # bulk_update() sends no post_save
+            detail_cache.invalidate(
+                Equipment, [instance.pk for instance in instances]
+            )
+        QRCodeJob.objects.bulk_update(
+            jobs, ["status", "attempts", "last_error", "processed_at"]
+        )
+    return len(jobs)
@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Min,
+    Q,
+    Sum,
+    Window,
+)
+from django.db.models.functions import RowNumber
+
+from apps.equipment.models import resolve_equipment_names
+from apps.maintenance.models import EquipmentFault, day_start
+from apps.utils.detail_cache import get_cache, get_tokens, is_shared
+from apps.utils.job_runs import seconds
+
+RELIABILITY_MAX_DAYS = 3 * 366
+# Most failing equipment listed per type
+TOP_EQUIPMENT = 5
+SEVERITIES = [severity for severity, _label in EquipmentFault.FAULT_SEVERITY]
+REPAIRED = Q(is_resolved=True, resolved_at__isnull=False)
+REPAIR_TIME = ExpressionWrapper(
+    F("resolved_at") - F("reported_at"), output_field=DurationField()
+)
+
+
+def equipment_stats(company_id, start, end, equipment_type=None):
+    """
+    One row per equipment with faults reported between ``start`` and
+    ``end`` (inclusive days): counts, repair time, first and last report
+    and its ``rank`` by fault count within its type (a window function
+    over the grouped rows). Faults without a company are not reported.
+    """
+    if company_id is None:
+        return []
+    faults = EquipmentFault.objects.filter(
+        company_id=company_id,
+        reported_at__gte=day_start(start),
+        reported_at__lt=day_start(end, 1),
+    )
+    if equipment_type is not None:
+        faults = faults.filter(equipment__type=equipment_type)
+    return list(
+        faults.values("equipment_id", "equipment__type")
+        .annotate(
+            faults=Count("id"),
+            **{
+                f"{severity}_faults": Count("id", filter=Q(severity=severity))
+                for severity in SEVERITIES
+            },
+            repaired=Count("id", filter=REPAIRED),
+            repair_time=Sum(REPAIR_TIME, filter=REPAIRED),
+            first_reported_at=Min("reported_at"),
+            last_reported_at=Max("reported_at"),
+        )
+        # A separate annotate() keeps the window out of the GROUP BY
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=[F("equipment__type")],
+                order_by=[F("faults").desc(), F("equipment_id").asc()],
+            )
+        )
+        .order_by("equipment__type", "rank")
+    )
+
+
+def summarize(rows):
+    """
+    Totals of ``equipment_stats`` rows. MTBF is the mean interval between
+    consecutive faults of the same equipment: an equipment's intervals
+    add up to its last minus its first report, so no per-fault rows are
+    needed. MTTR is the mean report-to-resolution time.
+    """
+    faults = sum(row["faults"] for row in rows)
+    intervals = sum(row["faults"] - 1 for row in rows)
+    uptime = sum(
+        (row["last_reported_at"] - row["first_reported_at"] for row in rows),
+        timedelta(),
+    )
+    repaired = sum(row["repaired"] for row in rows)
+    repair_time = sum(
+        (row["repair_time"] or timedelta() for row in rows), timedelta()
+    )
+    return {
+        "faults": faults,
+        "by_severity": {
+            severity: sum(row[f"{severity}_faults"] for row in rows)
+            for severity in SEVERITIES
+        },
+        "repaired": repaired,
+        "mtbf_seconds": seconds(uptime / intervals) if intervals else None,
+        "mttr_seconds": seconds(repair_time / repaired) if repaired else None,
+    }
+
+
+def build_report(company_id, start, end, equipment_type=None):
+    rows = equipment_stats(company_id, start, end, equipment_type)
+    types = {}
+    for row in rows:
+        types.setdefault(row["equipment__type"], []).append(row)
+    names = resolve_equipment_names(
+        {
+            row["equipment_id"]: row["equipment__type"]
+            for row in rows
+            if row["rank"] <= TOP_EQUIPMENT
+        }
+    )
+    return {
+        "start": start,
+        "end": end,
+        "equipment_type": equipment_type,
+        **summarize(rows),
+        "types": [
+            {
+                "type": type_name,
+                "equipment": len(type_rows),
+                **summarize(type_rows),
+                "top_equipment": [
+                    {
+                        "id": row["equipment_id"],
+                        "name": names.get(row["equipment_id"], ""),
+                        **summarize([row]),
+                    }
+                    for row in type_rows
+                    if row["rank"] <= TOP_EQUIPMENT
+                ],
+            }
+            for type_name, type_rows in types.items()
+        ],
+    }
+
+
+def reliability(company_id, start, end, equipment_type=None):
+    """
+    MTBF, MTTR, fault counts by severity and the most failing equipment
+    of a company, overall and per equipment type. Reports are cached
+    under the company's version token, which fault changes delete
+    (``invalidate_reliability``) when the cache backend is shared; users
+    without a company see none.
+    """
+    cache = get_cache()
+    if company_id is None or not is_shared(cache):
+        return build_report(company_id, start, end, equipment_type)
+    # Taken before the query: a concurrent fault change retires the result
+    (token,) = get_tokens(
+        cache, [(EquipmentFault.RELIABILITY_CACHE_LABEL, company_id)]
+    )
+    key = (
+        f"reliability:{company_id}:{start}:{end}:"
+        f"{equipment_type or ''}:{token}"
+    )
+    data = cache.get(key)
+    if data is None:
+        data = build_report(company_id, start, end, equipment_type)
+        cache.set(key, data, settings.RELIABILITY_CACHE_TIMEOUT)
+    return data
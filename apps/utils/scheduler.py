@@ -1,48 +1,153 @@
+import logging
+from datetime import timedelta
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Max
 from django.utils import timezone
 
-from apps.maintenance.models import MaintenanceSchedule, MaintenanceWarning
-from apps.utils.send_telegram_message import send_telegram_message
+from apps.core.models import JobRun
+from apps.utils.chunked_upload import prune_fault_photo_uploads
+from apps.utils.image_renditions import prune_image_renditions
+from apps.utils.job_runs import prune_job_runs, record_skipped, track_run
+from apps.utils.maintenance_calendar import rebuild_calendar
+from apps.utils.warning_timer import rearm_missing_timers
+
+logger = logging.getLogger(__name__)
+
+
+# Job name -> (function, interval); run by ``manage.py run_scheduler``.
+# Warnings themselves are raised by ``manage.py run_warning_timer``.
+JOBS = {
+    "rearm_missing_timers": (rearm_missing_timers, timedelta(hours=1)),
+    "rebuild_calendar": (rebuild_calendar, timedelta(days=1)),
+    "prune_job_runs": (prune_job_runs, timedelta(days=1)),
+    "prune_image_renditions": (prune_image_renditions, timedelta(days=1)),
+    "prune_fault_photo_uploads": (
+        prune_fault_photo_uploads,
+        timedelta(hours=1),
+    ),
+}
+
+
+def run_job(name):
+    """Run a registered job and record the run and its stats in ``JobRun``"""
+    function, _interval = JOBS[name]
+    try:
+        with track_run(name) as run:
+            run.add(function())
+    except Exception:
+        logger.exception("Scheduled job %s failed", name)
+
+
+def run_job_in_thread(name):
+    # APScheduler worker threads get their own connection, closed after
+    close_old_connections()
+    try:
+        run_job(name)
+    finally:
+        connection.close()
+
+
+def recover_interrupted_runs():
+    """
+    Fail runs left ``running`` by a scheduler that died mid-job; only the
+    leader runs jobs, so none of them can still be in progress.
+    """
+    return JobRun.objects.filter(status=JobRun.STATUS_RUNNING).update(
+        status=JobRun.STATUS_FAILED,
+        finished_at=timezone.now(),
+        error="Interrupted: the scheduler stopped before the job finished",
+    )
+
+
+def get_next_run_times(now=None):
+    """
+    First run time of every job from its last recorded run: jobs that
+    are overdue (e.g. after downtime) or never ran start right away.
+    """
+    now = now or timezone.now()
+    last_runs = dict(
+        JobRun.objects.filter(job__in=JOBS)
+        .exclude(status=JobRun.STATUS_SKIPPED)
+        .values("job")
+        .annotate(last_started_at=Max("started_at"))
+        .values_list("job", "last_started_at")
+    )
+    next_run_times = {}
+    for name, (_function, interval) in JOBS.items():
+        last_started_at = last_runs.get(name)
+        if last_started_at is None:
+            next_run_times[name] = now
+        else:
+            next_run_times[name] = max(now, last_started_at + interval)
+    return next_run_times
+
 
+SKIP_REASONS = {
+    # max_instances=1
+    EVENT_JOB_MAX_INSTANCES: "Skipped: the previous run is running",
+    EVENT_JOB_MISSED: "Skipped: the run was missed",
+}
 
-def check_maintenance_warnings():
-    # Get all MaintenanceSchedule objects that need warnings
-    maintenance_schedules = MaintenanceSchedule.objects.all()
 
-    for schedule in maintenance_schedules:
-        # Check if the warning already exists
-        warning = MaintenanceWarning.objects.filter(
-            maintenance_schedule=schedule, is_sent=False
-        ).first()
+def record_skipped_job(event):
+    close_old_connections()
+    try:
+        record_skipped(event.job_id, SKIP_REASONS[event.code])
+    finally:
+        connection.close()
 
-        # If no warning exists, create one
-        if not warning:
-            warning = MaintenanceWarning.objects.create(
-                maintenance_schedule=schedule
-            )
 
-        # Set warning time and level
-        warning.set_warning_time()
+def build_scheduler():
+    scheduler = BackgroundScheduler(
+        job_defaults={"coalesce": True, "max_instances": 1}
+    )
+    scheduler.add_listener(
+        record_skipped_job, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED
+    )
+    next_run_times = get_next_run_times()
+    for name, (_function, interval) in JOBS.items():
+        scheduler.add_job(
+            run_job_in_thread,
+            "interval",
+            args=[name],
+            id=name,
+            name=name,
+            seconds=interval.total_seconds(),
+            next_run_time=next_run_times[name],
+            misfire_grace_time=None,
+        )
+    return scheduler
 
-        # Save the warning if it's due
-        if warning.warning_time:
-            warning.save()
 
-            # Send a message to Telegram if it's not already sent
-            if not warning.sent_to_telegram:
-                send_telegram_message(warning.message)
+# Leader election
+# -----------------------------------------------------------------------------------------
+def supports_leader_election():
+    return connection.vendor == "postgresql"
 
-                # Mark as sent
-                warning.sent_to_telegram = True
-                warning.sent_date = timezone.now()
-                warning.save()
 
+def try_acquire_leadership():
+    """
+    Take the session-level advisory lock ``SCHEDULER_LOCK_KEY`` on this
+    thread's connection. PostgreSQL releases it when the session ends, so
+    a crashed or disconnected leader is replaced by a standby. Without
+    advisory locks (SQLite) the process is always the leader.
+    """
+    if not supports_leader_election():
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_try_advisory_lock(%s)", [settings.SCHEDULER_LOCK_KEY]
+        )
+        return cursor.fetchone()[0]
 
-# Start function that schedules both jobs
-def start():
-    scheduler = BackgroundScheduler()
 
-    # Schedule the maintenance warning check job every 24 hours
-    scheduler.add_job(check_maintenance_warnings, "interval", hours=3)
-    # Start the scheduler
-    scheduler.start()
+def holds_leadership():
+    """The lock lives as long as the session that took it"""
+    if not supports_leader_election() or connection.is_usable():
+        return True
+    connection.close()
+    return False
@@ -0,0 +1,119 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import CharField, Lookup, Q, Value
+from django.db.models.functions import Greatest
+from rest_framework import filters
+
+from apps.equipment.models import EQUIPMENT_TYPE_MODELS
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+@CharField.register_lookup
+class ILikeContains(Lookup):
+    """
+    ``col ILIKE '%term%'`` on PostgreSQL. Unlike ``icontains``
+    (``UPPER(col) LIKE ...``) it can use a ``gin_trgm_ops`` index on ``col``.
+    """
+
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        rhs_params = [
+            f"%{connection.ops.prep_for_like_query(param)}%"
+            for param in rhs_params
+        ]
+        if connection.vendor == "postgresql":
+            return f"{lhs} ILIKE {rhs}", lhs_params + rhs_params
+        return (
+            f"UPPER({lhs}) LIKE UPPER({rhs}) ESCAPE '\\'",
+            lhs_params + rhs_params,
+        )
+
+
+def is_postgresql(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_condition(fields, term):
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__ilike_contains": term})
+    return condition
+
+
+def search_rank(fields, text):
+    """Best trigram word similarity of ``text`` across ``fields``"""
+    similarities = [TrigramWordSimilarity(text, field) for field in fields]
+    if len(similarities) == 1:
+        return similarities[0]
+    return Greatest(*similarities)
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    ``SearchFilter`` backed by the pg_trgm GIN indexes: every term must
+    match one of ``search_fields`` (ILIKE) and results are ranked by
+    trigram similarity. Other databases use the default ``SearchFilter``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        if not is_postgresql(queryset) or any(
+            not field.isidentifier() for field in search_fields
+        ):
+            return super().filter_queryset(request, queryset, view)
+
+        for term in search_terms:
+            queryset = queryset.filter(search_condition(search_fields, term))
+        ordering = queryset.query.order_by
+        return queryset.annotate(
+            search_rank=search_rank(search_fields, " ".join(search_terms))
+        ).order_by("-search_rank", *ordering)
+
+
+def autocomplete_equipment(term, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Best ``limit`` matches across all equipment types as dicts with
+    ``id``, ``type`` and ``name``. One ``UNION ALL`` query that reads
+    only the child tables and their trigram indexes.
+    """
+    fields = ["detail_name", "factory_number", "registration_number"]
+    querysets = []
+    for equipment_type, model in EQUIPMENT_TYPE_MODELS.items():
+        queryset = model.objects.filter(search_condition(fields, term))
+        querysets.append((equipment_type, queryset))
+
+    if not is_postgresql(querysets[0][1]):
+        results = []
+        for equipment_type, queryset in querysets:
+            for pk, name in queryset.values_list(
+                "equipment_ptr_id", "detail_name"
+            )[:limit]:
+                results.append(
+                    {"id": pk, "type": equipment_type, "name": name}
+                )
+        return results[:limit]
+
+    ranked = [
+        queryset.annotate(
+            equipment_type=Value(equipment_type, output_field=CharField()),
+            rank=search_rank(fields, term),
+        )
+        .values_list(
+            "equipment_ptr_id", "equipment_type", "detail_name", "rank"
+        )
+        .order_by("-rank")[:limit]
+        for equipment_type, queryset in querysets
+    ]
+    union = ranked[0].union(*ranked[1:], all=True).order_by("-rank")[:limit]
+    return [
+        {"id": pk, "type": equipment_type, "name": name}
+        for pk, equipment_type, name, _rank in union
+    ]
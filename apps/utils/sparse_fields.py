@@ -0,0 +1,49 @@
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def parse_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class FieldSelection:
+    """Top-level response fields requested with ``?fields=`` / ``?exclude=``"""
+
+    def __init__(self, fields=None, exclude=()):
+        self.fields = frozenset(fields) if fields is not None else None
+        self.exclude = frozenset(exclude)
+
+    @classmethod
+    def from_request(cls, request):
+        params = request.query_params
+        if FIELDS_PARAM not in params and EXCLUDE_PARAM not in params:
+            return None
+        fields = None
+        if FIELDS_PARAM in params:
+            fields = parse_names(params[FIELDS_PARAM])
+        return cls(fields, parse_names(params.get(EXCLUDE_PARAM, "")))
+
+    def keeps(self, name):
+        if self.fields is not None and name not in self.fields:
+            return False
+        return name not in self.exclude
+
+    def filter(self, data):
+        return {key: value for key, value in data.items() if self.keeps(key)}
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=a,b`` / ``?exclude=c`` on ``GET``. List views prune the
+    ``.values()`` column list (see ``ValuesListMixin``), detail views trim
+    the (cached) payload with ``sparse()``.
+    """
+
+    def get_field_selection(self):
+        if self.request.method != "GET":
+            return None
+        return FieldSelection.from_request(self.request)
+
+    def sparse(self, data):
+        selection = self.get_field_selection()
+        return selection.filter(data) if selection else data
@@ -0,0 +1,297 @@
+import logging
+import random
+import time
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from apps.maintenance.models import (
+    MaintenanceWarning,
+    Notification,
+    TelegramMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+# A claimed message is retried after this if the worker dies mid-send;
+# the lease is renewed once half of it has passed
+CLAIM_LEASE = timedelta(minutes=5)
+RETRY_BASE_DELAY = 30
+RETRY_MAX_DELAY = 3600
+# sendMessage text limit (characters after entity parsing)
+MESSAGE_MAX_LENGTH = 4096
+
+
+class TelegramError(Exception):
+    def __init__(self, message, retry_after=None, permanent=False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+class TelegramClient:
+    """Bot API ``sendMessage`` over one pooled keep-alive session"""
+
+    def __init__(self, token=None, api_url=None, timeout=10, pool_size=4):
+        self.token = token or settings.TELEGRAM_BOT_TOKEN
+        self.api_url = (api_url or settings.TELEGRAM_API_URL).rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def send_message(self, chat_id, text, parse_mode="HTML"):
+        url = f"{self.api_url}/bot{self.token}/sendMessage"
+        payload = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}
+        try:
+            response = self.session.post(
+                url, data=payload, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            raise TelegramError(str(e))
+        if response.ok:
+            return response.json()
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        description = body.get("description") or response.reason
+        if response.status_code == 429:
+            retry_after = body.get("parameters", {}).get("retry_after", 1)
+            raise TelegramError(description, retry_after=retry_after)
+        # 400 (bad chat/markup) and 403 (bot blocked) never succeed; a wrong
+        # token (401/404) or a 5xx is worth retrying once it is fixed
+        raise TelegramError(
+            f"{response.status_code} {description}",
+            permanent=response.status_code in (400, 403),
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def delay(self, now):
+        """Seconds until a token is available"""
+        self.refill(now)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause(self, now, seconds):
+        self.refill(now)
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets for the Bot API limits: one shared by all chats
+    (``TELEGRAM_GLOBAL_RATE`` per second, bursts up to a second's worth)
+    and one per chat (``TELEGRAM_CHAT_RATE`` per second, no bursts).
+    """
+
+    def __init__(
+        self,
+        global_rate=None,
+        chat_rate=None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.global_rate = global_rate or settings.TELEGRAM_GLOBAL_RATE
+        self.chat_rate = chat_rate or settings.TELEGRAM_CHAT_RATE
+        self.clock = clock
+        self.sleep = sleep
+        self.global_bucket = TokenBucket(
+            self.global_rate, max(self.global_rate, 1), clock()
+        )
+        self.chat_buckets = {}
+
+    def chat_bucket(self, chat_id):
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(
+                self.chat_rate, 1, self.clock()
+            )
+        return self.chat_buckets[chat_id]
+
+    def acquire(self, chat_id):
+        """Block until a message may be sent to ``chat_id``"""
+        bucket = self.chat_bucket(chat_id)
+        while True:
+            now = self.clock()
+            delay = max(self.global_bucket.delay(now), bucket.delay(now))
+            if delay <= 0:
+                self.global_bucket.take()
+                bucket.take()
+                return
+            self.sleep(delay)
+
+    def pause(self, chat_id, seconds):
+        """Honour a 429 ``retry_after`` for the chat"""
+        self.chat_bucket(chat_id).pause(self.clock(), seconds)
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter, capped at ``RETRY_MAX_DELAY``"""
+    delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_limit(rate):
+    """Messages ``rate`` lets through in half a lease"""
+    return max(int(rate * CLAIM_LEASE.total_seconds() / 2), 1)
+
+
+def claim_messages(batch_size, now, per_chat=None):
+    """
+    Lease due pending messages, at most ``per_chat`` of each chat (what
+    its rate limit sends in half a lease, by default). ``SKIP LOCKED``
+    keeps several workers apart, and the lease moves ``next_attempt_at``
+    past the send so the row locks are not held during HTTP calls.
+    """
+    per_chat = per_chat or claim_limit(settings.TELEGRAM_CHAT_RATE)
+    due = (
+        TelegramMessage.objects.filter(
+            status=TelegramMessage.STATUS_PENDING, next_attempt_at__lte=now
+        )
+        .annotate(
+            chat_rank=Window(
+                RowNumber(),
+                partition_by=[F("chat_id")],
+                order_by=[F("next_attempt_at").asc(), F("id").asc()],
+            )
+        )
+        .filter(chat_rank__lte=per_chat)
+        .values("pk")
+    )
+    with transaction.atomic():
+        messages = list(
+            TelegramMessage.objects.select_for_update(skip_locked=True)
+            .filter(pk__in=due)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt_at = now + CLAIM_LEASE
+        TelegramMessage.objects.bulk_update(
+            messages, ["attempts", "next_attempt_at"]
+        )
+    return messages
+
+
+def renew_lease(messages, lease_until, now):
+    """
+    Extend the lease of the claimed ``messages`` still pending under
+    ``lease_until``. Returns the new lease and the pks kept; rows another
+    worker re-claimed after the lease ran out are dropped.
+    """
+    renewed_until = now + CLAIM_LEASE
+    with transaction.atomic():
+        kept = set(
+            TelegramMessage.objects.select_for_update()
+            .filter(
+                pk__in=[message.pk for message in messages],
+                status=TelegramMessage.STATUS_PENDING,
+                next_attempt_at=lease_until,
+            )
+            .values_list("pk", flat=True)
+        )
+        TelegramMessage.objects.filter(pk__in=kept).update(
+            next_attempt_at=renewed_until
+        )
+    for message in messages:
+        if message.pk in kept:
+            message.next_attempt_at = renewed_until
+    return renewed_until, kept
+
+
+def mark_sent(message):
+    now = timezone.now()
+    message.status = TelegramMessage.STATUS_SENT
+    message.sent_at = now
+    message.last_error = ""
+    with transaction.atomic():
+        message.save(update_fields=["status", "sent_at", "last_error"])
+        warning_ids = [*message.digest_warning_ids]
+        if message.warning_id:
+            warning_ids.append(message.warning_id)
+        if warning_ids:
+            MaintenanceWarning.objects.filter(pk__in=warning_ids).update(
+                sent_to_telegram=True, sent_date=now, updated_at=now
+            )
+        if message.notification_ids:
+            Notification.objects.filter(
+                pk__in=message.notification_ids
+            ).update(sent_to_telegram=True, updated_at=now)
+
+
+def mark_failed(message, error):
+    message.last_error = str(error)
+    if error.retry_after:
+        # Rate limited (429): the message itself did not fail
+        message.attempts -= 1
+    if error.permanent or message.attempts >= TelegramMessage.MAX_ATTEMPTS:
+        message.status = TelegramMessage.STATUS_FAILED
+    else:
+        delay = error.retry_after or retry_delay(message.attempts)
+        message.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    message.save(
+        update_fields=["status", "attempts", "last_error", "next_attempt_at"]
+    )
+
+
+def deliver_telegram_messages(client, limiter, batch_size=100):
+    """
+    Send a batch of due ``TelegramMessage`` rows within the rate limits.
+    Failures are retried with exponential backoff (or Telegram's
+    ``retry_after``) up to ``MAX_ATTEMPTS``; 429s do not count as
+    attempts. Returns the job stats.
+    """
+    now = timezone.now()
+    messages = claim_messages(batch_size, now)
+    lease_until = now + CLAIM_LEASE
+    kept = {message.pk for message in messages}
+    stats = {
+        "rows_scanned": len(messages),
+        "messages_sent": 0,
+        "messages_failed": 0,
+    }
+    for index, message in enumerate(messages):
+        limiter.acquire(message.chat_id)
+        now = timezone.now()
+        if now >= lease_until - CLAIM_LEASE / 2:
+            lease_until, kept = renew_lease(messages[index:], lease_until, now)
+        if message.pk not in kept:
+            continue
+        try:
+            client.send_message(message.chat_id, message.text)
+        except TelegramError as e:
+            logger.warning("Telegram message %s failed: %s", message.pk, e)
+            if e.retry_after:
+                limiter.pause(message.chat_id, e.retry_after)
+            mark_failed(message, e)
+            stats["messages_failed"] += 1
+        else:
+            mark_sent(message)
+            stats["messages_sent"] += 1
+    return stats
@@ -0,0 +1,252 @@
+import copy
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from apps.utils.sparse_fields import SparseFieldsMixin
+
+# Fields whose to_representation() returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+def get_request(context):
+    return context.get("request") if context else None
+
+
+class ValuesSerializer:
+    """
+    Read-only twin of a ``ModelSerializer`` that renders ``.values()``
+    rows: no model instances, no per-field ``get_attribute()`` dispatch.
+    The field mapping (order, columns, converters) is compiled once from
+    the serializer's own fields, so the output matches ``serializer.data``.
+
+    ``method_fields`` maps ``SerializerMethodField`` names to
+    ``(columns, factory)`` where ``factory(context)`` returns a
+    ``function(row)``. ``related`` maps relation field names to renderers
+    with ``render_pks(pks) -> {pk: data}`` (e.g. polymorphic equipment),
+    called once per render with the values of every row.
+    """
+
+    def __init__(self, serializer_class, method_fields=None, related=None):
+        self.serializer_class = serializer_class
+        self.method_fields = method_fields or {}
+        self.related = related or {}
+
+    @cached_property
+    def specs(self):
+        return self.compile(self.serializer_class(), prefix="")
+
+    @cached_property
+    def columns(self):
+        columns = []
+        self.collect_columns(self.specs, columns)
+        return list(dict.fromkeys(columns))
+
+    def select(self, selection):
+        """Copy limited to the top-level fields kept by ``selection``"""
+        clone = copy.copy(self)
+        clone.specs = [spec for spec in self.specs if selection.keeps(spec[0])]
+        clone.__dict__.pop("columns", None)
+        return clone
+
+    def collect_columns(self, specs, columns):
+        for _key, kind, column, extra in specs:
+            if kind == "nested":
+                columns.append(column)
+                self.collect_columns(extra, columns)
+            elif kind == "method":
+                columns.extend(extra[0])
+            else:
+                columns.append(column)
+
+    def compile(self, serializer, prefix):
+        """``(key, kind, column, extra)`` for every readable field"""
+        opts = serializer.Meta.model._meta
+        specs = []
+        for field in serializer._readable_fields:
+            key = field.field_name
+            if isinstance(field, serializers.SerializerMethodField):
+                if prefix or key not in self.method_fields:
+                    raise ImproperlyConfigured(
+                        f"{self.serializer_class.__name__}.{key} needs a "
+                        "method_fields entry"
+                    )
+                columns, factory = self.method_fields[key]
+                specs.append((key, "method", None, (columns, factory)))
+                continue
+
+            if field.source == "*" or "." in field.source:
+                raise ImproperlyConfigured(
+                    f"Unsupported source {field.source!r} for {key}"
+                )
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f"{key} is not a concrete field of {opts.label}"
+                )
+
+            if key in self.related:
+                specs.append(
+                    (key, "related", prefix + model_field.attname, None)
+                )
+            elif isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer):
+                    raise ImproperlyConfigured(f"Unsupported nested {key}")
+                specs.append(
+                    (
+                        key,
+                        "nested",
+                        prefix + model_field.attname,
+                        self.compile(field, f"{prefix}{field.source}__"),
+                    )
+                )
+            elif isinstance(field, serializers.ManyRelatedField):
+                raise ImproperlyConfigured(f"Unsupported many=True {key}")
+            elif isinstance(field, serializers.FileField):
+                specs.append(
+                    (key, "file", prefix + model_field.attname, model_field)
+                )
+            else:
+                if model_field.primary_key and model_field.model is not (
+                    opts.concrete_model
+                ):
+                    # Parent pk of a multi-table child, no join needed
+                    column = opts.pk.attname
+                else:
+                    column = model_field.attname
+                if isinstance(field, serializers.PrimaryKeyRelatedField):
+                    convert = (
+                        field.pk_field.to_representation
+                        if field.pk_field
+                        else None
+                    )
+                elif isinstance(field, IDENTITY_FIELDS):
+                    convert = None
+                else:
+                    convert = field.to_representation
+                specs.append((key, "value", prefix + column, convert))
+        return specs
+
+    def bind(self, specs, context, related):
+        """Resolve context-dependent converters for one render call"""
+        request = get_request(context)
+        bound = []
+        for key, kind, column, extra in specs:
+            if kind == "value":
+                bound.append((key, column, extra))
+            elif kind == "file":
+                bound.append((key, column, file_converter(extra, request)))
+            elif kind == "method":
+                bound.append((key, None, extra[1](context)))
+            elif kind == "related":
+                bound.append((key, column, related[key].get))
+            else:
+                nested = self.bind(extra, context, related)
+                bound.append((key, None, nested_converter(column, nested)))
+        return bound
+
+    def render(self, rows, context=None):
+        """List of dicts identical to ``serializer_class(many=True).data``"""
+        rows = list(rows)
+        pks = {}
+        self.collect_related(self.specs, rows, pks)
+        related = {
+            key: self.related[key].render_pks(key_pks - {None})
+            for key, key_pks in pks.items()
+        }
+        return render_rows(rows, self.bind(self.specs, context, related))
+
+    def collect_related(self, specs, rows, pks):
+        """Values of the related columns, nested ones included, per key"""
+        for key, kind, column, extra in specs:
+            if kind == "related":
+                pks.setdefault(key, set()).update(row[column] for row in rows)
+            elif kind == "nested":
+                self.collect_related(extra, rows, pks)
+
+
+def render_rows(rows, bound):
+    results = []
+    for row in rows:
+        item = {}
+        for key, column, convert in bound:
+            if column is None:
+                item[key] = convert(row)
+                continue
+            value = row[column]
+            if value is None or convert is None:
+                item[key] = value
+            else:
+                item[key] = convert(value)
+        results.append(item)
+    return results
+
+
+def nested_converter(column, bound):
+    """Nested serializer output, ``None`` when the relation is empty"""
+
+    def convert(row):
+        if row[column] is None:
+            return None
+        return render_rows([row], bound)[0]
+
+    return convert
+
+
+def file_converter(model_field, request):
+    """``FileField.to_representation`` from the stored file name"""
+    storage = model_field.storage
+    if not api_settings.UPLOADED_FILES_USE_URL:
+        return lambda name: name or None
+    if request is None:
+        return lambda name: storage.url(name) if name else None
+    return lambda name: (
+        request.build_absolute_uri(storage.url(name)) if name else None
+    )
+
+
+class ValuesListMixin(SparseFieldsMixin):
+    """
+    ``list()`` that paginates a ``.values()`` queryset and renders it with
+    the view's ``values_serializer`` instead of ``serializer_class``.
+    ``?fields=`` / ``?exclude=`` drop columns from the ``SELECT``.
+    """
+
+    values_serializer = None
+
+    def get_values_serializer(self):
+        selection = self.get_field_selection()
+        if selection:
+            return self.values_serializer.select(selection)
+        return self.values_serializer
+
+    def list(self, request, *args, **kwargs):
+        values = self.get_values_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        pk_name = queryset.model._meta.pk.attname
+        # Keyset cursors read the ordering columns from the rows
+        keyset_columns = [
+            pk_name if name == "pk" else name
+            for name in (
+                name.lstrip("-")
+                for name in getattr(self, "keyset_ordering", ("-pk",))
+            )
+        ]
+        queryset = queryset.prefetch_related(None).values(
+            *dict.fromkeys([pk_name, *keyset_columns, *values.columns])
+        )
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values.render(page, context))
+        return Response(values.render(queryset, context))
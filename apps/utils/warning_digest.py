@@ -0,0 +1,177 @@
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.html import escape
+
+from apps.companies.models import Company
+from apps.equipment.models import resolve_child_values
+from apps.maintenance.models import MaintenanceWarning, TelegramMessage
+from apps.users.models import User
+from apps.utils.telegram import MESSAGE_MAX_LENGTH
+
+LOOKUP_BATCH_SIZE = 2000
+# Most urgent first: critical, high, medium, low
+LEVEL_ORDER = {
+    level: order
+    for order, (_days, _time, level) in enumerate(
+        MaintenanceWarning.WARNING_THRESHOLDS
+    )
+}
+
+
+def load_warnings(warning_ids):
+    """Warning rows with the equipment's responsible person, in chunks"""
+    warning_ids = iter(warning_ids)
+    rows = []
+    while True:
+        chunk = list(islice(warning_ids, LOOKUP_BATCH_SIZE))
+        if not chunk:
+            return rows
+        batch = list(
+            MaintenanceWarning.objects.filter(pk__in=chunk).values(
+                "pk",
+                "message",
+                "warning_level",
+                "maintenance_schedule__next_maintenance_date",
+                "maintenance_schedule__equipment_id",
+                "maintenance_schedule__equipment__type",
+            )
+        )
+        responsible = resolve_child_values(
+            {
+                row["maintenance_schedule__equipment_id"]: row[
+                    "maintenance_schedule__equipment__type"
+                ]
+                for row in batch
+            },
+            "responsible_person_id",
+        )
+        for row in batch:
+            row["responsible_person_id"] = responsible.get(
+                row["maintenance_schedule__equipment_id"]
+            )
+        rows.extend(batch)
+
+
+def truncate_escaped(text, length):
+    """
+    ``text`` HTML-escaped and cut to ``length``. The raw text is cut, so
+    an entity (``&amp;``) is never split.
+    """
+    escaped = escape(text)
+    if len(escaped) <= length:
+        return escaped
+    escaped = ""
+    for char in text:
+        char = escape(char)
+        if len(escaped) + len(char) > length:
+            break
+        escaped += char
+    return escaped
+
+
+def split_message(header, lines, limit=MESSAGE_MAX_LENGTH):
+    """
+    ``(text, warning ids)`` chunks of ``header`` + ``lines`` under
+    ``limit``. ``lines`` are ``(text, warning id)`` pairs, a ``None`` id
+    marks a heading; every chunk repeats the header and current heading.
+    Lines are not cut: ``render_digest`` fits them to the header and
+    their heading.
+    """
+    chunks = []
+    text, ids, heading = header, [], None
+    for line, warning_id in lines:
+        if warning_id is None:
+            heading = line
+        if len(text) + 1 + len(line) > limit and ids:
+            chunks.append((text, ids))
+            text, ids = header, []
+            if warning_id is not None and heading is not None:
+                text = f"{text}\n{heading}"
+        text = f"{text}\n{line}"
+        if warning_id is not None:
+            ids.append(warning_id)
+    if ids:
+        chunks.append((text, ids))
+    return chunks
+
+
+def render_digest(company, person, rows):
+    header = (
+        f"<b>{escape(company['name'])}</b>: texnik ko‘rik "
+        f"ogohlantirishlari ({len(rows)})"
+    )
+    if person is not None:
+        header += f"\nMas'ul: {escape(person)}"
+
+    levels = dict(MaintenanceWarning.WARNING_LEVELS)
+    lines = []
+    level = heading = None
+    for row in sorted(
+        rows,
+        key=lambda row: (
+            LEVEL_ORDER.get(row["warning_level"], len(LEVEL_ORDER)),
+            row["maintenance_schedule__next_maintenance_date"],
+            row["pk"],
+        ),
+    ):
+        if row["warning_level"] != level:
+            level = row["warning_level"]
+            heading = f"\n<b>{escape(levels.get(level, level))}</b>"
+            lines.append((heading, None))
+        # A chunk is the header, heading and line joined by newlines
+        room = MESSAGE_MAX_LENGTH - len(header) - len(heading) - 4
+        lines.append(
+            (f"• {truncate_escaped(row['message'], room)}", row["pk"])
+        )
+    return split_message(header, lines)
+
+
+def send_warning_digests(warning_ids):
+    """
+    Queue one Telegram digest per company (or per company and responsible
+    master) in digest mode for the warnings raised by a sweep, routed to
+    the company's chat. Warnings of other companies are sent one by one
+    by ``dispatch_outbox_events``. Returns the number of messages queued.
+    """
+    rows = load_warnings(warning_ids)
+    people = {row["responsible_person_id"] for row in rows} - {None}
+    users = {
+        pk: (company_id, name or username)
+        for pk, company_id, name, username in User.objects.filter(
+            pk__in=people, company__isnull=False
+        ).values_list("pk", "company_id", "name", "username")
+    }
+    companies = {
+        company["pk"]: company
+        for company in Company.objects.filter(
+            pk__in={company_id for company_id, _name in users.values()}
+        )
+        .exclude(warning_digest=Company.WARNING_DIGEST_OFF)
+        .values("pk", "name", "telegram_chat_id", "warning_digest")
+    }
+
+    groups = {}
+    for row in rows:
+        person = row["responsible_person_id"]
+        company_id, _name = users.get(person, (None, None))
+        company = companies.get(company_id)
+        if company is None:
+            continue
+        if company["warning_digest"] != Company.WARNING_DIGEST_RESPONSIBLE:
+            person = None
+        groups.setdefault((company_id, person), []).append(row)
+
+    messages = []
+    for (company_id, person), group_rows in groups.items():
+        company = companies[company_id]
+        chat_id = company["telegram_chat_id"] or settings.TELEGRAM_CHAT_ID
+        name = users[person][1] if person is not None else None
+        messages.extend(
+            TelegramMessage(chat_id=chat_id, text=text, digest_warning_ids=ids)
+            for text, ids in render_digest(company, name, group_rows)
+        )
+    with transaction.atomic():
+        TelegramMessage.objects.enqueue(messages)
+    return len(messages)
@@ -0,0 +1,168 @@
+import heapq
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.maintenance.models import MaintenanceSchedule, MaintenanceWarning
+from apps.utils.maintenance_warnings import (
+    WARNING_SWEEP_BATCH_SIZE,
+    resolve_warnings,
+    sweep_batch,
+)
+from apps.utils.warning_digest import send_warning_digests
+
+# Upcoming fire times kept in memory; later ones are loaded when due
+TIMER_HORIZON = timedelta(hours=6)
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def get_next_warning_at(next_maintenance_date, today):
+    """
+    Next instant a schedule's warning changes: the day it enters the
+    warning window, or the next day rollover inside the window (the
+    message counts the days left).
+    """
+    window_start = next_maintenance_date - timedelta(
+        days=MaintenanceWarning.WARNING_WINDOW_DAYS
+    )
+    return start_of_day(max(window_start, today + timedelta(days=1)))
+
+
+def process_due_schedules(now=None, batch_size=WARNING_SWEEP_BATCH_SIZE):
+    """
+    Warn a batch of schedules whose ``next_warning_at`` has passed and
+    re-arm them. Rows are claimed with ``SKIP LOCKED``, so several timers
+    can run. Returns ``(stats, next fire times)``.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    with transaction.atomic():
+        schedules = list(
+            MaintenanceSchedule.objects.select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .filter(next_warning_at__lte=now)
+            .order_by("next_warning_at")
+            .values(
+                "pk",
+                "equipment_id",
+                "equipment__type",
+                "assigned_to_id",
+                "next_maintenance_date",
+                "is_completed",
+            )[:batch_size]
+        )
+        if not schedules:
+            return {"rows_scanned": 0}, []
+
+        rearmed = []
+        due = []
+        idle = []
+        for schedule in schedules:
+            next_warning_at = None
+            days_left = None
+            if (
+                not schedule["is_completed"]
+                and schedule["next_maintenance_date"]
+            ):
+                next_warning_at = get_next_warning_at(
+                    schedule["next_maintenance_date"], today
+                )
+                days_left = (schedule["next_maintenance_date"] - today).days
+            if (
+                days_left is not None
+                and days_left <= MaintenanceWarning.WARNING_WINDOW_DAYS
+            ):
+                due.append(schedule)
+            else:
+                idle.append(schedule["pk"])
+            rearmed.append(
+                MaintenanceSchedule(
+                    pk=schedule["pk"], next_warning_at=next_warning_at
+                )
+            )
+
+        created = updated = 0
+        raised = []
+        if due:
+            created, updated, raised = sweep_batch(due, today, now)
+        # Completed, undated or outside the window
+        resolved = resolve_warnings(idle)
+        # bulk_update() skips save(), which would re-arm them to now
+        MaintenanceSchedule.objects.bulk_update(rearmed, ["next_warning_at"])
+        send_warning_digests(raised)
+    stats = {
+        "rows_scanned": len(schedules),
+        "rows_written": created + updated + resolved,
+    }
+    return stats, [
+        schedule.next_warning_at
+        for schedule in rearmed
+        if schedule.next_warning_at is not None
+    ]
+
+
+def rearm_missing_timers(now=None):
+    """
+    Arm open schedules written without ``save()`` (``bulk_create``,
+    ``QuerySet.update``); the timer disarms the ones it finds completed.
+    """
+    now = now or timezone.now()
+    armed = MaintenanceSchedule.objects.filter(
+        is_completed=False,
+        next_maintenance_date__isnull=False,
+        next_warning_at__isnull=True,
+    ).update(next_warning_at=now)
+    return {"rows_written": armed}
+
+
+class WarningTimer:
+    """
+    Min-heap of upcoming distinct ``next_warning_at`` instants within
+    ``TIMER_HORIZON``, so the worker sleeps until the next one instead
+    of polling. Schedules armed by other processes are picked up after
+    at most ``WARNING_TIMER_POLL_INTERVAL`` seconds.
+    """
+
+    def __init__(self, horizon=TIMER_HORIZON, poll_interval=None):
+        self.horizon = horizon
+        self.poll_interval = (
+            poll_interval or settings.WARNING_TIMER_POLL_INTERVAL
+        )
+        self.heap = []
+        self.loaded_until = None
+
+    def push(self, fire_times):
+        for fire_at in set(fire_times):
+            if self.loaded_until and fire_at <= self.loaded_until:
+                heapq.heappush(self.heap, fire_at)
+
+    def load(self, now):
+        self.loaded_until = now + self.horizon
+        self.heap = list(
+            MaintenanceSchedule.objects.filter(
+                next_warning_at__gt=now,
+                next_warning_at__lte=self.loaded_until,
+            )
+            .order_by("next_warning_at")
+            .values_list("next_warning_at", flat=True)
+            .distinct()
+        )
+        heapq.heapify(self.heap)
+
+    def seconds_until_next(self, now):
+        if self.loaded_until is None or now >= self.loaded_until:
+            self.load(now)
+        while self.heap and self.heap[0] <= now:
+            heapq.heappop(self.heap)
+        wake_at = min(
+            self.heap[0] if self.heap else self.loaded_until,
+            self.loaded_until,
+            now + timedelta(seconds=self.poll_interval),
+        )
+        return max((wake_at - now).total_seconds(), 0)
@@ -29,6 +29,7 @@ DJANGO_APPS = [
     "django.contrib.sites",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django.forms",
 ]
 
@@ -45,6 +46,7 @@ THIRD_PARTY_APPS = [
 
 LOCALE_APPS = [
     "apps.companies",
+    "apps.core",
     "apps.equipment",
     "apps.maintenance",
     "apps.users",
@@ -121,6 +123,66 @@ STATICFILES_FINDERS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = str(APPS_DIR / "media")
 
+# QR CODES
+QR_CODE_BASE_URL = env(
+    "QR_CODE_BASE_URL", default="https://api.ppr.vchdqarshi.uz/api"
+)
+QR_CODE_CACHE_SIZE = env.int("QR_CODE_CACHE_SIZE", default=1024)
+QR_CODE_CACHE_MAX_AGE = env.int("QR_CODE_CACHE_MAX_AGE", default=86400)
+# Also write a PNG per equipment to MEDIA_ROOT/qr_codes/ (background worker)
+QR_CODE_STORE_FILES = env.bool("QR_CODE_STORE_FILES", default=False)
+
+# RESUMABLE FAULT PHOTO UPLOADS (see apps/utils/chunked_upload.py)
+# Partial files; outside MEDIA_ROOT, which is served publicly
+FAULT_PHOTO_UPLOAD_DIR = env(
+    "FAULT_PHOTO_UPLOAD_DIR", default=str(BASE_DIR / "tmp" / "fault_uploads")
+)
+FAULT_PHOTO_UPLOAD_MAX_SIZE = env.int(
+    "FAULT_PHOTO_UPLOAD_MAX_SIZE", default=50 * 1024 * 1024
+)
+FAULT_PHOTO_UPLOAD_EXPIRY_HOURS = env.int(
+    "FAULT_PHOTO_UPLOAD_EXPIRY_HOURS", default=24
+)
+
+# IMAGE RENDITIONS (manage.py process_image_renditions)
+# Rendition files are never rewritten, so clients may keep them for a year
+IMAGE_RENDITION_CACHE_MAX_AGE = env.int(
+    "IMAGE_RENDITION_CACHE_MAX_AGE", default=365 * 24 * 3600
+)
+
+# CACHES
+# The detail and reliability caches need a backend shared by the web and
+# worker processes (CACHE_URL=redis://...); they are off with locmem
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# Serialized equipment/schedule detail payloads (see apps/utils/detail_cache.py)
+DETAIL_CACHE_ALIAS = env("DETAIL_CACHE_ALIAS", default="default")
+DETAIL_CACHE_TIMEOUT = env.int("DETAIL_CACHE_TIMEOUT", default=3600)
+# Reliability reports per company (see apps/utils/reliability.py)
+RELIABILITY_CACHE_TIMEOUT = env.int("RELIABILITY_CACHE_TIMEOUT", default=3600)
+
+# SCHEDULER (manage.py run_scheduler, see apps/utils/scheduler.py)
+# PostgreSQL advisory lock key held by the leading scheduler process
+SCHEDULER_LOCK_KEY = env.int("SCHEDULER_LOCK_KEY", default=720_301)
+# Seconds between leader lock health checks / standby election attempts
+SCHEDULER_HEARTBEAT = env.int("SCHEDULER_HEARTBEAT", default=30)
+# Longest sleep of manage.py run_warning_timer between due-row checks
+WARNING_TIMER_POLL_INTERVAL = env.int(
+    "WARNING_TIMER_POLL_INTERVAL", default=60
+)
+# Job run history (apps/utils/job_runs.py); /api/metrics/ also accepts
+# "Authorization: Bearer METRICS_TOKEN" for Prometheus scrapes
+JOB_RUN_RETENTION_DAYS = env.int("JOB_RUN_RETENTION_DAYS", default=30)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# TELEGRAM (manage.py send_telegram_messages, see apps/utils/telegram.py)
+TELEGRAM_BOT_TOKEN = env("BOT_TOKEN", default="")
+TELEGRAM_CHAT_ID = env("CHAT_ID", default="")
+# Point at a local fake Bot API server in development
+TELEGRAM_API_URL = env("TELEGRAM_API_URL", default="https://api.telegram.org")
+# Bot API limits: ~30 messages/second overall, 20 messages/minute per group
+TELEGRAM_GLOBAL_RATE = env.float("TELEGRAM_GLOBAL_RATE", default=30)
+TELEGRAM_CHAT_RATE = env.float("TELEGRAM_CHAT_RATE", default=20 / 60)
+
 # USER SETTINGS
 AUTH_USER_MODEL = "users.User"
 LOGIN_REDIRECT_URL = "users:redirect"